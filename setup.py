@@ -12,4 +12,6 @@ setup(
     include_package_data=True,
     python_requires=">=3.7",
     install_requires=["python-dateutil", "deprecation"],
+    extras_require={"async": ["httpx"], "numpy": ["numpy"], "parquet": ["pyarrow"]},
+    entry_points={"console_scripts": ["soundcharts=soundcharts.cli:main"]},
 )
@@ -0,0 +1,7 @@
+from soundcharts.aio.client import AsyncClient
+from soundcharts.aio.artist import Artist
+from soundcharts.aio.library import Library as LibraryClient
+from soundcharts.aio.playlist import Playlist
+from soundcharts.aio.song import Song
+from soundcharts.aio.tiktok import Tiktok
+from soundcharts.aio.top_artist import TopArtist
@@ -0,0 +1,458 @@
+import asyncio
+import copy
+from datetime import date, datetime, timedelta, UTC
+import logging
+from typing import AsyncIterator, Union
+
+from soundcharts.aio.client import AsyncClient, setprefix
+from soundcharts.audience import AudienceReport, AudienceReportMemo
+from soundcharts.errors import ConnectionError, NoSocialAccountFound
+from soundcharts.monthly import MonthlyMemo
+from soundcharts.platform import SocialPlatform
+from soundcharts.timeseries import DailySeries, month_range
+
+logger = logging.getLogger(__name__)
+
+
+class Artist(AsyncClient):
+    """Async twin of soundcharts.artist.Artist; see there for full method documentation"""
+
+    def __init__(self, audience_report_ttl: float = 300, monthly_memo: MonthlyMemo = None, **kwargs):
+        super().__init__(**kwargs)
+        self._prefix = "/api/v2/artist"
+        self._audience_reports = AudienceReportMemo(audience_report_ttl)
+        self.monthly_memo = monthly_memo or MonthlyMemo()
+
+    @setprefix(prefix="/api/v2.9/artist")
+    async def artist_by_id(self, id: str) -> dict:
+        """Retrieve an artist using Soundcharts ID"""
+        url = "/{uuid}".format(uuid=id)
+        return await self._get_single_object(url, obj_type="artist")
+
+    async def artist_by_name(self, name: str) -> AsyncIterator[dict]:
+        """Search for artists by name"""
+        url = "/search/{term}".format(term=name)
+        async for item in self._get_paginated(url):
+            yield item
+
+    @setprefix(prefix="/api/v2.9/artist")
+    async def artist_by_platform_identifier(self, platform: SocialPlatform, identifier: str):
+        """Retrieve an artist using an external platform identifier"""
+        url = "/by-platform/{platform}/{identifier}".format(platform=platform.value, identifier=identifier)
+        return await self._get_single_object(url, obj_type="artist")
+
+    async def artist_by_country(
+        self, country_iso: str, limit: int = None, max_limit: int = None, concurrency: int = None
+    ) -> AsyncIterator[dict]:
+        """Search for artists by country code"""
+        self.requests_timeout = 15  # this request is not fast
+        url = "/by-country/{country}".format(country=country_iso)
+        params = {}
+        if limit:
+            params["limit"] = limit
+        async for item in self._get_paginated(url, params=params, max_limit=max_limit, concurrency=concurrency):
+            yield item
+
+    async def artist_followers_by_platform_latest(self, uuid: str, platform: SocialPlatform, start: date = None) -> int:
+        """Convenience function to find the most recent value for the daily followers on the given platform"""
+        url = "/{uuid}/social/{platform}".format(uuid=uuid, platform=platform.value)
+        if not start:
+            start = date.today() - timedelta(days=90)
+        end = datetime.now(UTC).date()
+
+        found_values = {}
+        current_start = max(start, end - timedelta(days=90))
+        try:
+            while not found_values and current_start >= start and current_start < end:
+                params = {"startDate": current_start.isoformat(), "endDate": end.isoformat()}
+                async for item in self._get_paginated(url, params=params):
+                    found_values[item["date"][:10]] = item["value"]
+
+                end = current_start
+                current_start = max(start, end - timedelta(days=90))
+
+            # return the last item it any found
+            if found_values:
+                return list(found_values.values())[-1]
+            else:
+                return None
+        except ConnectionError:
+            return None
+
+    async def artist_followers_by_platform_daily(
+        self, uuid: str, platform: SocialPlatform, day: date, allow_backscan: bool = False, recurse_count: int = None
+    ) -> int:
+        """Convenience function to find the daily followers on the given platform and day"""
+        try:
+            url = "/{uuid}/social/{platform}".format(uuid=uuid, platform=platform.value)
+            if allow_backscan:
+                return await self._followers_backscan(url, day, 8 if recurse_count is None else max(recurse_count, 0))
+
+            params = {"startDate": day.isoformat(), "endDate": day.isoformat()}
+            data = await self._get(url, params)
+
+            if not data.get("items"):
+                logger.info("No data found for specified date")
+                return None
+            elif len(data["items"]) > 1:
+                logger.info("More items returned than expected (%d)", len(data["items"]))
+                return None
+            else:
+                return data.get("items")[0].get("value")
+        except ConnectionError:
+            return None
+
+    async def _followers_backscan(self, url: str, day: date, days: int) -> int:
+        """Find the followers on `day`, or on the latest of the `days` days before it which has data, in one request
+
+        Gives the same answer as checking `day`, then the previous days one at a time, latest first.
+        """
+        params = {
+            "startDate": (day - timedelta(days=days)).isoformat(),
+            "endDate": day.isoformat(),
+        }
+        logger.info("Scanning from %s to %s", params["startDate"], params["endDate"])
+        items_by_day = {}
+        async for item in self._get_paginated(url, params=params):
+            items_by_day.setdefault(item["date"][:10], []).append(item)
+        if day.isoformat() not in items_by_day:
+            logger.info("No data found for specified date")
+        if not items_by_day:
+            return None
+
+        items = items_by_day[max(items_by_day)]
+        if len(items) > 1:
+            logger.info("More items returned than expected (%d)", len(items))
+            return None
+        return items[0].get("value")
+
+    async def artist_followers_by_platform(
+        self, uuid: str, platform: SocialPlatform, start: date, end: date = None, as_series: bool = False
+    ) -> Union[dict, DailySeries]:
+        """Find daily followers per day over the defined period"""
+        url = "/{uuid}/social/{platform}".format(uuid=uuid, platform=platform.value)
+        if not end:
+            end = datetime.now(UTC).date()
+        return await self._get_date_range(
+            url,
+            start,
+            end,
+            window_key="artist_followers_by_platform",
+            series_key=(uuid, "followers", platform.value),
+            as_series=as_series,
+        )
+
+    @setprefix(prefix="/api/v2.20/artist")
+    async def playlist_positions_by_platform(
+        self,
+        uuid: str,
+        platform: SocialPlatform,
+        limit: int = None,
+        sort_by: str = "position",
+        sort_order: str = "asc",
+        max_limit: int = 1000,
+        type: str = None,
+        prefetch: int = None,
+    ) -> AsyncIterator[dict]:
+        """Generate a list of the positions that an artist features in playlists"""
+        url = "/{uuid}/playlist/current/{platform}".format(uuid=uuid, platform=platform.value)
+        params = {}
+        if limit:
+            params["limit"] = limit
+        if sort_by:
+            params["sortBy"] = sort_by
+        if sort_order:
+            params["sortOrder"] = sort_order
+        if type:
+            params["type"] = type
+        async for item in self._get_paginated(url, params=params, max_limit=max_limit, prefetch=prefetch):
+            yield item
+
+    async def recent_playlists_by_platform(
+        self, uuid: str, platform: SocialPlatform, cutoff_date: date, max_limit: int = 1000, prefetch: int = None
+    ) -> AsyncIterator[dict]:
+        """Generate a list of the playlist positions where an artists has been added since a date"""
+        positions = self.playlist_positions_by_platform(
+            uuid, platform, sort_by="entryDate", sort_order="desc", max_limit=max_limit, prefetch=prefetch
+        )
+        # close explicitly on reaching the cutoff, so any page being read ahead is abandoned straight away
+        try:
+            async for item in positions:
+                entry_date = datetime.fromisoformat(item["entryDate"]).date()
+                if entry_date < cutoff_date:
+                    return
+
+                yield item
+        finally:
+            await positions.aclose()
+
+    async def add_artist_links(self, uuid: str, links: list):
+        """Submit links to be added to the artist profile"""
+        if not links:
+            return
+
+        # very mild validation of the links
+        links = [lnk for lnk in links if lnk.startswith("http")]
+
+        url = "/{uuid}/sources/add".format(uuid=uuid)
+        payload = {"urls": links}
+        return await self._post(url, payload=payload)
+
+    async def get_spotify_monthly_listeners(self, uuid: str) -> dict:
+        """Retrieves just the total monthly listeners for the last available month for the artist"""
+        url = "/{uuid}/streaming/spotify/listeners".format(uuid=uuid)
+        monthly_listeners = 0
+        # this endpoint should only return one item, but still has pagination
+        async for item in self._get_paginated(url):
+            monthly_listeners = item["value"]
+        return monthly_listeners
+
+    async def get_spotify_monthly_listeners_for_month(self, uuid: str, year: int, month: int) -> AsyncIterator[dict]:
+        """Retrieves Monthly Listeners values for the month by city, by country and in total"""
+        key = (uuid, "spotify_listeners")
+        items = self.monthly_memo.get(key, year, month)
+        if items is None:
+            url = f"/{uuid}/streaming/spotify/listeners/{year}/{month:02}"
+            items = [item async for item in self._get_paginated(url)]
+            self.monthly_memo.put(key, year, month, items)
+        for item in items:
+            yield item
+
+    async def spotify_listeners_daily(
+        self, uuid: str, start: date, end: date = None, as_series: bool = False
+    ) -> Union[dict, DailySeries]:
+        """Retrieve the Spotify listeners for an artist for each day across a range of dates"""
+        url = f"/{uuid}/streaming/spotify/listening"
+        if not end:
+            end = datetime.now(UTC).date()
+        return await self._get_date_range(
+            url,
+            start,
+            end,
+            window_key="spotify_listeners_daily",
+            series_key=(uuid, "spotify_listeners", None),
+            as_series=as_series,
+        )
+
+    async def get_spotify_monthly_listeners_for_date_range(self, uuid: str, start: date, end: date) -> dict:
+        """Retrieves Monthly Listeners values for each of the dates within `start` and `end`, months concurrently"""
+
+        async def fetch(month: tuple) -> list:
+            return [item async for item in self.get_spotify_monthly_listeners_for_month(uuid, *month)]
+
+        results = await asyncio.gather(*(fetch(month) for month in month_range(start, end)))
+
+        all_items = {}
+        for items in results:
+            for item in items:
+                item_date = datetime.fromisoformat(item["date"]).date()
+                if item_date >= start and item_date <= end:
+                    item.pop("date")
+                    all_items[item_date.isoformat()] = item
+        return all_items
+
+    async def get_monthly_located_followers(
+        self, uuid: str, platform: SocialPlatform, year: int, month: int
+    ) -> AsyncIterator[dict]:
+        """Retrieves a list of followers-located data for the artist/platform/year/month"""
+        url = f"/{uuid}/social/{platform.value}/followers/{year}/{month:02}"
+        async for item in self._get_paginated(url):
+            yield item
+
+    async def get_audience_report_dates(
+        self, uuid: str, platform: SocialPlatform, start: date = None, end: date = None
+    ) -> AsyncIterator[dict]:
+        """Retrieves the dates for which an audience report is available on a given Social Platform"""
+        url = "/{uuid}/audience/{platform}/report/available-dates".format(uuid=uuid, platform=platform.value)
+        params = {}
+        if start:
+            params["startDate"] = start.isoformat()
+        if end:
+            params["endDate"] = end.isoformat()
+
+        async for item in self._get_paginated(url, params=params):
+            yield item
+
+    async def get_audience_report_for_date(self, uuid: str, platform: SocialPlatform, day: date) -> dict:
+        """Retrieves the full audience data for a given Social Platform on a given date"""
+        url = "/{uuid}/audience/{platform}/report/{dd}".format(uuid=uuid, platform=platform.value, dd=day.isoformat())
+        report = await self._get_single_object(url)
+        logger.debug(report)
+        return report
+
+    async def get_platform_report(self, uuid: str, platform: SocialPlatform) -> dict:
+        """Retrieves the full audience data for a given Social Platform"""
+        url = "/{uuid}/audience/{platform}/report/latest".format(uuid=uuid, platform=platform.value)
+        report = await self._get_single_object(url)
+        logger.debug(report)
+        return report
+
+    async def audience_report(self, uuid: str, platform: SocialPlatform) -> AudienceReport:
+        """Retrieves the parts of the latest audience report used by the helpers, kept for a short time"""
+        key = (uuid, platform.value, datetime.now(UTC).date())
+        report = self._audience_reports.get(key)
+        if report is None:
+            report = AudienceReport.from_report(await self.get_platform_report(uuid, platform))
+            self._audience_reports.put(key, report)
+        return report
+
+    async def get_audience_stats_by_platform(self, uuid: str, platform: SocialPlatform) -> dict:
+        """Retrieves the audience stats for a given Social Platform"""
+        return copy.deepcopy((await self.audience_report(uuid, platform)).stats)
+
+    async def get_engagement_data_by_platform(self, uuid: str, platform: SocialPlatform) -> float:
+        """Retrieves the engagement rate for a given Social Platform, as a percentage"""
+        return (await self.audience_report(uuid, platform)).engagement_rate
+
+    async def get_top_posts_by_platform(self, uuid: str, platform: SocialPlatform) -> list:
+        """Retrieve the top posts for a platform by the artist"""
+        return copy.deepcopy((await self.audience_report(uuid, platform)).top_posts)
+
+    async def identifiers(self, uuid: str) -> dict:
+        """Retrieve a map of platform key to identifier for an artist"""
+        url = "/{uuid}/identifiers".format(uuid=uuid)
+        try:
+            response = await self._get(url)
+            return {item["platformCode"]: item["identifier"] for item in response.get("items")}
+        except ConnectionError:
+            return None
+
+    async def identifiers_complete(self, uuid: str) -> dict:
+        """Retrieve a map of platform key to a map of the identifier and url for an artist"""
+        url = "/{uuid}/identifiers".format(uuid=uuid)
+        try:
+            response = await self._get(url)
+            return {
+                item["platformCode"]: {"identifier": item["identifier"], "url": item["url"]}
+                for item in response.get("items")
+            }
+        except ConnectionError:
+            return None
+
+    async def similar_artists(self, uuid: str, limit: int = None, offset: int = None) -> AsyncIterator[dict]:
+        """Retrieve similar artists"""
+        url = f"/{uuid}/related"
+        params = {}
+        if limit:
+            params["limit"] = limit
+        if offset:
+            params["offset"] = offset
+        async for item in self._get_paginated(url, params=params):
+            yield item
+
+    @setprefix(prefix="/api/v2.21/artist")
+    async def songs(
+        self,
+        uuid: str,
+        limit: int = None,
+        offset: int = None,
+        sortBy: str = "releaseDate",
+        sortOrder: str = "desc",
+        max_limit: int = None,
+        prefetch: int = None,
+    ) -> AsyncIterator[dict]:
+        """Retrieve songs by an artist"""
+        url = f"/{uuid}/songs"
+        params = {}
+        if limit:
+            params["limit"] = limit
+        if offset:
+            params["offset"] = offset
+        if sortBy:
+            params["sortBy"] = sortBy
+        if sortOrder:
+            params["sortOrder"] = sortOrder
+        async for item in self._get_paginated(url, params=params, max_limit=max_limit, prefetch=prefetch):
+            yield item
+
+    async def get_spotify_popularity_latest(self, uuid: str) -> int:
+        return await self.spotify_popularity_latest(uuid)
+
+    async def spotify_popularity_latest(self, uuid: str) -> int:
+        """Retrieve the latest known Spotify popularity for the artist, or None if there is none"""
+        url = f"/{uuid}/spotify/popularity"
+        old_date = date.today() - timedelta(days=21)
+        old_date_str = old_date.isoformat()
+
+        last_seen = None
+        try:
+            # the response data is ordered by date ascending, so we need to take the last item
+            async for item in self._get_paginated(url, params={}):
+                last_seen = item
+
+            if last_seen:
+                if last_seen["date"] < old_date_str:  # compare as strings - lexicographical ordering
+                    logger.warning(f"Spotify popularity data for {uuid} is old: {last_seen['date']}")
+                return last_seen["value"]
+            else:
+                logger.info("No popularity data found for %s", uuid)
+        except ConnectionError as ce:
+            logger.warning(f"Error retrieving Spotify popularity for {uuid}")
+            for er in ce.errors:
+                logger.info(f"Error [{er['code']}]: {er['message']}")
+
+        return None
+
+    async def spotify_popularity_daily(
+        self, uuid: str, start: date, end: date = None, as_series: bool = False
+    ) -> Union[dict, DailySeries]:
+        """Retrieve the Spotify popularity for an artist for each day across a range of dates"""
+        url = f"/{uuid}/spotify/popularity"
+        if not end:
+            end = datetime.now(UTC).date()
+        return await self._get_date_range(
+            url,
+            start,
+            end,
+            window_key="spotify_popularity_daily",
+            series_key=(uuid, "spotify_popularity", None),
+            as_series=as_series,
+        )
+
+    async def platform_followers_daily(
+        self, platform: SocialPlatform, uuid: str, start: date, end: date = None, as_series: bool = False
+    ) -> Union[dict, DailySeries]:
+        """Retrieve the follower count for an artist on a platform for each day across a range of dates"""
+        url = f"/{uuid}/audience/{platform.value}"
+        if not end:
+            end = datetime.now(UTC).date()
+
+        try:
+            return await self._get_date_range(
+                url,
+                start,
+                end,
+                value_key="followerCount",
+                window_key="platform_followers_daily",
+                series_key=(uuid, "audience_followers", platform.value),
+                as_series=as_series,
+            )
+        except ConnectionError as ce:
+            if "No social account found for artist" in str(ce):
+                raise NoSocialAccountFound(f"No social account found for artist {uuid} on platform {platform}")
+            raise ce
+
+    @setprefix(prefix="/api/v2.18/artist")
+    async def albums(
+        self,
+        uuid: str,
+        limit: int = None,
+        offset: int = None,
+        sortBy: str = "releaseDate",
+        sortOrder: str = "desc",
+        max_limit: int = None,
+    ) -> AsyncIterator[dict]:
+        """Retrieve albums by an artist"""
+        url = f"/{uuid}/albums"
+        params = {}
+        if limit:
+            params["limit"] = limit
+        if offset:
+            params["offset"] = offset
+        if sortBy:
+            params["sortBy"] = sortBy
+        if sortOrder:
+            params["sortOrder"] = sortOrder
+
+        async for item in self._get_paginated(url, params=params, max_limit=max_limit):
+            yield item
@@ -0,0 +1,456 @@
+import asyncio
+from collections import deque
+import copy
+from datetime import date
+import functools
+import inspect
+import json
+import logging
+import os
+from urllib.parse import urlparse, parse_qs
+from typing import AsyncIterator, Union
+
+import httpx
+
+from soundcharts.cache import NegativeCache, ResponseCache, SqliteCache
+from soundcharts.client import Client
+from soundcharts.errors import ConnectionError, IncorrectReponseType
+from soundcharts.ratelimit import RateLimiter
+from soundcharts.retry import RetryPolicy
+from soundcharts.series_cache import SeriesCache
+from soundcharts.snapshot import SnapshotStore
+from soundcharts.singleflight import AsyncSingleFlight
+from soundcharts.timeseries import DailySeries, date_windows
+
+logger = logging.getLogger(__name__)
+
+
+def setprefix(prefix: str):
+    """Sets the prefix to something other than default for this method
+
+    Unlike the synchronous decorator, many calls on the same client are in flight at once on the event loop, so
+    rather than swapping the prefix on the shared instance the method is called on a copy of the client bound to
+    the prefix, which shares the underlying connection pool.
+    """
+
+    def decorator(func):
+        if inspect.isasyncgenfunction(func):
+
+            @functools.wraps(func)
+            async def wrapper(self, *args, **kwargs):
+                async for item in func(self._with_prefix(prefix), *args, **kwargs):
+                    yield item
+
+            return wrapper
+        else:
+
+            @functools.wraps(func)
+            async def wrapper(self, *args, **kwargs):
+                return await func(self._with_prefix(prefix), *args, **kwargs)
+
+            return wrapper
+
+    return decorator
+
+
+class AsyncClient:
+    # Longest date range the time series endpoints accept in a single request
+    DEFAULT_WINDOW_DAYS = 90
+
+    def __init__(
+        self,
+        prefix=None,
+        log_response=False,
+        transport: httpx.AsyncBaseTransport = None,
+        window_days: dict = None,
+        series_cache: SeriesCache = None,
+        snapshot_store: SnapshotStore = None,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+        response_cache: ResponseCache = None,
+        negative_cache: NegativeCache = None,
+        session: httpx.AsyncClient = None,
+        single_flight: AsyncSingleFlight = None,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+    ):
+        self._auth_headers = {
+            "x-app-id": os.getenv("SOUNDCHARTS_APP_ID"),
+            "x-api-key": os.getenv("SOUNDCHARTS_API_KEY"),
+        }
+        self._endpoint = os.getenv("SOUNDCHARTS_API_ENDPOINT", "https://customer.api.soundcharts.com")
+        if session is None:
+            self._build_session(transport, pool_maxsize, keep_alive)
+        else:
+            self._session = session
+        # a session passed in is shared with other clients, so is left open for its owner to close
+        self._owns_session = session is None
+        self._prefix = prefix
+        self.language = None
+        self.requests_timeout = 5
+        self.log_response = log_response
+        # window size in days for time series requests, keyed by method name, e.g. {"spotify_popularity_daily": 30}
+        self.window_days = window_days or {}
+        self.series_cache = series_cache
+        # every time series fetched is also written here
+        self.snapshot_store = snapshot_store
+        # shared by every client that should count against the same quota
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.response_cache = response_cache
+        self.negative_cache = negative_cache
+        self.single_flight = single_flight or AsyncSingleFlight()
+
+    @staticmethod
+    async def _in_thread(func, *args):
+        """Run a blocking call, e.g. to a sqlite-backed store, on the default executor rather than the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+    @property
+    def auth_headers(self):
+        return self._auth_headers
+
+    def _build_session(
+        self, transport: httpx.AsyncBaseTransport = None, pool_maxsize: int = 10, keep_alive: bool = True
+    ):
+        limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize if keep_alive else 0)
+        self._session = httpx.AsyncClient(transport=transport, limits=limits)
+
+    def _with_prefix(self, prefix: str) -> "AsyncClient":
+        """Copy of this client bound to a different prefix, sharing the same session"""
+        clone = copy.copy(self)
+        clone._prefix = prefix
+        clone._owns_session = False
+        return clone
+
+    async def aclose(self):
+        """Flush the snapshot store, and close the connection pool unless it was passed in to be shared"""
+        if self.snapshot_store:
+            await self._in_thread(self.snapshot_store.flush)
+        if self._owns_session:
+            await self._session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def _internal_call(self, method: str, url: str, payload: dict, params: dict):
+        if self._prefix:
+            url = self._prefix + url
+        url = self._endpoint + url
+
+        headers = {**self.auth_headers, "Content-Type": "application/json"}
+        if self.language is not None:
+            headers["Accept-Language"] = self.language
+
+        content = json.dumps(payload) if payload else None
+        if params:
+            # httpx only accepts primitive query values, requests would have str()'d these
+            params = {k: v.isoformat() if isinstance(v, date) else v for k, v in params.items()}
+
+        logger.debug(
+            "Sending %s to %s with params: %s, headers: %s and body: %r ",
+            method,
+            url,
+            params,
+            headers,
+            content,
+        )
+
+        try:
+            response = await self._send(method, url, params=params, headers=headers, content=content)
+            response.raise_for_status()
+            results = response.json()
+
+            if self.log_response:
+                print(f"Response from API for url: {response.url}")
+                print(json.dumps(results))
+        except httpx.HTTPStatusError as http_error:
+            response = http_error.response
+
+            try:
+                errors = response.json()["errors"]
+            except (ValueError, KeyError):
+                errors = []
+
+            raise ConnectionError(str(response.url), response.status_code, errors)
+        except ValueError:
+            if self.log_response:
+                print(f"Response from API for url: {url}")
+                print(response.text)
+
+            results = None
+
+        return results
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request, pacing it with the rate limiter and retrying transient failures per the retry policy"""
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                await self.rate_limiter.acquire_async()
+
+            try:
+                response = await self._session.request(method, url, timeout=self.requests_timeout, **kwargs)
+            except httpx.TransportError:
+                if not self.retry_policy.should_retry(method, None, attempt):
+                    raise
+                await self.retry_policy.wait_async(None, attempt)
+                attempt += 1
+                continue
+
+            if "x-quota-remaining" in response.headers:
+                logger.info("Quota remaining: %s", response.headers["x-quota-remaining"])
+                if self.rate_limiter:
+                    self.rate_limiter.update(int(response.headers["x-quota-remaining"]))
+
+            if response.is_success or not self.retry_policy.should_retry(method, response.status_code, attempt):
+                return response
+            await self.retry_policy.wait_async(response.status_code, attempt, response.headers.get("Retry-After"))
+            attempt += 1
+
+    async def _get(self, url: str, params: dict = None, payload: dict = None, **kwargs):
+        if payload:
+            return await self._internal_call("GET", url=url, payload=payload, params=params)
+
+        path = (self._prefix or "") + url
+        if self.negative_cache:
+            self.negative_cache.check(path, params, self.language)
+        # a sqlite cache reads from disk, which would hold up every other task on the loop
+        cache_on_disk = isinstance(self.response_cache, SqliteCache)
+        if self.response_cache:
+            if cache_on_disk:
+                results = await self._in_thread(self.response_cache.get, path, params, self.language)
+            else:
+                results = self.response_cache.get(path, params, self.language)
+            if results is not None:
+                return results
+
+        async def fetch():
+            try:
+                results = await self._internal_call("GET", url=url, payload=payload, params=params)
+            except ConnectionError as e:
+                if self.negative_cache:
+                    self.negative_cache.record(path, e, params, self.language)
+                raise
+            if cache_on_disk:
+                await self._in_thread(self.response_cache.set, path, params, results, self.language)
+            elif self.response_cache:
+                self.response_cache.set(path, params, results, self.language)
+            return results
+
+        # identical requests already in flight from other tasks share the response
+        return await self.single_flight.do(ResponseCache.key(path, params, self.language), fetch)
+
+    async def _post(self, url: str, params: dict = None, payload: dict = None, **kwargs):
+        return await self._internal_call("POST", url=url, payload=payload, params=params)
+
+    async def _get_paginated(
+        self,
+        url: str,
+        params: dict = {},
+        listing_key: str = "items",
+        max_limit: int = None,
+        concurrency: int = None,
+        prefetch: int = None,
+    ) -> AsyncIterator[dict]:
+        """Async equivalent of Client._get_paginated
+
+        Args:
+            url (str): Path relative to the prefix
+            params (dict, optional): Query parameters. Defaults to {}.
+            listing_key (str, optional): Key of the items in each page. Defaults to "items".
+            max_limit (int, optional): Stop after this many items, without requesting further pages. Defaults to None.
+            concurrency (int, optional): Where the endpoint uses offset pagination, have up to this many of the
+            remaining pages in flight at once. Items are still yielded in order. Defaults to None.
+            prefetch (int, optional): Read ahead up to this many pages in a background task. Defaults to None.
+        """
+        response = await self._get(url, params=params)
+        if concurrency and concurrency > 1 and Client._has_offset_pagination(response, listing_key):
+            pages = self._fan_out_pages(url, params, response, listing_key, max_limit, concurrency)
+        else:
+            pages = self._follow_pages(url, params, response, listing_key, max_limit)
+        if prefetch:
+            pages = self._prefetch_pages(pages, prefetch)
+
+        item_count = 0
+        page_number = 0
+        try:
+            async for page in pages:
+                page_number += 1
+                for item in page.get(listing_key):
+                    yield item
+                    item_count += 1
+
+                    if max_limit and item_count >= max_limit:
+                        logger.info("Stopping API calls having reached max limit %d", item_count)
+                        return
+
+                logger.info("Received page %d, %d total items", page_number, page["page"]["total"])
+        finally:
+            await pages.aclose()
+
+    async def _follow_pages(
+        self, url: str, params: dict, response: dict, listing_key: str, max_limit: int = None
+    ) -> AsyncIterator[dict]:
+        """Generate pages one at a time by following the next link of each, starting with the response given"""
+        item_count = 0
+        while True:
+            yield response
+            item_count += len(response.get(listing_key) or [])
+
+            if max_limit and item_count >= max_limit:
+                return
+
+            # continue if there were items on this page and a next page is indicated
+            if response["page"]["next"] and response.get(listing_key):
+                parts = urlparse(response["page"]["next"])
+                pagination_params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                params = {**params, **pagination_params}
+                response = await self._get(url, params=params)
+            else:
+                return
+
+    @staticmethod
+    async def _prefetch_pages(pages: AsyncIterator[dict], depth: int) -> AsyncIterator[dict]:
+        """Generate the pages from `pages`, fetching up to `depth` pages ahead of the consumer in a background task
+
+        If the generator is closed early, the background task is cancelled along with any request it has in flight.
+        """
+        buffer = asyncio.Queue(maxsize=depth)
+        end_of_pages = object()
+
+        async def produce():
+            try:
+                async for page in pages:
+                    await buffer.put((page, None))
+                await buffer.put((end_of_pages, None))
+            except Exception as e:
+                await buffer.put((None, e))
+            finally:
+                await pages.aclose()
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                page, error = await buffer.get()
+                if error:
+                    raise error
+                if page is end_of_pages:
+                    return
+                yield page
+        finally:
+            producer.cancel()
+
+    async def _fan_out_pages(
+        self, url: str, params: dict, response: dict, listing_key: str, max_limit: int, concurrency: int
+    ) -> AsyncIterator[dict]:
+        """Generate pages in order, with up to `concurrency` of the pages following the response given in flight
+
+        No pages beyond `max_limit` are requested, and outstanding requests are cancelled if the generator is closed
+        early.
+        """
+        yield response
+
+        page = response["page"]
+        limit = page["limit"]
+        end = page["total"]
+        if max_limit:
+            end = min(end, page["offset"] + max_limit)
+        offsets = iter(range(page["offset"] + limit, end, limit))
+        pending = deque()
+
+        def submit_next():
+            offset = next(offsets, None)
+            if offset is not None:
+                pending.append(
+                    asyncio.ensure_future(self._get(url, params={**params, "offset": offset, "limit": limit}))
+                )
+
+        try:
+            for _ in range(concurrency):
+                submit_next()
+
+            while pending:
+                response = await pending.popleft()
+                submit_next()
+                yield response
+
+                # the total can shrink while paging, so stop at the first empty page
+                if not response.get(listing_key):
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _get_date_range(
+        self,
+        url: str,
+        start: date,
+        end: date,
+        value_key: str = "value",
+        window_key: str = None,
+        params: dict = None,
+        series_key: tuple = None,
+        as_series: bool = False,
+    ) -> Union[dict, DailySeries]:
+        """Async equivalent of Client._get_date_range, fetching all windows of the range at once"""
+        window_size = self.window_days.get(window_key, self.DEFAULT_WINDOW_DAYS)
+        windows = date_windows(start, end, window_size)
+        use_cache = bool(self.series_cache and series_key and windows)
+        if use_cache:
+            windows = [
+                window
+                for gap in await self._in_thread(self.series_cache.missing_ranges, series_key, start, end)
+                for window in date_windows(*gap, window_size) or [gap]
+            ]
+
+        async def fetch(window: tuple) -> list:
+            window_params = {**(params or {}), "startDate": window[0].isoformat(), "endDate": window[1].isoformat()}
+            items = self._get_paginated(url, params=window_params)
+            points = [(item["date"][:10], item[value_key]) async for item in items]
+            if use_cache:
+                await self._in_thread(self.series_cache.put, series_key, window[0], window[1], dict(points))
+            if self.snapshot_store and series_key:
+                await self._in_thread(self.snapshot_store.put, series_key, points)
+            return points
+
+        results = await asyncio.gather(*(fetch(window) for window in windows))
+        if use_cache:
+            values = await self._in_thread(self.series_cache.get, series_key, start, end)
+            return DailySeries.from_dict(values, start, end) if as_series else values
+
+        if as_series:
+            return DailySeries.from_points((point for points in results for point in points), start, end)
+
+        values = {}
+        for points in results:
+            for day, value in points:
+                values[day] = value
+        return values
+
+    async def _get_single_object(
+        self, url: str, params: dict = None, payload: dict = None, obj_type: str = None
+    ) -> dict:
+        """Async equivalent of Client._get_single_object
+
+        Args:
+            url (str): Path relative to the prefix
+            params (dict, optional): Query parameters. Defaults to None.
+            payload (dict, optional): Body to send. Defaults to None.
+            obj_type (str, optional): Optionally indicate the expected type, to be checked before anything returned.
+            Defaults to None.
+
+        Raises:
+            IncorrectReponseType: If the response type doesn't match obj_type
+
+        Returns:
+            dict: The object from the response
+        """
+        response = await self._get(url, params=params, payload=payload)
+
+        if obj_type and response.get("type") != obj_type:
+            raise IncorrectReponseType("Expected type {}, received {}".format(obj_type, response.get("type")))
+        return response.get("object")
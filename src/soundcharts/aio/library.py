@@ -0,0 +1,20 @@
+import logging
+from typing import AsyncIterator
+
+from soundcharts.aio.client import AsyncClient
+
+logger = logging.getLogger(__name__)
+
+
+class Library(AsyncClient):
+    """Async twin of soundcharts.library.Library"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._prefix = "/api/v2/library"
+
+    async def artist(self, max_limit: int = None) -> AsyncIterator[dict]:
+        """List artists in library"""
+        url = "/artist"
+        async for item in self._get_paginated(url, max_limit=max_limit):
+            yield item
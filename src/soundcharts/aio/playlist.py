@@ -0,0 +1,129 @@
+from datetime import date, datetime
+from typing import AsyncIterator, Dict, Union
+
+from soundcharts.aio.client import AsyncClient, setprefix
+from soundcharts.platform import PlaylistPlatform
+from soundcharts.timeseries import DailySeries
+from soundcharts.types import PlaylistType
+
+
+class Playlist(AsyncClient):
+    """Async twin of soundcharts.playlist.Playlist; see there for full method documentation"""
+
+    def __init__(self, **kwargs):
+        super().__init__(prefix="/api/v2/playlist", **kwargs)
+
+    async def platforms(self) -> AsyncIterator[Dict]:
+        """Find available playlist platforms"""
+        url = "/platforms"
+        async for item in self._get_paginated(url):
+            yield item
+
+    async def curators(
+        self,
+        platform: PlaylistPlatform,
+        limit: int = None,
+        offset: int = None,
+        max_limit: int = None,
+    ) -> AsyncIterator[Dict]:
+        """List curators for a platform"""
+        url = f"/curators/{platform.value}"
+        params = {}
+        if limit:
+            params["limit"] = limit
+        if offset:
+            params["offset"] = offset
+        async for item in self._get_paginated(url, params, max_limit=max_limit):
+            yield item
+
+    @setprefix(prefix="/api/v2.8/playlist")
+    async def by_uuid(self, uuid: str) -> dict:
+        """Retrieve the playlist for a Soundcharts identifier"""
+        try:
+            url = f"/{uuid}"
+            return await self._get_single_object(url, obj_type="playlist")
+        except Exception as e:
+            print(e)
+            return None
+
+    @setprefix(prefix="/api/v2.8/playlist")
+    async def by_id(self, platform: PlaylistPlatform, identifier: str) -> dict:
+        """Retrieve the playlist for a platform identifier"""
+        try:
+            url = f"/by-platform/{platform.value}/{identifier}"
+            return await self._get_single_object(url, obj_type="playlist")
+        except Exception as e:
+            print(e)
+            return None
+
+    @setprefix(prefix="/api/v2.20/playlist")
+    async def by_type(
+        self,
+        platform: PlaylistPlatform,
+        type: PlaylistType,
+        limit: int = None,
+        offset: int = None,
+        sortBy: str = "audience",
+        sortOrder: str = "desc",
+        max_limit: int = None,
+        concurrency: int = None,
+    ) -> AsyncIterator[dict]:
+        """List playlists from a platform by type"""
+        url = f"/by-type/{platform.value}/{type.value}"
+
+        params = {}
+        if limit:
+            params["limit"] = limit
+        if offset:
+            params["offset"] = offset
+        if sortBy:
+            params["sortBy"] = sortBy
+        if sortOrder:
+            params["sortOrder"] = sortOrder
+
+        async for item in self._get_paginated(url, params, max_limit=max_limit, concurrency=concurrency):
+            yield item
+
+    @setprefix(prefix="/api/v2.20/playlist")
+    async def by_curator(
+        self,
+        platform: PlaylistPlatform,
+        curator: str,
+        limit: int = None,
+        offset: int = None,
+        sortBy: str = "audience",
+        sortOrder: str = "desc",
+        max_limit: int = None,
+    ) -> AsyncIterator[dict]:
+        """List playlists from a platform by curator"""
+        url = f"/by-curator/{platform.value}/{curator}"
+
+        params = {}
+        if limit:
+            params["limit"] = limit
+        if offset:
+            params["offset"] = offset
+        if sortBy:
+            params["sortBy"] = sortBy
+        if sortOrder:
+            params["sortOrder"] = sortOrder
+
+        async for item in self._get_paginated(url, params, max_limit=max_limit):
+            yield item
+
+    @setprefix(prefix="/api/v2.20/playlist")
+    async def audience_daily(
+        self, uuid: str, start: date, end: date = None, as_series: bool = False
+    ) -> Union[dict, DailySeries]:
+        """Retrieve the subscriber count for a playlist for each day across a range of dates"""
+        url = f"/{uuid}/audience"
+        if not end:
+            end = datetime.utcnow().date()
+        return await self._get_date_range(
+            url,
+            start,
+            end,
+            window_key="audience_daily",
+            series_key=(uuid, "playlist_audience", None),
+            as_series=as_series,
+        )
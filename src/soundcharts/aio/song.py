@@ -0,0 +1,84 @@
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Union
+
+from soundcharts.aio.client import AsyncClient
+from soundcharts.errors import ItemNotFoundError
+from soundcharts.platform import SocialPlatform
+from soundcharts.timeseries import DailySeries
+
+
+class Song(AsyncClient):
+    """Async twin of soundcharts.song.Song; see there for full method documentation"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._prefix = "/api/v2/song"
+
+    async def song_by_id(self, uuid: str) -> dict:
+        """Retrieve a song using the Soundcharts ID"""
+        url = "/{uuid}".format(uuid=uuid)
+        return await self._get_single_object(url, obj_type="song")
+
+    async def song_by_isrc(self, isrc: str) -> dict:
+        """Retrieve a song using the ISRC"""
+        url = "/by-isrc/{isrc}".format(isrc=isrc)
+        return await self._get_single_object(url, obj_type="song")
+
+    async def identifiers(self, uuid: str) -> AsyncIterator[dict]:
+        """Retrieve the platform identifiers for a song using Soundcharts ID"""
+        url = "/{uuid}/identifiers".format(uuid=uuid)
+        async for item in self._get_paginated(url):
+            yield item
+
+    async def platform_identifier(self, platform: SocialPlatform, uuid: str):
+        """Retrieve the platform identifier for a Soundcharts UUID, if present"""
+        async for item in self.identifiers(uuid):
+            if item["platformCode"] == platform.value:
+                return item["identifier"]
+
+        return None
+
+    async def get_tiktok_music_link(
+        self, uuid: str, limit: int = None, offset: int = None, max_limit: int = 10
+    ) -> AsyncIterator[dict]:
+        url = "/{uuid}/tiktok/musics".format(uuid=uuid)
+
+        params = {}
+        if limit:
+            params["limit"] = limit
+        if offset:
+            params["offset"] = offset
+        async for item in self._get_paginated(url, params, max_limit=max_limit):
+            yield item
+
+    async def song_by_platform_identifier(self, platform: SocialPlatform, identifier: str):
+        """Retrieve a song using an external platform identifier e.g. Spotify ID"""
+        url = "/by-platform/{platform}/{identifier}".format(platform=platform.value, identifier=identifier)
+        song = await self._get_single_object(url, obj_type="song")
+        if not song:
+            raise ItemNotFoundError("No Song found for platform: {}, id: {}".format(platform.value, identifier))
+        return song
+
+    async def spotify_stream_count(
+        self, uuid: str, start: date = None, end: date = None, as_series: bool = False
+    ) -> Union[dict, DailySeries]:
+        """Retrieve the Spotify stream count for a song between two dates"""
+        url = "/{uuid}/spotify/stream".format(uuid=uuid)
+        if not start:
+            start = (datetime.utcnow() - timedelta(days=90)).date()
+        if not end:
+            end = datetime.utcnow().date()
+
+        return await self._get_date_range(
+            url,
+            start,
+            end,
+            window_key="spotify_stream_count",
+            series_key=(uuid, "spotify_streams", None),
+            as_series=as_series,
+        )
+
+    async def spotify_stream_count_by_spotify_id(self, spotify_id: str, start: date = None, end: date = None) -> dict:
+        """Convenience function to find Soundcharts UUID for a Spotify track, then retrieve stream counts"""
+        song = await self.song_by_platform_identifier(SocialPlatform.SPOTIFY, spotify_id)
+        return await self.spotify_stream_count(song["uuid"], start, end)
@@ -0,0 +1,66 @@
+from datetime import date, datetime
+import logging
+from typing import AsyncIterator
+
+from soundcharts.aio.client import AsyncClient, setprefix
+
+logger = logging.getLogger(__name__)
+
+
+class Tiktok(AsyncClient):
+    """Async twin of soundcharts.tiktok.Tiktok; see there for full method documentation"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._prefix = "/api/v2/tiktok"
+
+    async def get_latest_video_views(self, username: str, limit: int = None) -> AsyncIterator[dict]:
+        """Retrieve the latest videos for a TikTok user"""
+        url = "/user/{username}/videos".format(username=username)
+        params = {}
+        async for item in self._get_paginated(url, params=params, max_limit=limit):
+            yield item
+
+    async def get_user(self, username: str) -> dict:
+        """Retrieves user info"""
+        url = "/user/{username}".format(username=username)
+        return await self._get_single_object(url)
+
+    @setprefix(prefix="/api/v2.11/tiktok")
+    async def get_user_stats(self, username: str, end: date, period: int):
+        """Retrieves user statistics over `period` days up to `end`"""
+        url = "/user/{username}/audience".format(username=username)
+        params = {}
+        if not end:
+            end = datetime.utcnow().date()
+        params["period"] = period
+        params["endDate"] = end
+        return await self._get_single_object(url, params)
+
+    async def get_video(self, identifier: str):
+        """Retrieves video info"""
+        url = "/video/{identifier}".format(identifier=identifier)
+        return await self._get(url)
+
+    async def get_video_stats(self, identifer: str, period: int, end: date = None) -> AsyncIterator[dict]:
+        """Retrieves video audience statistics over `period` days up to `end`"""
+        url = "/video/{identifier}/audience".format(identifier=identifer)
+        params = {}
+        if not end:
+            end = datetime.utcnow().date()
+        params["period"] = period
+        params["endDate"] = end
+        async for item in self._get_paginated(url, params):
+            yield item
+
+    async def add_user_links(self, links: list):
+        """Submit tiktok user urls not present in Soundcharts Data"""
+        if not links:
+            return
+
+        # very mild validation of the links
+        links = [lnk for lnk in links if lnk.startswith("http")]
+
+        url = "/user/urls/add"
+        payload = {"urls": links}
+        return await self._post(url, payload=payload)
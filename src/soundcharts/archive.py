@@ -0,0 +1,238 @@
+from datetime import date, timedelta
+import logging
+import mmap
+import os
+import struct
+from typing import Iterator, List, Tuple
+
+from soundcharts.timeseries import DailySeries
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SCAR"
+VERSION = 1
+
+# magic, version, days per block, number of series, offset of the index
+HEADER = struct.Struct("<4sHHIQ")
+# entity, first day (ordinal), number of days, offset of the series data, number of blocks
+ENTRY = struct.Struct("<40sIIQI")
+KEY_SIZE = 40
+BLOCK_OFFSET = struct.Struct("<I")
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _put_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(buffer, position: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = buffer[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+class ArchiveWriter:
+    """Write integer daily series, e.g. follower counts or cumulative streams, to a compact archive file
+
+    One file holds one metric for any number of entities. Each series is split into blocks of `block_days` days;
+    within a block each value is stored as the zigzag varint of its difference from the previous one, along with
+    the varint gap in days since the previous value, so a slowly changing series takes a byte or two per day. A
+    fixed-width index sorted by entity, at an offset given in the header, locates each series and its blocks.
+
+    Series are written as they are added, and the index when the writer is closed.
+
+    Args:
+        path (str): File to write, replacing any existing file
+        block_days (int, optional): Days per block, the unit decoded by range reads. Defaults to 128.
+    """
+
+    def __init__(self, path: str, block_days: int = 128):
+        self.block_days = block_days
+        self._file = open(path, "wb")
+        self._file.write(bytes(HEADER.size))
+        self._entries = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, entity: str, series: DailySeries):
+        """Add the series of one entity; its values must be integers, as floats would be truncated
+
+        Args:
+            entity (str): Identifies the series, e.g. an artist UUID, at most 40 bytes of UTF-8
+            series (DailySeries): The values, e.g. from a daily method called with as_series=True
+        """
+        key = entity.encode()
+        if len(key) > KEY_SIZE:
+            raise ValueError(f"Entity {entity!r} is longer than {KEY_SIZE} bytes")
+        if key in self._entries:
+            raise ValueError(f"Entity {entity!r} is already in the archive")
+        if series.step != 1:
+            raise ValueError("Only series with a value per day can be archived")
+        # a NumPy dtype kind, or an array typecode without NumPy
+        kind = series.values.dtype.kind if hasattr(series.values, "dtype") else series.values.typecode
+        if kind in ("f", "d"):
+            raise ValueError(f"Series of {entity!r} holds floats; only integer series can be archived")
+
+        blocks = []
+        for block_start in range(0, len(series), self.block_days):
+            block = bytearray()
+            previous_index, previous_value = block_start - 1, 0
+            for index in range(block_start, min(block_start + self.block_days, len(series))):
+                if series.missing[index]:
+                    continue
+                value = int(series.values[index])
+                _put_varint(block, index - previous_index - 1)
+                _put_varint(block, _zigzag(value - previous_value))
+                previous_index, previous_value = index, value
+            blocks.append(block)
+
+        offset = self._file.tell()
+        position = 0
+        for block in blocks:
+            self._file.write(BLOCK_OFFSET.pack(position))
+            position += len(block)
+        self._file.write(BLOCK_OFFSET.pack(position))
+        for block in blocks:
+            self._file.write(block)
+        self._entries[key] = (series.start.toordinal(), len(series), offset, len(blocks))
+
+    def close(self):
+        """Write the index and header, and close the file"""
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        for key in sorted(self._entries):
+            self._file.write(ENTRY.pack(key, *self._entries[key]))
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, self.block_days, len(self._entries), index_offset))
+        self._file.close()
+        logger.debug("Archived %d series, %d bytes", len(self._entries), index_offset)
+
+
+class Archive:
+    """Read series from an archive written by ArchiveWriter, without loading the file
+
+    The file is memory mapped. Finding a series is a binary search of the index, and reading a range of days only
+    decodes the blocks covering it.
+
+    Args:
+        path (str): The archive file
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{path} is not a soundcharts archive")
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.block_days, self._count, self._index_offset = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} soundcharts archive")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, entity: str) -> bool:
+        return self._find(entity) is not None
+
+    def _key(self, position: int) -> bytes:
+        return self._map[
+            self._index_offset + position * ENTRY.size : self._index_offset + position * ENTRY.size + KEY_SIZE
+        ].rstrip(b"\0")
+
+    def entities(self) -> Iterator[str]:
+        """Every entity in the archive, in sorted order"""
+        for position in range(self._count):
+            yield self._key(position).decode()
+
+    def _find(self, entity: str) -> tuple:
+        """Binary search of the index, returning the rest of the entity's entry or None"""
+        key = entity.encode()
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._count or self._key(low) != key:
+            return None
+        return ENTRY.unpack_from(self._map, self._index_offset + low * ENTRY.size)[1:]
+
+    def read(self, entity: str, start: date = None, end: date = None) -> DailySeries:
+        """Read the series of an entity, or the part of it between start and end (inclusive)
+
+        Args:
+            entity (str): Identifies the series
+            start (date, optional): First day to read. Defaults to the start of the series.
+            end (date, optional): Last day to read. Defaults to the end of the series.
+
+        Raises:
+            KeyError: If the entity is not in the archive
+
+        Returns:
+            DailySeries: The values, with days that have no value marked missing
+        """
+        found = self._find(entity)
+        if found is None:
+            raise KeyError(entity)
+        first_day, length, offset, block_count = found
+
+        series_start = date.fromordinal(first_day)
+        start = start or series_start
+        end = end or series_start + timedelta(days=length - 1)
+        first, last = (start - series_start).days, (end - series_start).days
+        offsets, values = [], []
+        if length and first <= last:
+            blocks_start = offset + BLOCK_OFFSET.size * (block_count + 1)
+            for block in range(max(first, 0) // self.block_days, min(last, length - 1) // self.block_days + 1):
+                position, block_end = (
+                    blocks_start + BLOCK_OFFSET.unpack_from(self._map, offset + BLOCK_OFFSET.size * (block + i))[0]
+                    for i in (0, 1)
+                )
+                index, value = block * self.block_days - 1, 0
+                while position < block_end:
+                    gap, position = _get_varint(self._map, position)
+                    delta, position = _get_varint(self._map, position)
+                    index += gap + 1
+                    value += _unzigzag(delta)
+                    if first <= index <= last:
+                        offsets.append(index - first)
+                        values.append(value)
+        return DailySeries.from_offsets(start, max(last - first + 1, 0), offsets, values, "q")
+
+    def read_all(self, entities: List[str], start: date, end: date) -> Iterator[Tuple[str, DailySeries]]:
+        """Read the same range of many series, leaving out entities not in the archive"""
+        for entity in entities:
+            try:
+                yield entity, self.read(entity, start, end)
+            except KeyError:
+                continue
@@ -1,18 +1,29 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+import copy
 from datetime import date, datetime, timedelta, UTC
 import logging
-from typing import Iterator
+from typing import Iterable, Iterator, Union
 
 from soundcharts.client import Client, setprefix
+from soundcharts.audience import AudienceReport, AudienceReportMemo
 from soundcharts.errors import ConnectionError, NoSocialAccountFound
+from soundcharts.monthly import MonthlyMemo
 from soundcharts.platform import SocialPlatform
+from soundcharts.snapshot import FollowerSnapshot
+from soundcharts.timeseries import DailySeries, month_range
 
 logger = logging.getLogger(__name__)
 
 
 class Artist(Client):
-    def __init__(self, **kwargs):
+    def __init__(self, audience_report_ttl: float = 300, monthly_memo: MonthlyMemo = None, **kwargs):
         super().__init__(**kwargs)
         self._prefix = "/api/v2/artist"
+        # latest audience reports, shared by the helpers which read parts of them
+        self._audience_reports = AudienceReportMemo(audience_report_ttl)
+        # monthly data for closed months, which never changes
+        self.monthly_memo = monthly_memo or MonthlyMemo()
 
     @setprefix(prefix="/api/v2.9/artist")
     def artist_by_id(self, id: str) -> dict:
@@ -50,14 +61,40 @@ class Artist(Client):
         Returns:
             [type]: [description]
         """
+        uuid = self.identifier_index.uuid("artist", platform.value, identifier) if self.identifier_index else None
+        if uuid:
+            return self.artist_by_id(uuid)
+
         url = "/by-platform/{platform}/{identifier}".format(platform=platform.value, identifier=identifier)
-        return self._get_single_object(url, obj_type="artist")
+        artist = self._get_single_object(url, obj_type="artist")
+        if artist and self.identifier_index:
+            self.identifier_index.put_uuid("artist", platform.value, identifier, artist["uuid"])
+        return artist
+
+    def uuids_by_platform_identifier(self, platform: SocialPlatform, identifiers: Iterable[str]) -> dict:
+        """Resolve many platform identifiers, e.g. Spotify IDs, to Soundcharts UUIDs
+
+        With an identifier index, those already indexed are resolved locally and the rest are added to it.
+
+        Args:
+            platform (SocialPlatform): The platform
+            identifiers (Iterable[str]): Identifiers on the platform
+
+        Returns:
+            dict: Map of identifier to UUID, leaving out those without an artist
+        """
+        return self._uuids_by_platform_identifier("artist", platform, identifiers, self.artist_by_platform_identifier)
 
-    def artist_by_country(self, country_iso: str, limit: int = None, max_limit: int = None) -> Iterator[dict]:
+    def artist_by_country(
+        self, country_iso: str, limit: int = None, max_limit: int = None, concurrency: int = None
+    ) -> Iterator[dict]:
         """Search for artists by country code
 
         Args:
             country_iso (str): Code to search for
+            limit (int, optional): API limit per page. Defaults to None.
+            max_limit (int, optional): Maximum number of artists to retrieve. Defaults to None.
+            concurrency (int, optional): Fetch pages concurrently on this many workers. Defaults to None.
 
         Returns:
             list: matching artist objects
@@ -67,7 +104,7 @@ class Artist(Client):
         params = {}
         if limit:
             params["limit"] = limit
-        yield from self._get_paginated(url, params=params, max_limit=max_limit)
+        yield from self._get_paginated(url, params=params, max_limit=max_limit, concurrency=concurrency)
 
     def artist_followers_by_platform_latest(self, uuid: str, platform: SocialPlatform, start: date = None) -> int:
         """Convenience function to find the most recent value for the daily followers on the given platform
@@ -80,6 +117,42 @@ class Artist(Client):
         Yields:
             int: Most recent number of followers available
         """
+        try:
+            return self._followers_latest(uuid, platform, start)[1]
+        except ConnectionError:
+            return None
+
+    def followers_snapshot(
+        self, uuids: Iterable[str], platforms: Iterable[SocialPlatform], start: date = None, concurrency: int = None
+    ) -> FollowerSnapshot:
+        """Find the most recent daily followers of many artists on many platforms at once
+
+        Each (artist, platform) is looked up as by `artist_followers_by_platform_latest`, concurrently and pacing
+        with any rate limiter shared by the client. A failed lookup is recorded in the snapshot's `errors`, rather
+        than being returned as None.
+
+        Args:
+            uuids (Iterable[str]): Artist Soundcharts UUIDs
+            platforms (Iterable[SocialPlatform]): The platforms
+            start (date): Optional date to start from - the easliest date to look back to
+            concurrency (int, optional): Number of lookups to make at a time. Defaults to `max_workers`.
+
+        Returns:
+            FollowerSnapshot: Latest value and date by artist and platform
+        """
+        snapshot = FollowerSnapshot(list(dict.fromkeys(uuids)), list(dict.fromkeys(platforms)))
+        cells = ((uuid, platform) for uuid in snapshot.artists for platform in snapshot.platforms)
+        for (uuid, platform), result in self._bulk(
+            lambda cell: self._followers_latest(*cell, start), cells, concurrency
+        ):
+            if isinstance(result, Exception):
+                snapshot.errors[(uuid, platform)] = result
+            else:
+                snapshot.set(uuid, platform, *result)
+        return snapshot
+
+    def _followers_latest(self, uuid: str, platform: SocialPlatform, start: date = None) -> tuple:
+        """The (date, value) of the most recent daily followers, (None, None) if there are none"""
         url = "/{uuid}/social/{platform}".format(uuid=uuid, platform=platform.value)
         if not start:
             start = date.today() - timedelta(days=90)
@@ -87,22 +160,19 @@ class Artist(Client):
 
         found_values = {}
         current_start = max(start, end - timedelta(days=90))
-        try:
-            while not found_values and current_start >= start and current_start < end:
-                params = {"startDate": current_start.isoformat(), "endDate": end.isoformat()}
-                for item in self._get_paginated(url, params=params):
-                    found_values[item["date"][:10]] = item["value"]
+        while not found_values and current_start >= start and current_start < end:
+            params = {"startDate": current_start.isoformat(), "endDate": end.isoformat()}
+            for item in self._get_paginated(url, params=params):
+                found_values[item["date"][:10]] = item["value"]
 
-                end = current_start
-                current_start = max(start, end - timedelta(days=90))
+            end = current_start
+            current_start = max(start, end - timedelta(days=90))
 
-            # return the last item it any found
-            if found_values:
-                return list(found_values.values())[-1]
-            else:
-                return None
-        except ConnectionError:
-            return None
+        # the last item if any found
+        if found_values:
+            day = list(found_values)[-1]
+            return date.fromisoformat(day), found_values[day]
+        return None, None
 
     def artist_followers_by_platform_daily(
         self, uuid: str, platform: SocialPlatform, day: date, allow_backscan: bool = False, recurse_count: int = None
@@ -115,7 +185,7 @@ class Artist(Client):
             day (date): Date to retrieve count for
             allow_backscan (bool, optional): If no data is found for the day given, look at previous days. Defaults to
             False.
-            recurse_count (int, optional): How many days left to check in backscan. Defaults to None, if backscan
+            recurse_count (int, optional): How many previous days to check in backscan. Defaults to None, if backscan
             starts will be at 8, so set this higher to look further back
 
         Yields:
@@ -123,22 +193,14 @@ class Artist(Client):
         """
         try:
             url = "/{uuid}/social/{platform}".format(uuid=uuid, platform=platform.value)
+            if allow_backscan:
+                return self._followers_backscan(url, day, 8 if recurse_count is None else max(recurse_count, 0))
+
             params = {"startDate": day.isoformat(), "endDate": day.isoformat()}
             data = self._get(url, params)
 
             if not data.get("items"):
                 logger.info("No data found for specified date")
-                if allow_backscan:
-                    if recurse_count is None:
-                        recurse_count = 8
-
-                    if recurse_count > 0:
-                        prev_day = (datetime.combine(day, datetime.min.time()) - timedelta(1)).date()
-                        logger.info("Back-scanning to date: %s", prev_day.isoformat())
-                        return self.artist_followers_by_platform_daily(
-                            uuid, platform, prev_day, allow_backscan=True, recurse_count=recurse_count - 1
-                        )
-
                 return None
             elif len(data["items"]) > 1:
                 logger.info("More items returned than expected (%d)", len(data["items"]))
@@ -148,11 +210,37 @@ class Artist(Client):
         except ConnectionError:
             return None
 
-    def artist_followers_by_platform(self, uuid: str, platform: SocialPlatform, start: date, end: date = None) -> dict:
+    def _followers_backscan(self, url: str, day: date, days: int) -> int:
+        """Find the followers on `day`, or on the latest of the `days` days before it which has data, in one request
+
+        Gives the same answer as checking `day`, then the previous days one at a time, latest first.
+        """
+        params = {
+            "startDate": (day - timedelta(days=days)).isoformat(),
+            "endDate": day.isoformat(),
+        }
+        logger.info("Scanning from %s to %s", params["startDate"], params["endDate"])
+        items_by_day = {}
+        for item in self._get_paginated(url, params=params):
+            items_by_day.setdefault(item["date"][:10], []).append(item)
+        if day.isoformat() not in items_by_day:
+            logger.info("No data found for specified date")
+        if not items_by_day:
+            return None
+
+        items = items_by_day[max(items_by_day)]
+        if len(items) > 1:
+            logger.info("More items returned than expected (%d)", len(items))
+            return None
+        return items[0].get("value")
+
+    def artist_followers_by_platform(
+        self, uuid: str, platform: SocialPlatform, start: date, end: date = None, as_series: bool = False
+    ) -> Union[dict, DailySeries]:
         """Find daily followers per day over the defined period
 
         The Soundcharts API only pretends to support pagination for this call, and limits
-        any call to a 90 day range, so making repeated calls if the range provided covers
+        any call to a 90 day range, so making concurrent calls if the range provided covers
         more days than that constraint.
 
         Args:
@@ -160,6 +248,7 @@ class Artist(Client):
             platform (SocialPlatform): The platform
             start (date): Date to start from
             end (date): Date to end at, defaults to today
+            as_series (bool, optional): Return a DailySeries instead of a dict. Defaults to False.
 
         Yields:
             dict: Number of followers per day in the given period
@@ -167,16 +256,14 @@ class Artist(Client):
         url = "/{uuid}/social/{platform}".format(uuid=uuid, platform=platform.value)
         if not end:
             end = datetime.now(UTC).date()
-        follower_map = {}
-
-        current_start = max(start, end - timedelta(days=90))
-        while current_start >= start and current_start < end:
-            params = {"startDate": current_start.isoformat(), "endDate": end.isoformat()}
-            for item in self._get_paginated(url, params=params):
-                follower_map[item["date"][:10]] = item["value"]
-            end = current_start
-            current_start = max(start, end - timedelta(days=90))
-        return follower_map
+        return self._get_date_range(
+            url,
+            start,
+            end,
+            window_key="artist_followers_by_platform",
+            series_key=(uuid, "followers", platform.value),
+            as_series=as_series,
+        )
 
     @setprefix(prefix="/api/v2.20/artist")
     def playlist_positions_by_platform(
@@ -188,6 +275,7 @@ class Artist(Client):
         sort_order: str = "asc",
         max_limit: int = 1000,
         type: str = None,
+        prefetch: int = None,
     ) -> Iterator[dict]:
         """Generate a list of the positions that an artist features in playlists
 
@@ -201,6 +289,8 @@ class Artist(Client):
             sort_by (str, optional): Sort by this field. Defaults to "position".
             sort_order (str, optional): Sort oder. Defaults to "asc".
             max_limit (int, optional): Maximum number of playlists to retrieve. Defaults to 1000.
+            type (str, optional): Only include playlists of this type. Defaults to None.
+            prefetch (int, optional): Number of pages to read ahead in the background. Defaults to None.
 
         Yields:
             Iterator[dict]: [description]
@@ -215,10 +305,10 @@ class Artist(Client):
             params["sortOrder"] = sort_order
         if type:
             params["type"] = type
-        yield from self._get_paginated(url, params=params, max_limit=max_limit)
+        yield from self._get_paginated(url, params=params, max_limit=max_limit, prefetch=prefetch)
 
     def recent_playlists_by_platform(
-        self, uuid: str, platform: SocialPlatform, cutoff_date: date, max_limit: int = 1000
+        self, uuid: str, platform: SocialPlatform, cutoff_date: date, max_limit: int = 1000, prefetch: int = None
     ) -> Iterator[dict]:
         """Generate a list of the playlist positions where an artists has been added since a date
 
@@ -229,18 +319,23 @@ class Artist(Client):
             platform (SocialPlatform): [description]
             cutoff_date (date): The cutoff date to use
             max_limit (int, optional): [description]. Defaults to 1000.
+            prefetch (int, optional): Number of pages to read ahead in the background. Defaults to None.
 
         Yields:
             Iterator[dict]: [description]
         """
-        for item in self.playlist_positions_by_platform(
-            uuid, platform, sort_by="entryDate", sort_order="desc", max_limit=max_limit
-        ):
-            entry_date = datetime.fromisoformat(item["entryDate"]).date()
-            if entry_date < cutoff_date:
-                return
-
-            yield item
+        # close explicitly on reaching the cutoff, so any page being read ahead is abandoned straight away
+        with closing(
+            self.playlist_positions_by_platform(
+                uuid, platform, sort_by="entryDate", sort_order="desc", max_limit=max_limit, prefetch=prefetch
+            )
+        ) as positions:
+            for item in positions:
+                entry_date = datetime.fromisoformat(item["entryDate"]).date()
+                if entry_date < cutoff_date:
+                    return
+
+                yield item
 
     def add_artist_links(self, uuid: str, links: list):
         """Submit links to be added to the artist profile
@@ -278,17 +373,27 @@ class Artist(Client):
         """Retrieves an object that contains a list of Monthly Listeners values for that past
         month by city, by country and the total monthly listeners.
 
+        Closed months are only retrieved once, see `monthly_memo`.
+
         Args:
             uuid (str): Artist Soundcharts UUID
         """
-        url = f"/{uuid}/streaming/spotify/listeners/{year}/{month:02}"
-        yield from self._get_paginated(url)
-
-    def spotify_listeners_daily(self, uuid: str, start: date, end: date = None) -> dict:
+        key = (uuid, "spotify_listeners")
+        items = self.monthly_memo.get(key, year, month)
+        if items is None:
+            url = f"/{uuid}/streaming/spotify/listeners/{year}/{month:02}"
+            items = list(self._get_paginated(url))
+            self.monthly_memo.put(key, year, month, items)
+        yield from items
+
+    def spotify_listeners_daily(
+        self, uuid: str, start: date, end: date = None, as_series: bool = False
+    ) -> Union[dict, DailySeries]:
         """Retrieve the Spotify popularity for an artist for each day across a range of dates
 
         Args:
             country_iso (str): Code to search for
+            as_series (bool, optional): Return a DailySeries instead of a dict. Defaults to False.
 
         Returns:
             list: matching artist objects
@@ -297,40 +402,42 @@ class Artist(Client):
         url = f"/{uuid}/streaming/spotify/listening"
         if not end:
             end = datetime.now(UTC).date()
-        listeners_map = {}
-
-        current_start = max(start, end - timedelta(days=90))
-        while current_start >= start and current_start < end:
-            params = {"startDate": current_start.isoformat(), "endDate": end.isoformat()}
-            for item in self._get_paginated(url, params=params):
-                listeners_map[item["date"][:10]] = item["value"]
-            end = current_start
-            current_start = max(start, end - timedelta(days=90))
-        return listeners_map
+        return self._get_date_range(
+            url,
+            start,
+            end,
+            window_key="spotify_listeners_daily",
+            series_key=(uuid, "spotify_listeners", None),
+            as_series=as_series,
+        )
 
     def get_spotify_monthly_listeners_for_date_range(self, uuid: str, start: date, end: date) -> dict:
         """Retrieves an object that contains a list of Monthly Listeners values for each of the dates
         within `start` and `end` date provided, by querying the API for each of the months concerned
 
+        The months are fetched concurrently on up to `max_workers` threads.
+
         Args:
             uuid (str): Artist Soundcharts UUID
         """
-        all_items = {}
-        months_retrieved = []
-        current_date = start
-        while current_date <= end:
-            month_key = f"{current_date.year}-{current_date.month:02}"
-            if month_key not in months_retrieved:
-                url = f"/{uuid}/streaming/spotify/listeners/{current_date.year}/{current_date.month:02}"
-                for item in self._get_paginated(url):
-                    item_date = datetime.fromisoformat(item["date"]).date()
-                    if item_date >= start and item_date <= end:
-                        item.pop("date")
-                        all_items[item_date.isoformat()] = item
-                months_retrieved.append(month_key)
-
-            current_date += timedelta(days=1)
+        months = month_range(start, end)
+
+        def fetch(month: tuple) -> list:
+            return list(self.get_spotify_monthly_listeners_for_month(uuid, *month))
+
+        if len(months) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(months))) as executor:
+                results = list(executor.map(fetch, months))
+        else:
+            results = [fetch(month) for month in months]
 
+        all_items = {}
+        for items in results:
+            for item in items:
+                item_date = datetime.fromisoformat(item["date"]).date()
+                if item_date >= start and item_date <= end:
+                    item.pop("date")
+                    all_items[item_date.isoformat()] = item
         return all_items
 
     def get_monthly_located_followers(self, uuid: str, platform: SocialPlatform, year: int, month: int) -> dict:
@@ -392,6 +499,26 @@ class Artist(Client):
         logger.debug(report)
         return report
 
+    def audience_report(self, uuid: str, platform: SocialPlatform) -> AudienceReport:
+        """Retrieves the parts of the latest audience report used by the helpers below
+
+        The report is fetched once per artist, platform and day, then kept for `audience_report_ttl` seconds, so
+        the helpers can be called together without downloading the full report for each.
+
+        Args:
+            uuid (str): Artist Soundcharts UUID
+            platform (SocialPlatform): The platform
+
+        Returns:
+            AudienceReport: Stats and top posts from the report
+        """
+        key = (uuid, platform.value, datetime.now(UTC).date())
+        report = self._audience_reports.get(key)
+        if report is None:
+            report = AudienceReport.from_report(self.get_platform_report(uuid, platform))
+            self._audience_reports.put(key, report)
+        return report
+
     def get_audience_stats_by_platform(self, uuid: str, platform: SocialPlatform) -> dict:
         """Retrieves the full audience data for a given Social Platform
 
@@ -399,8 +526,7 @@ class Artist(Client):
             uuid (str): [description]
             platform (SocialPlatform): [description]
         """
-        report = self.get_platform_report(uuid, platform)
-        return report["audience"]["stats"]
+        return copy.deepcopy(self.audience_report(uuid, platform).stats)
 
     def get_engagement_data_by_platform(self, uuid: str, platform: SocialPlatform) -> float:
         """Retrieves the engagement rate for a given Social Platform, as a percentage
@@ -412,8 +538,7 @@ class Artist(Client):
             uuid (str): [description]
             platform (SocialPlatform): [description]
         """
-        audience_stats = self.get_audience_stats_by_platform(uuid, platform)
-        return audience_stats["engagementRate"] * 100
+        return self.audience_report(uuid, platform).engagement_rate
 
     def get_top_posts_by_platform(self, uuid: str, platform: SocialPlatform) -> list:
         """Retrieve the top posts for a platform by the artist
@@ -425,8 +550,7 @@ class Artist(Client):
         Returns:
             list: _description_
         """
-        report = self.get_platform_report(uuid, platform)
-        return report.get("top", {}).get("posts")
+        return copy.deepcopy(self.audience_report(uuid, platform).top_posts)
 
     def identifiers(self, uuid: str) -> dict:
         """Retrieve the platform identifiers for an artist using Soundcharts ID
@@ -437,10 +561,8 @@ class Artist(Client):
         Returns:
             dict: A map of platform key to identifier as a string
         """
-        url = "/{uuid}/identifiers".format(uuid=uuid)
         try:
-            response = self._get(url)
-            return {item["platformCode"]: item["identifier"] for item in response.get("items")}
+            return {item["platformCode"]: item["identifier"] for item in self._identifier_items(uuid)}
         except ConnectionError:
             return None
 
@@ -453,16 +575,27 @@ class Artist(Client):
         Returns:
             dict: A map of the platform key to a map of the identifier and url
         """
-        url = "/{uuid}/identifiers".format(uuid=uuid)
         try:
-            response = self._get(url)
             return {
                 item["platformCode"]: {"identifier": item["identifier"], "url": item["url"]}
-                for item in response.get("items")
+                for item in self._identifier_items(uuid)
             }
         except ConnectionError:
             return None
 
+    def _identifier_items(self, uuid: str) -> list:
+        """Platform identifiers of an artist as returned by the API, from the identifier index if it holds them"""
+        if self.identifier_index:
+            items = self.identifier_index.identifiers("artist", uuid)
+            if items is not None:
+                return items
+
+        url = "/{uuid}/identifiers".format(uuid=uuid)
+        items = self._get(url).get("items")
+        if self.identifier_index:
+            self.identifier_index.put_identifiers("artist", uuid, items)
+        return items
+
     def similar_artists(self, uuid: str, limit: int = None, offset: int = None) -> Iterator[dict]:
         """Retrieve similar artists
 
@@ -489,6 +622,7 @@ class Artist(Client):
         sortBy: str = "releaseDate",
         sortOrder: str = "desc",
         max_limit: int = None,
+        prefetch: int = None,
     ) -> Iterator[dict]:
         """Retrieve songs by an artist
 
@@ -498,6 +632,8 @@ class Artist(Client):
             offset (int, optional): Pagination offset. Defaults to None.
             sortBy (str, optional): Sort songs by, one of: name, releaseDate, spotifyStream, shazamCount, youtubeViews, spotifyPopularity
             sortOrder (str, optional): Sort order, one of: asc, desc
+            max_limit (int, optional): Maximum number of songs to retrieve. Defaults to None.
+            prefetch (int, optional): Number of pages to read ahead in the background. Defaults to None.
 
         Yields:
             Iterator[dict]: _description_
@@ -512,7 +648,7 @@ class Artist(Client):
             params["sortBy"] = sortBy
         if sortOrder:
             params["sortOrder"] = sortOrder
-        yield from self._get_paginated(url, params=params, max_limit=max_limit)
+        yield from self._get_paginated(url, params=params, max_limit=max_limit, prefetch=prefetch)
 
     def get_spotify_popularity_latest(self, uuid: str) -> int:
         return self.spotify_popularity_latest(uuid)
@@ -550,11 +686,14 @@ class Artist(Client):
 
         return None
 
-    def spotify_popularity_daily(self, uuid: str, start: date, end: date = None) -> dict:
+    def spotify_popularity_daily(
+        self, uuid: str, start: date, end: date = None, as_series: bool = False
+    ) -> Union[dict, DailySeries]:
         """Retrieve the Spotify popularity for an artist for each day across a range of dates
 
         Args:
             country_iso (str): Code to search for
+            as_series (bool, optional): Return a DailySeries instead of a dict. Defaults to False.
 
         Returns:
             list: matching artist objects
@@ -563,22 +702,23 @@ class Artist(Client):
         url = f"/{uuid}/spotify/popularity"
         if not end:
             end = datetime.now(UTC).date()
-        popularity_map = {}
-
-        current_start = max(start, end - timedelta(days=90))
-        while current_start >= start and current_start < end:
-            params = {"startDate": current_start.isoformat(), "endDate": end.isoformat()}
-            for item in self._get_paginated(url, params=params):
-                popularity_map[item["date"][:10]] = item["value"]
-            end = current_start
-            current_start = max(start, end - timedelta(days=90))
-        return popularity_map
-
-    def platform_followers_daily(self, platform: SocialPlatform, uuid: str, start: date, end: date = None) -> dict:
+        return self._get_date_range(
+            url,
+            start,
+            end,
+            window_key="spotify_popularity_daily",
+            series_key=(uuid, "spotify_popularity", None),
+            as_series=as_series,
+        )
+
+    def platform_followers_daily(
+        self, platform: SocialPlatform, uuid: str, start: date, end: date = None, as_series: bool = False
+    ) -> Union[dict, DailySeries]:
         """Retrieve the Spotify popularity for an artist for each day across a range of dates
 
         Args:
             country_iso (str): Code to search for
+            as_series (bool, optional): Return a DailySeries instead of a dict. Defaults to False.
 
         Returns:
             list: matching artist objects
@@ -587,17 +727,17 @@ class Artist(Client):
         url = f"/{uuid}/audience/{platform.value}"
         if not end:
             end = datetime.now(UTC).date()
-        followers_map = {}
 
-        current_start = max(start, end - timedelta(days=90))
         try:
-            while current_start >= start and current_start < end:
-                params = {"startDate": current_start.isoformat(), "endDate": end.isoformat()}
-                for item in self._get_paginated(url, params=params):
-                    followers_map[item["date"][:10]] = item["followerCount"]
-                end = current_start
-                current_start = max(start, end - timedelta(days=90))
-            return followers_map
+            return self._get_date_range(
+                url,
+                start,
+                end,
+                value_key="followerCount",
+                window_key="platform_followers_daily",
+                series_key=(uuid, "audience_followers", platform.value),
+                as_series=as_series,
+            )
         except ConnectionError as ce:
             if "No social account found for artist" in str(ce):
                 raise NoSocialAccountFound(f"No social account found for artist {uuid} on platform {platform}")
@@ -0,0 +1,52 @@
+import threading
+import time
+
+
+class AudienceReport:
+    """The parts of an audience report used by the helper methods, without the rest of the (large) payload
+
+    Args:
+        stats (dict): Audience stats e.g. followerCount, engagementRate, if the report has them
+        top_posts (list): Top posts, if the platform has them
+    """
+
+    def __init__(self, stats: dict = None, top_posts: list = None):
+        self.stats = stats
+        self.top_posts = top_posts
+
+    @classmethod
+    def from_report(cls, report: dict) -> "AudienceReport":
+        """Pull the needed sub-trees out of a full report, so the report itself can be freed"""
+        return cls(report.get("audience", {}).get("stats"), report.get("top", {}).get("posts"))
+
+    @property
+    def engagement_rate(self) -> float:
+        """Engagement rate as a percentage, or None if the report has no audience stats"""
+        if self.stats is None:
+            return None
+        return self.stats["engagementRate"] * 100
+
+
+class AudienceReportMemo:
+    """Audience reports by (uuid, platform, date), each kept for a short time
+
+    Expired reports are dropped whenever a report is added, so the memo only holds those in use.
+    """
+
+    def __init__(self, ttl: float = 300, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._reports = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> AudienceReport:
+        """The report for a key, or None if there is none or it has expired"""
+        with self._lock:
+            report, expires = self._reports.get(key, (None, 0))
+        return report if expires > self._clock() else None
+
+    def put(self, key: tuple, report: AudienceReport):
+        now = self._clock()
+        with self._lock:
+            self._reports = {k: entry for k, entry in self._reports.items() if entry[1] > now}
+            self._reports[key] = (report, now + self.ttl)
@@ -0,0 +1,256 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import copy
+from datetime import date
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+from soundcharts.errors import ConnectionError
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 3600
+
+# Responses which change at most daily, by regular expression on the request path (including the API prefix)
+DEFAULT_TTLS = {
+    r"/(artist|song|playlist)/[0-9a-f-]{36}$": DAY,
+    r"/identifiers$": DAY,
+    r"/audience/[^/]+/report/": DAY,
+    r"/streaming/spotify/listeners/\d{4}/\d{2}$": DAY,
+}
+
+
+class ResponseCache(ABC):
+    """Cache of GET responses, for those endpoints given a time to live
+
+    The TTL for a request is that of the first pattern in `ttls` found in its path, or `default_ttl` if none
+    match; requests with no TTL are not cached. Entries are keyed on the path, the query parameters in a canonical
+    order and the response language. Each lookup returns a fresh copy, so callers may modify what they receive.
+
+    Subclasses implement the storage: MemoryCache and SqliteCache.
+    """
+
+    def __init__(self, ttls: dict = None, default_ttl: float = 0, maxsize: int = 1024, clock=time.time):
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in (DEFAULT_TTLS if ttls is None else ttls).items()]
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> dict:
+        """Number of hits, misses and entries evicted to respect `maxsize`"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def ttl_for(self, path: str) -> float:
+        """Seconds for which a response from this path can be reused, 0 if not at all"""
+        for pattern, ttl in self.ttls:
+            if pattern.search(path):
+                return ttl
+        return self.default_ttl
+
+    @staticmethod
+    def key(path: str, params: dict = None, language: str = None) -> str:
+        """Build the cache key for a request, ignoring unset parameters and their order"""
+        params = {
+            name: value.isoformat() if isinstance(value, date) else str(value)
+            for name, value in (params or {}).items()
+            if value is not None
+        }
+        return f"{language or ''}:{path}?{urlencode(sorted(params.items()))}"
+
+    def get(self, path: str, params: dict = None, language: str = None):
+        """Look up a response, returning None if it is not cached, has expired or the path is not cacheable"""
+        if not self.ttl_for(path):
+            return None
+
+        value = self._load(self.key(path, params, language), self._clock())
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, path: str, params: dict, value, language: str = None):
+        """Store a response, if the path is cacheable"""
+        ttl = self.ttl_for(path)
+        if not ttl or value is None:
+            return
+        self._store(self.key(path, params, language), value, self._clock() + ttl)
+
+    @abstractmethod
+    def _load(self, key: str, now: float):
+        """The value stored under a key, or None if there is none or it expired before `now`"""
+
+    @abstractmethod
+    def _store(self, key: str, value, expires: float):
+        """Store a value under a key until `expires`"""
+
+    @abstractmethod
+    def clear(self):
+        """Remove every stored response"""
+
+
+class MemoryCache(ResponseCache):
+    """Response cache held in memory, evicting the least recently used entry beyond `maxsize` entries"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._entries = OrderedDict()
+
+    def _load(self, key: str, now: float):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def _store(self, key: str, value, expires: float):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SqliteCache(ResponseCache):
+    """Response cache in a sqlite database, which persists between runs and can be shared between processes
+
+    Beyond `maxsize` entries, expired entries are removed first, then the least recently used.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT, expires REAL, used REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_used ON responses (used)")
+
+    def close(self):
+        self._conn.close()
+
+    def _load(self, key: str, now: float):
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value FROM responses WHERE key = ? AND expires > ?", (key, now)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET used = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def _store(self, key: str, value, expires: float):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires, used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires, self._clock()),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            if count > self.maxsize:
+                count -= self._conn.execute("DELETE FROM responses WHERE expires <= ?", (self._clock(),)).rowcount
+            if count > self.maxsize:
+                evicted = self._conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY used LIMIT ?)",
+                    (count - self.maxsize,),
+                ).rowcount
+                self.evictions += evicted
+                logger.debug("Evicted %d responses from the cache", evicted)
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+
+class NegativeCache:
+    """Memory of requests which found nothing, so that they fail fast instead of being sent again
+
+    A request failing with a 404, or with "No social account found", is remembered for `ttl` seconds, keyed as in
+    ResponseCache on its path, query parameters and language, since a request may find nothing for some parameters
+    and something for others. The error raised is a copy of the original, so is handled exactly as it would have
+    been.
+
+    Beyond `maxsize` entries, the oldest are dropped. `invalidate` forgets entries, e.g. once an artist is known to
+    have linked an account.
+    """
+
+    MESSAGES = ("No social account found",)
+
+    def __init__(self, ttl: float = DAY, maxsize: int = 100_000, clock=time.time):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.stores = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> dict:
+        """Number of requests failed from memory, and of failures remembered"""
+        with self._lock:
+            return {"hits": self.hits, "stores": self.stores, "size": len(self._entries)}
+
+    def is_negative(self, error: ConnectionError) -> bool:
+        """Whether a failure means there is nothing to find, rather than a problem with the request"""
+        messages = [item.get("message", "") for item in error.errors or []]
+        return error.status_code == 404 or any(text in message for message in messages for text in self.MESSAGES)
+
+    def check(self, path: str, params: dict = None, language: str = None):
+        """Raise the remembered error for a request, if there is one which hasn't expired"""
+        key = ResponseCache.key(path, params, language)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            (url, status_code, errors), expires = entry
+            if expires <= self._clock():
+                del self._entries[key]
+                return
+            self.hits += 1
+        logger.debug("Failing %s from the negative cache", key)
+        raise ConnectionError(url, status_code, copy.deepcopy(errors))
+
+    def record(self, path: str, error: ConnectionError, params: dict = None, language: str = None):
+        """Remember a failure for a request, if it means there is nothing to find"""
+        if not self.is_negative(error):
+            return
+        key = ResponseCache.key(path, params, language)
+        with self._lock:
+            self._entries[key] = ((error.url, error.status_code, error.errors), self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            self.stores += 1
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, match: str = None) -> int:
+        """Forget the entries whose request contains `match`, e.g. a UUID or ISRC, or all entries if it is None
+
+        Returns:
+            int: Number of entries forgotten
+        """
+        with self._lock:
+            keys = [key for key in self._entries if match is None or match in key]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
@@ -0,0 +1,187 @@
+"""Command line export of SDK results
+
+    soundcharts [options] artist-songs --ids artists.txt
+    soundcharts [options] songs-by-isrc --ids isrcs.txt
+    soundcharts [options] playlists-by-type spotify editorial
+    soundcharts [options] top-artists spotify followers
+
+Records are streamed to the output in row groups as they arrive. NDJSON has the records as returned by the API, while
+CSV and Parquet have a fixed set of columns for each command. Credentials are read from the environment, as for the
+SDK.
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+import logging
+import sys
+from typing import Callable, Iterable, Iterator, List
+
+from soundcharts.export import FORMATS, open_writer, row_groups
+from soundcharts.hub import Hub
+from soundcharts.platform import PlaylistPlatform, SocialPlatform
+from soundcharts.ratelimit import RateLimiter
+from soundcharts.types import PlaylistType
+
+logger = logging.getLogger(__name__)
+
+# columns of each export in CSV and Parquet, as (dotted key, type); NDJSON has the full records
+ARTIST_SONG_COLUMNS = [
+    ("artistUuid", "string"),
+    ("uuid", "string"),
+    ("name", "string"),
+    ("creditName", "string"),
+    ("releaseDate", "string"),
+]
+SONG_COLUMNS = [
+    ("isrc", "string"),
+    ("error", "string"),
+    ("uuid", "string"),
+    ("name", "string"),
+    ("creditName", "string"),
+    ("artists", "string"),
+    ("releaseDate", "string"),
+    ("label", "string"),
+    ("copyright", "string"),
+    ("appUrl", "string"),
+    ("imageUrl", "string"),
+]
+PLAYLIST_COLUMNS = [
+    ("uuid", "string"),
+    ("name", "string"),
+    ("identifier", "string"),
+    ("platform", "string"),
+    ("countryCode", "string"),
+    ("type", "string"),
+    ("latestCrawlDate", "string"),
+    ("latestTrackCount", "int"),
+    ("latestSubscriberCount", "int"),
+]
+TOP_ARTIST_COLUMNS = [
+    ("artist.uuid", "string"),
+    ("artist.slug", "string"),
+    ("artist.name", "string"),
+    ("artist.appUrl", "string"),
+    ("artist.imageUrl", "string"),
+    ("total", "int"),
+    ("change", "int"),
+    ("percent", "float"),
+]
+
+
+def read_ids(path: str) -> Iterator[str]:
+    """Read ids one per line from a file, or "-" for standard input, skipping blank lines and # comments"""
+    file = sys.stdin if path == "-" else open(path)
+    try:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+
+def ordered_map(fn: Callable, items: Iterable, concurrency: int) -> Iterator:
+    """Apply fn to items on `concurrency` threads, yielding results in order with at most that many in flight"""
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = deque(executor.submit(fn, item) for item in _take(items, concurrency))
+        while pending:
+            result = pending.popleft().result()
+            pending.extend(executor.submit(fn, item) for item in _take(items, 1))
+            yield result
+
+
+def _take(items: Iterator, count: int) -> List:
+    return [item for _, item in zip(range(count), items)]
+
+
+def artist_songs(hub: Hub, args) -> Iterator[dict]:
+    def fetch(uuid: str) -> List[dict]:
+        return [{"artistUuid": uuid, **song} for song in hub.artist.songs(uuid, max_limit=args.max_limit)]
+
+    for songs in ordered_map(fetch, read_ids(args.ids), args.concurrency):
+        yield from songs
+
+
+def songs_by_isrc(hub: Hub, args) -> Iterator[dict]:
+    for isrc, song in hub.song.songs_by_isrc(read_ids(args.ids), concurrency=args.concurrency):
+        if isinstance(song, Exception):
+            yield {"isrc": isrc, "error": str(song)}
+        else:
+            yield {"isrc": isrc, "error": None, **song}
+
+
+def playlists_by_type(hub: Hub, args) -> Iterator[dict]:
+    yield from hub.playlist.by_type(
+        PlaylistPlatform(args.platform),
+        PlaylistType(args.type),
+        max_limit=args.max_limit,
+        concurrency=args.concurrency,
+    )
+
+
+def top_artists(hub: Hub, args) -> Iterator[dict]:
+    yield from hub.top_artist.artists_by_platform_metric(
+        SocialPlatform(args.platform),
+        args.metric,
+        sort_by=args.sort_by,
+        period=args.period,
+        max_limit=args.max_limit,
+        concurrency=args.concurrency,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="soundcharts", description="Export Soundcharts data")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="ndjson", help="Output format (default: ndjson)")
+    parser.add_argument("-o", "--output", default="-", help="Output file, - for standard output (default)")
+    parser.add_argument("--row-group", type=int, default=1000, help="Records written at a time (default: 1000)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight at a time (default: 4)")
+    parser.add_argument("--rate", type=float, default=10, help="Maximum requests per second (default: 10)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log progress to standard error")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("artist-songs", help="Songs of each artist")
+    command.add_argument("--ids", required=True, help="File of artist UUIDs, one per line, - for standard input")
+    command.add_argument("--max-limit", type=int, help="Songs per artist")
+    command.set_defaults(fetch=artist_songs, columns=ARTIST_SONG_COLUMNS)
+
+    command = commands.add_parser("songs-by-isrc", help="Song for each ISRC")
+    command.add_argument("--ids", required=True, help="File of ISRCs, one per line, - for standard input")
+    command.set_defaults(fetch=songs_by_isrc, columns=SONG_COLUMNS)
+
+    command = commands.add_parser("playlists-by-type", help="Playlists of a platform by type")
+    command.add_argument("platform", choices=[platform.value for platform in PlaylistPlatform])
+    command.add_argument("type", choices=[playlist_type.value for playlist_type in PlaylistType])
+    command.add_argument("--max-limit", type=int, help="Number of playlists")
+    command.set_defaults(fetch=playlists_by_type, columns=PLAYLIST_COLUMNS)
+
+    command = commands.add_parser("top-artists", help="Artists ranked by a platform metric")
+    command.add_argument("platform", choices=[platform.value for platform in SocialPlatform])
+    command.add_argument("metric", help="Metric type, e.g. followers")
+    command.add_argument("--sort-by", default="total", help="total or change (default: total)")
+    command.add_argument("--period", default="week", help="Period of the change (default: week)")
+    command.add_argument("--max-limit", type=int, help="Number of artists")
+    command.set_defaults(fetch=top_artists, columns=TOP_ARTIST_COLUMNS)
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, stream=sys.stderr)
+
+    writer = open_writer(args.format, args.output, args.columns)
+    try:
+        with Hub(rate_limiter=RateLimiter(rate=args.rate), pool_maxsize=max(10, args.concurrency)) as hub:
+            for rows in row_groups(args.fetch(hub, args), args.row_group):
+                writer.write(rows)
+                logger.info("Written %d records", writer.rows)
+    finally:
+        writer.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,46 +1,54 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import copy
+from datetime import date
 import functools
 import inspect
 import json
 import logging
 import os
+import queue
+import threading
+from types import MappingProxyType
 import requests
 from urllib.parse import urlparse, parse_qs
-from typing import Iterator
-
-from soundcharts.errors import ConnectionError, IncorrectReponseType
+from typing import Callable, Iterable, Iterator, Tuple, Union
+
+from soundcharts.cache import NegativeCache, ResponseCache
+from soundcharts.errors import ConnectionError, Error, IncorrectReponseType, ItemNotFoundError, QuotaExhaustedError
+from soundcharts.identifier_index import IdentifierIndex
+from soundcharts import pool
+from soundcharts.ratelimit import RateLimiter
+from soundcharts.retry import RetryPolicy
+from soundcharts.series_cache import SeriesCache
+from soundcharts.snapshot import SnapshotStore
+from soundcharts.singleflight import SingleFlight
+from soundcharts.timeseries import DailySeries, date_windows
 
 logger = logging.getLogger(__name__)
 
 
 def setprefix(prefix: str):
-    """Sets the prefix to something other than default for this method, then resets it"""
+    """Sets the prefix to something other than default for this method
+
+    The method is called on a copy of the client bound to the prefix, which shares the session, rather than by
+    swapping the prefix on the instance, so that one client can be used by many threads at once.
+    """
 
     def decorator(func):
         # check if the function is a generator before wrapping it, otherwise it will behave differently
         if inspect.isgeneratorfunction(func):
 
             @functools.wraps(func)
-            def wrapper(*args, **kwargs):
-                obj = args[0]
-                try:
-                    orig_prefix = obj._prefix
-                    obj._prefix = prefix
-                    yield from func(*args, **kwargs)
-                finally:
-                    obj._prefix = orig_prefix
+            def wrapper(self, *args, **kwargs):
+                yield from func(self._with_prefix(prefix), *args, **kwargs)
 
             return wrapper
         else:
 
             @functools.wraps(func)
-            def wrapper(*args, **kwargs):
-                obj = args[0]
-                try:
-                    orig_prefix = obj._prefix
-                    obj._prefix = prefix
-                    return func(*args, **kwargs)
-                finally:
-                    obj._prefix = orig_prefix
+            def wrapper(self, *args, **kwargs):
+                return func(self._with_prefix(prefix), *args, **kwargs)
 
             return wrapper
 
@@ -48,28 +56,101 @@ def setprefix(prefix: str):
 
 
 class Client:
-    def __init__(self, prefix=None, log_response=False):
-        self._auth_headers = {
-            "x-app-id": os.getenv("SOUNDCHARTS_APP_ID"),
-            "x-api-key": os.getenv("SOUNDCHARTS_API_KEY"),
-        }
+    # Longest date range the time series endpoints accept in a single request
+    DEFAULT_WINDOW_DAYS = 90
+
+    def __init__(
+        self,
+        prefix=None,
+        log_response=False,
+        window_days: dict = None,
+        max_workers: int = 8,
+        series_cache: SeriesCache = None,
+        snapshot_store: SnapshotStore = None,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+        response_cache: ResponseCache = None,
+        negative_cache: NegativeCache = None,
+        session: requests.Session = None,
+        single_flight: SingleFlight = None,
+        identifier_index: IdentifierIndex = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+    ):
+        # read only, as the client may be used by many threads at once
+        self._auth_headers = MappingProxyType(
+            {
+                "x-app-id": os.getenv("SOUNDCHARTS_APP_ID"),
+                "x-api-key": os.getenv("SOUNDCHARTS_API_KEY"),
+            }
+        )
         self._endpoint = os.getenv("SOUNDCHARTS_API_ENDPOINT", "https://customer.api.soundcharts.com")
-        self._build_session()
+        if session is None:
+            self._build_session(pool_connections, pool_maxsize, pool_block, keep_alive)
+        else:
+            self._session = session
+        # a session passed in is shared with other clients, so is left open for its owner to close
+        self._owns_session = session is None
         self._prefix = prefix
         self.language = None
         self.requests_timeout = 5
         self.log_response = log_response
+        # window size in days for time series requests, keyed by method name, e.g. {"spotify_popularity_daily": 30}
+        self.window_days = window_days or {}
+        self.max_workers = max_workers
+        self.series_cache = series_cache
+        # every time series fetched is also written here
+        self.snapshot_store = snapshot_store
+        # shared by every client that should count against the same quota
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.response_cache = response_cache
+        self.negative_cache = negative_cache
+        self.single_flight = single_flight or SingleFlight()
+        self.identifier_index = identifier_index
 
     @property
     def auth_headers(self):
         return self._auth_headers
 
-    def _build_session(self):
-        self._session = requests.Session()
+    def _build_session(
+        self, pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False, keep_alive: bool = True
+    ):
+        self._session = pool.build_session(pool_connections, pool_maxsize, pool_block, keep_alive)
+
+    def warm_up(self, connections: int = 1):
+        """Open connections to the API ahead of the first requests, e.g. one per worker thread"""
+        pool.warm_up(self._session, self._endpoint, connections)
+
+    def pool_stats(self) -> dict:
+        """Connections created and reused by the session, to help size the pool"""
+        return pool.pool_stats(self._session)
+
+    def _with_prefix(self, prefix: str) -> "Client":
+        """Copy of this client bound to a different prefix, sharing the same session"""
+        clone = copy.copy(self)
+        clone._prefix = prefix
+        clone._owns_session = False
+        return clone
+
+    def close(self):
+        """Flush the snapshot store, and close the session unless it was passed in to be shared"""
+        if self.snapshot_store:
+            self.snapshot_store.flush()
+        if self._owns_session:
+            self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
     def __del__(self):
         """Close session is currently connected"""
-        if isinstance(self._session, requests.Session):
+        if self._owns_session and isinstance(self._session, requests.Session):
             self._session.close()
 
     def _internal_call(self, method: str, url: str, payload: dict, params: dict):
@@ -78,9 +159,7 @@ class Client:
             url = self._prefix + url
         url = self._endpoint + url
 
-        headers = self.auth_headers
-
-        headers["Content-Type"] = "application/json"
+        headers = {**self.auth_headers, "Content-Type": "application/json"}
         if payload:
             args["data"] = json.dumps(payload)
 
@@ -97,11 +176,7 @@ class Client:
         )
 
         try:
-            response = self._session.request(method, url, headers=headers, timeout=self.requests_timeout, **args)
-
-            if "x-quota-remaining" in response.headers:
-                logger.info("Quota remaining: %s", response.headers["x-quota-remaining"])
-
+            response = self._send(method, url, headers, args)
             response.raise_for_status()
             results = response.json()
 
@@ -126,11 +201,60 @@ class Client:
 
         return results
 
+    def _send(self, method: str, url: str, headers: dict, args: dict) -> requests.Response:
+        """Send a request, pacing it with the rate limiter and retrying transient failures per the retry policy"""
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+
+            try:
+                response = self._session.request(method, url, headers=headers, timeout=self.requests_timeout, **args)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if not self.retry_policy.should_retry(method, None, attempt):
+                    raise
+                self.retry_policy.wait(None, attempt)
+                attempt += 1
+                continue
+
+            if "x-quota-remaining" in response.headers:
+                logger.info("Quota remaining: %s", response.headers["x-quota-remaining"])
+                if self.rate_limiter:
+                    self.rate_limiter.update(int(response.headers["x-quota-remaining"]))
+
+            if response.ok or not self.retry_policy.should_retry(method, response.status_code, attempt):
+                return response
+            self.retry_policy.wait(response.status_code, attempt, response.headers.get("Retry-After"))
+            attempt += 1
+
     def _get(self, url: str, params: dict = None, payload: dict = None, **kwargs):
         if params:
             kwargs.update(params)
 
-        return self._internal_call("GET", url=url, payload=payload, params=params)
+        if payload:
+            return self._internal_call("GET", url=url, payload=payload, params=params)
+
+        path = (self._prefix or "") + url
+        if self.negative_cache:
+            self.negative_cache.check(path, params, self.language)
+        if self.response_cache:
+            results = self.response_cache.get(path, params, self.language)
+            if results is not None:
+                return results
+
+        def fetch():
+            try:
+                results = self._internal_call("GET", url=url, payload=payload, params=params)
+            except ConnectionError as e:
+                if self.negative_cache:
+                    self.negative_cache.record(path, e, params, self.language)
+                raise
+            if self.response_cache:
+                self.response_cache.set(path, params, results, self.language)
+            return results
+
+        # identical requests already in flight from other threads share the response
+        return self.single_flight.do(ResponseCache.key(path, params, self.language), fetch)
 
     def _post(self, url: str, params: dict = None, payload: dict = None, **kwargs):
         if params:
@@ -139,32 +263,239 @@ class Client:
         return self._internal_call("POST", url=url, payload=payload, params=params)
 
     def _get_paginated(
-        self, url: str, params: dict = {}, listing_key: str = "items", max_limit: int = None
+        self,
+        url: str,
+        params: dict = {},
+        listing_key: str = "items",
+        max_limit: int = None,
+        concurrency: int = None,
+        prefetch: int = None,
     ) -> Iterator[dict]:
-        page = 0
+        """Generate the items from a paginated endpoint, handling the pagination
+
+        Args:
+            url (str): Path relative to the prefix
+            params (dict, optional): Query parameters. Defaults to {}.
+            listing_key (str, optional): Key of the items in each page. Defaults to "items".
+            max_limit (int, optional): Stop after this many items, without requesting further pages. Defaults to None.
+            concurrency (int, optional): Where the endpoint uses offset pagination, fetch the remaining pages on a
+            pool of this many workers once the total is known from the first page. Items are still yielded in order.
+            Defaults to None, following one page at a time.
+            prefetch (int, optional): Read ahead up to this many pages on a background thread, so the next page is
+            already in flight while the current one is being consumed. Defaults to None.
+
+        Yields:
+            Iterator[dict]: The items, in the order the API returns them
+        """
+        response = self._get(url, params=params)
+        if concurrency and concurrency > 1 and self._has_offset_pagination(response, listing_key):
+            pages = self._fan_out_pages(url, params, response, listing_key, max_limit, concurrency)
+        else:
+            pages = self._follow_pages(url, params, response, listing_key, max_limit)
+        if prefetch:
+            pages = self._prefetch_pages(pages, prefetch)
+
         item_count = 0
-        while True:
-            response = self._get(url, params=params)
+        try:
+            for page_number, page in enumerate(pages, start=1):
+                for item in page.get(listing_key):
+                    yield item
+                    item_count += 1
 
-            for item in response.get(listing_key):
-                yield item
-                item_count += 1
+                    if max_limit and item_count >= max_limit:
+                        logger.info("Stopping API calls having reached max limit %d", item_count)
+                        return
 
-                if max_limit and item_count >= max_limit:
-                    logger.info("Stopping API calls having reached max limit %d", item_count)
-                    return
+                logger.info("Received page %d, %d total items", page_number, page["page"]["total"])
+        finally:
+            pages.close()
+
+    def _follow_pages(
+        self, url: str, params: dict, response: dict, listing_key: str, max_limit: int = None
+    ) -> Iterator[dict]:
+        """Generate pages one at a time by following the next link of each, starting with the response given"""
+        item_count = 0
+        while True:
+            yield response
+            item_count += len(response.get(listing_key) or [])
 
-            page += 1
-            logger.info("Received page %d, %d total items", page, response["page"]["total"])
+            if max_limit and item_count >= max_limit:
+                return
 
             # continue if there were items on this page and a next page is indicated
             if response["page"]["next"] and response.get(listing_key):
                 parts = urlparse(response["page"]["next"])
                 pagination_params = {k: v[0] for k, v in parse_qs(parts.query).items()}
                 params = {**params, **pagination_params}
+                response = self._get(url, params=params)
             else:
                 return
 
+    @staticmethod
+    def _prefetch_pages(pages: Iterator[dict], depth: int) -> Iterator[dict]:
+        """Generate the pages from `pages`, fetching up to `depth` pages ahead of the consumer on a background thread
+
+        If the generator is closed early, no further pages are requested; a request already in flight is left to
+        complete and its page discarded.
+        """
+        buffer = queue.Queue()
+        slots = threading.Semaphore(depth)
+        stop = threading.Event()
+        end_of_pages = object()
+
+        def produce():
+            try:
+                while True:
+                    # wait for the consumer to take a page before requesting another
+                    while not slots.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if stop.is_set():
+                        return
+
+                    page = next(pages, end_of_pages)
+                    buffer.put((page, None))
+                    if page is end_of_pages:
+                        return
+            except Exception as e:
+                buffer.put((None, e))
+            finally:
+                pages.close()
+
+        producer = threading.Thread(target=produce, name="soundcharts-prefetch", daemon=True)
+        producer.start()
+        try:
+            while True:
+                page, error = buffer.get()
+                if error:
+                    raise error
+                if page is end_of_pages:
+                    return
+                slots.release()
+                yield page
+        finally:
+            stop.set()
+
+    @staticmethod
+    def _has_offset_pagination(response: dict, listing_key: str) -> bool:
+        """Whether the remaining pages can be addressed by offset; some endpoints paginate with a token instead"""
+        page = response.get("page") or {}
+        return "offset" in page and bool(page.get("next")) and bool(response.get(listing_key))
+
+    def _fan_out_pages(
+        self, url: str, params: dict, response: dict, listing_key: str, max_limit: int, concurrency: int
+    ) -> Iterator[dict]:
+        """Generate pages in order, having fetched the pages following the response given on a bounded pool
+
+        At most `concurrency` pages are requested ahead of the page being consumed, and no pages beyond `max_limit`
+        are requested. Outstanding requests are cancelled if the generator is closed early.
+        """
+        yield response
+
+        page = response["page"]
+        limit = page["limit"]
+        end = page["total"]
+        if max_limit:
+            end = min(end, page["offset"] + max_limit)
+        offsets = iter(range(page["offset"] + limit, end, limit))
+
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        pending = deque()
+
+        def submit_next():
+            offset = next(offsets, None)
+            if offset is not None:
+                pending.append(executor.submit(self._get, url, params={**params, "offset": offset, "limit": limit}))
+
+        try:
+            for _ in range(concurrency):
+                submit_next()
+
+            while pending:
+                response = pending.popleft().result()
+                submit_next()
+                yield response
+
+                # the total can shrink while paging, so stop at the first empty page
+                if not response.get(listing_key):
+                    return
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_date_range(
+        self,
+        url: str,
+        start: date,
+        end: date,
+        value_key: str = "value",
+        window_key: str = None,
+        params: dict = None,
+        series_key: tuple = None,
+        as_series: bool = False,
+    ) -> Union[dict, DailySeries]:
+        """Retrieve a daily time series over a date range, whatever its length
+
+        The range is split into windows the API will accept (see `window_days`), which are fetched concurrently on
+        up to `max_workers` threads and merged as if they had been requested one after another, newest first.
+
+        If the client has a `series_cache` and a `series_key` is given, only the days missing from the cache are
+        fetched, and the result is read back from the cache in date order. If it has a `snapshot_store`, the
+        points fetched are written to it under the `series_key`.
+
+        Args:
+            url (str): Path relative to the prefix
+            start (date): Earliest date to retrieve
+            end (date): Latest date to retrieve
+            value_key (str, optional): Key of the value in each item. Defaults to "value".
+            window_key (str, optional): Key to look up a configured window size. Defaults to None.
+            params (dict, optional): Any further query parameters. Defaults to None.
+            series_key (tuple, optional): (uuid, metric, platform) identifying the series in the cache.
+            Defaults to None.
+            as_series (bool, optional): Return a compact DailySeries covering start to end instead of a dict.
+            Defaults to False.
+
+        Returns:
+            Union[dict, DailySeries]: Map of ISO date to value, or the series
+        """
+        window_size = self.window_days.get(window_key, self.DEFAULT_WINDOW_DAYS)
+        windows = date_windows(start, end, window_size)
+        use_cache = bool(self.series_cache and series_key and windows)
+        if use_cache:
+            windows = [
+                window
+                for gap in self.series_cache.missing_ranges(series_key, start, end)
+                for window in date_windows(*gap, window_size) or [gap]
+            ]
+            logger.debug("Fetching %d windows missing from cache for %s", len(windows), series_key)
+
+        def fetch(window: tuple) -> list:
+            window_params = {**(params or {}), "startDate": window[0].isoformat(), "endDate": window[1].isoformat()}
+            points = [(item["date"][:10], item[value_key]) for item in self._get_paginated(url, params=window_params)]
+            if use_cache:
+                self.series_cache.put(series_key, window[0], window[1], dict(points))
+            if self.snapshot_store and series_key:
+                self.snapshot_store.put(series_key, points)
+            return points
+
+        if len(windows) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(windows))) as executor:
+                results = list(executor.map(fetch, windows))
+        else:
+            results = [fetch(window) for window in windows]
+
+        if use_cache:
+            values = self.series_cache.get(series_key, start, end)
+            return DailySeries.from_dict(values, start, end) if as_series else values
+
+        if as_series:
+            return DailySeries.from_points((point for points in results for point in points), start, end)
+
+        values = {}
+        for points in results:
+            for day, value in points:
+                values[day] = value
+        return values
+
     def _get_single_object(self, url: str, params: dict = None, payload: dict = None, obj_type: str = None) -> dict:
         """helper function to get a single object from the API.
 
@@ -186,3 +517,89 @@ class Client:
         if obj_type and response.get("type") != obj_type:
             raise IncorrectReponseType("Expected type {}, received {}".format(obj_type, response.get("type")))
         return response.get("object")
+
+    def _uuids_by_platform_identifier(self, kind: str, platform, identifiers: Iterator[str], lookup) -> dict:
+        """Resolve many platform identifiers to UUIDs, from the identifier index where possible
+
+        Identifiers not in the index are looked up concurrently, which adds them to the index.
+
+        Args:
+            kind (str): "artist" or "song"
+            platform (SocialPlatform): The platform
+            identifiers (Iterator[str]): Identifiers on the platform, duplicates are looked up once
+            lookup (Callable): Method retrieving the object for a (platform, identifier)
+
+        Returns:
+            dict: Map of identifier to UUID, leaving out those which aren't found
+        """
+        identifiers = list(dict.fromkeys(identifiers))
+        found = self.identifier_index.uuids(kind, platform.value, identifiers) if self.identifier_index else {}
+        missing = [identifier for identifier in identifiers if identifier not in found]
+        logger.info("%d of %d %s identifiers found in the index", len(found), len(identifiers), kind)
+
+        def resolve(identifier: str):
+            try:
+                obj = lookup(platform, identifier)
+            except (ConnectionError, ItemNotFoundError):
+                obj = None
+            return identifier, obj["uuid"] if obj else None
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                for identifier, uuid in executor.map(resolve, missing):
+                    if uuid:
+                        found[identifier] = uuid
+        return found
+
+    def _bulk(self, lookup: Callable, inputs: Iterable, concurrency: int = None) -> Iterator[Tuple]:
+        """Call a single object lookup for each of many inputs concurrently, yielding results as they complete
+
+        Duplicate inputs are looked up once. Inputs are read lazily, with at most twice `concurrency` lookups queued
+        at a time, so very large batches can be streamed. A lookup which fails yields its exception in place of a
+        result, with a missing object (a 404, or an empty response) as an ItemNotFoundError, and the batch carries on.
+        Running out of quota stops the batch, as every further lookup would fail.
+
+        Args:
+            lookup (Callable): Method retrieving the object for one input
+            inputs (Iterable): The inputs, e.g. ISRCs
+            concurrency (int, optional): Number of lookups to make at a time. Defaults to `max_workers`.
+
+        Yields:
+            Tuple: (input, object), or (input, exception) where the lookup failed, in order of completion
+        """
+        concurrency = concurrency or self.max_workers
+
+        def call(item):
+            try:
+                obj = lookup(item)
+            except ConnectionError as e:
+                if e.status_code != 404:
+                    return e
+                obj = None
+            except QuotaExhaustedError:
+                raise
+            except (Error, requests.exceptions.RequestException) as e:
+                return e
+            return obj or ItemNotFoundError("Nothing found for {}".format(item))
+
+        seen = set()
+        unique = (item for item in inputs if not (item in seen or seen.add(item)))
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        pending = {}
+
+        def submit(count: int):
+            for item in unique:
+                pending[executor.submit(call, item)] = item
+                count -= 1
+                if not count:
+                    break
+
+        try:
+            submit(2 * concurrency)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+                submit(len(done))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
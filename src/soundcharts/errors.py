@@ -20,3 +20,7 @@ class ItemNotFoundError(Error):
 
 class NoSocialAccountFound(Error):
     pass
+
+
+class QuotaExhaustedError(Error):
+    pass
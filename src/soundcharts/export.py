@@ -0,0 +1,203 @@
+from abc import ABC, abstractmethod
+import csv
+import itertools
+import json
+import logging
+import sys
+from typing import IO, Iterable, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("ndjson", "csv", "parquet")
+# types a column can be declared with
+TYPES = ("string", "int", "float", "bool")
+
+
+def flatten(record: dict, prefix: str = "") -> dict:
+    """Flatten nested objects into dotted keys, with lists as JSON, for tabular formats
+
+    e.g. {"artist": {"name": "x"}, "genres": ["pop"]} becomes {"artist.name": "x", "genres": '["pop"]'}
+    """
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, list):
+            flat[f"{prefix}{key}"] = json.dumps(value)
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def row_groups(records: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    """Split a stream of records into lists of at most `size`, as they arrive"""
+    records = iter(records)
+    while True:
+        group = list(itertools.islice(records, size))
+        if not group:
+            return
+        yield group
+
+
+class Writer(ABC):
+    """Writes records to a file one row group at a time, so only one group is held in memory"""
+
+    def __init__(self, out):
+        self.out = out
+        self.rows = 0
+
+    def write(self, rows: List[dict]):
+        self._write(rows)
+        self.rows += len(rows)
+
+    @abstractmethod
+    def _write(self, rows: List[dict]):
+        """Write one row group"""
+
+    def close(self):
+        if self.out is sys.stdout:
+            self.out.flush()
+        else:
+            self.out.close()
+
+
+class NdjsonWriter(Writer):
+    """One JSON object per line, as returned by the API"""
+
+    def _write(self, rows: List[dict]):
+        for row in rows:
+            self.out.write(json.dumps(row))
+            self.out.write("\n")
+        self.out.flush()
+
+
+class TabularWriter(Writer):
+    """Flattened records with a fixed set of columns
+
+    Fields outside the declared columns are left out, with a warning the first time each is seen. Declared columns
+    are written out when the writer is created, so an export without records still has them. Without declared
+    columns those of the first row group are used, and a later record with a field outside them raises ValueError,
+    as the file's columns can no longer be changed.
+
+    Args:
+        out: File to write to
+        columns (List[Tuple[str, str]], optional): (name, type) of each column, where the name is a dotted key of the
+        flattened record and the type one of TYPES. Defaults to None, for the columns of the first row group.
+    """
+
+    def __init__(self, out, columns: List[Tuple[str, str]] = None):
+        super().__init__(out)
+        self.columns = columns
+        self._names = [name for name, _ in columns] if columns else None
+        self._left_out = set()
+
+    def _flatten(self, rows: List[dict]) -> List[dict]:
+        rows = [flatten(row) for row in rows]
+        if self._names is None:
+            self._names = list(dict.fromkeys(name for row in rows for name in row))
+        names = set(self._names)
+        for row in rows:
+            extra = row.keys() - names - self._left_out
+            if not extra:
+                continue
+            if not self.columns:
+                raise ValueError(
+                    f"Fields {', '.join(sorted(extra))} are not among the columns of the first row group, "
+                    "declare the columns instead"
+                )
+            logger.warning("Leaving out fields %s, not among the columns exported", ", ".join(sorted(extra)))
+            self._left_out |= extra
+        return rows
+
+
+class CsvWriter(TabularWriter):
+    """Flattened records as CSV, with a header row"""
+
+    def __init__(self, out: IO, columns: List[Tuple[str, str]] = None):
+        super().__init__(out, columns)
+        self._writer = None
+        if self._names is not None:
+            self._open()
+
+    def _open(self):
+        self._writer = csv.DictWriter(self.out, self._names, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def _write(self, rows: List[dict]):
+        rows = self._flatten(rows)
+        if self._writer is None:
+            self._open()
+        self._writer.writerows(rows)
+        self.out.flush()
+
+
+class ParquetWriter(TabularWriter):
+    """Flattened records as Parquet, one Parquet row group per row group written
+
+    The schema comes from the declared column types, or else from the first row group, with columns that have no
+    value in it taken to be strings. A row group which doesn't fit the schema raises ValueError. Without declared
+    columns, a file with no row groups written has no columns either.
+
+    Requires pyarrow (`pip install "soundcharts-sdk[parquet]"`).
+    """
+
+    def __init__(self, out, columns: List[Tuple[str, str]] = None):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow") from None
+
+        super().__init__(out, columns)
+        self._pa = pa
+        self._pq = pq
+        self._writer = None
+        if self.columns:
+            self._writer = pq.ParquetWriter(self.out, self._schema([]))
+
+    def _schema(self, rows: List[dict]):
+        pa = self._pa
+        if self.columns:
+            types = {"string": pa.string(), "int": pa.int64(), "float": pa.float64(), "bool": pa.bool_()}
+            return pa.schema([(name, types[column_type]) for name, column_type in self.columns])
+
+        schema = pa.Table.from_pylist(rows).schema
+        for position, field in enumerate(schema):
+            if pa.types.is_null(field.type):
+                schema = schema.set(position, field.with_type(pa.string()))
+        return schema
+
+    def _write(self, rows: List[dict]):
+        rows = self._flatten(rows)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.out, self._schema(rows))
+        try:
+            table = self._pa.Table.from_pylist(rows, schema=self._writer.schema)
+        except (self._pa.ArrowInvalid, self._pa.ArrowTypeError) as e:
+            raise ValueError(f"Row group doesn't fit the Parquet schema: {e}") from e
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.out, self._pa.schema([]))
+        self._writer.close()
+
+
+def open_writer(format: str, path: str, columns: List[Tuple[str, str]] = None) -> Writer:
+    """Create a writer for a format, to a path or "-" for standard output (not for Parquet)
+
+    Args:
+        format (str): One of FORMATS
+        path (str): File to write
+        columns (List[Tuple[str, str]], optional): (name, type) of each column, for CSV and Parquet. Defaults to None,
+        for the columns of the first row group.
+    """
+    if format == "ndjson":
+        return NdjsonWriter(sys.stdout if path == "-" else open(path, "w"))
+    if format == "csv":
+        return CsvWriter(sys.stdout if path == "-" else open(path, "w", newline=""), columns)
+    if format == "parquet":
+        if path == "-":
+            raise ValueError("Parquet can't be written to standard output")
+        return ParquetWriter(path, columns)
+    raise ValueError(f"Unknown format {format}, expected one of {', '.join(FORMATS)}")
@@ -1,10 +1,17 @@
+from concurrent.futures import ThreadPoolExecutor
+import heapq
 from datetime import date, timedelta
 from dateutil.relativedelta import relativedelta
 import json
 import logging
+from typing import Iterator, List, Tuple, TYPE_CHECKING
 
 from soundcharts.artist import Artist
 from soundcharts.errors import ConnectionError
+from soundcharts.timeseries import month_range
+
+if TYPE_CHECKING:
+    from soundcharts.extended.country_shares import CountryShares
 
 logger = logging.getLogger(__name__)
 
@@ -44,11 +51,7 @@ class ArtistCountries:
                 logger.warning("No good data found for artist %s", uuid)
                 return []
 
-            country_data = self._prepare_country_data(latest_good_data)
-            if limit:
-                country_data = country_data[:limit]
-
-            return country_data
+            return self._prepare_country_data(latest_good_data, limit)
         except ConnectionError as e:
             logger.error(e)
             return []
@@ -67,21 +70,11 @@ class ArtistCountries:
         """
         try:
             datasets = []
-
-            # start on the first day of the start month
-            working_date = start
-            working_date = working_date.replace(day=1)
-            end_date = end.replace(day=1)
-            while working_date <= end_date:
-                for listeners_data in self.artist_client.get_spotify_monthly_listeners_for_month(
-                    uuid, working_date.year, working_date.month
-                ):
+            for month_data in self._listeners_for_months(uuid, month_range(start, end)):
+                for listeners_data in month_data:
                     if listeners_data.get("countryPlots"):
                         datasets.append(self._prepare_country_data(listeners_data))
 
-                # move on to 1st of next month
-                working_date += relativedelta(months=1)
-
             return datasets
         except ConnectionError as e:
             logger.error(e)
@@ -91,6 +84,8 @@ class ArtistCountries:
         """Looks back through monthly listener history from Soundcharts to find the most recent which
         contains the countryPlots data we're looking for
 
+        All the months which may be needed are fetched at once, rather than one after another until data is found.
+
         Args:
             uuid (str): _description_
 
@@ -110,37 +105,111 @@ class ArtistCountries:
         else:
             backstop = working_date - timedelta(days=95)
 
-        good_data = None
-        working_date = working_date.replace(day=1)
-        while not good_data and working_date >= backstop:
-            # logger.info("Looking for data for {}".format(working_date.isoformat()))
+        months = []
+        while working_date >= backstop:
+            months.append((working_date.year, working_date.month))
+            working_date -= relativedelta(months=1)
 
-            for listeners_data in self.artist_client.get_spotify_monthly_listeners_for_month(
-                uuid, working_date.year, working_date.month
-            ):
+        # newest month first
+        for month_data in self._listeners_for_months(uuid, months):
+            good_data = None
+            for listeners_data in month_data:
                 if listeners_data.get("countryPlots"):
                     # Don't return immediately, we want the most recent which may be later in the month
                     good_data = listeners_data
+            if good_data:
+                return good_data
 
-            working_date -= relativedelta(months=1)
+        return None
+
+    def _listeners_for_months(self, uuid: str, months: List[Tuple[int, int]]) -> Iterator[list]:
+        """Monthly listeners for each of the months, fetched concurrently
+
+        Closed months come from the artist client's `monthly_memo` once fetched, while months still open are
+        fetched afresh by each call.
 
-        return good_data
+        A month which failed to download raises its error only when it is reached, so that callers stopping at an
+        earlier month behave as if the months had been fetched one after another.
+
+        Args:
+            uuid (str): Soundcharts UUID for artist
+            months (List[Tuple[int, int]]): (year, month) of each month
 
-    def _prepare_country_data(self, dataset: dict) -> list:
+        Yields:
+            list: The listeners data for each month, in the order given
+        """
+        if not months:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.artist_client.max_workers, len(months))) as executor:
+            fetched = list(executor.map(lambda month: self._fetch_month(uuid, month), months))
+
+        for month_data in fetched:
+            if isinstance(month_data, ConnectionError):
+                raise month_data
+            yield month_data
+
+    def _fetch_month(self, uuid: str, month: Tuple[int, int]):
+        """Monthly listeners for one month, or the error which prevented getting them"""
+        try:
+            return list(self.artist_client.get_spotify_monthly_listeners_for_month(uuid, *month))
+        except ConnectionError as e:
+            return e
+
+    def country_shares(self, uuids: List[str], start: date, end: date) -> "CountryShares":
+        """Get the listeners by country of many artists for each month in the date range, as arrays
+
+        For each artist and month the most recent data with countries is used, as by `get_artist_top_countries`.
+        Every (artist, month) is fetched concurrently on one pool, sharing the closed months already fetched by the
+        artist client. An artist whose month fails to download has no data from that month on.
+
+        Args:
+            uuids (List[str]): Soundcharts UUIDs for the artists
+            start (date): A day in the first month
+            end (date): A day in the last month
+
+        Returns:
+            CountryShares: Listeners and shares by artist, month and country
+        """
+        # imported here as it needs NumPy, which the rest of the class doesn't
+        from soundcharts.extended.country_shares import CountryShares
+
+        uuids = list(dict.fromkeys(uuids))
+        months = month_range(start, end)
+        pairs = [(uuid, month) for uuid in uuids for month in months]
+
+        datasets = {}
+        failed = set()
+        with ThreadPoolExecutor(max_workers=max(1, min(self.artist_client.max_workers, len(pairs)))) as executor:
+            for (uuid, month), month_data in zip(pairs, executor.map(lambda pair: self._fetch_month(*pair), pairs)):
+                if uuid in failed:
+                    continue
+                if isinstance(month_data, ConnectionError):
+                    logger.error(month_data)
+                    failed.add(uuid)
+                    continue
+                good_data = [listeners_data for listeners_data in month_data if listeners_data.get("countryPlots")]
+                if good_data:
+                    datasets[(uuid, month)] = good_data[-1]
+        return CountryShares.from_datasets(uuids, months, datasets)
+
+    def _prepare_country_data(self, dataset: dict, limit: int = 0) -> list:
         """Works out the percentage of listeners per country in the list, and sorts by listeners descending
 
         There's an assumption that the dataset contains the top countries, even if they're not provided
-        in order
+        in order. The dataset is left unchanged.
 
         Args:
-            total (int): Total number of listeners as provided by API
-            country_plots (list): List of data as provided by Soundcharts API
+            dataset (dict): Monthly listeners data with countryPlots, as provided by Soundcharts API
+            limit (int, optional): Only keep this many countries, selected without sorting the rest. Defaults to 0
+            for all
 
         Returns:
             list: A list of dictionaries with the country and percentage of listeners
         """
-        country_plots = dataset["countryPlots"]
-        for item in country_plots:
-            item["percentage"] = round(item["value"] / dataset["value"] * 100, 2)
-
+        total = dataset["value"]
+        country_plots = [
+            {**item, "percentage": round(item["value"] / total * 100, 2)} for item in dataset["countryPlots"]
+        ]
+        if limit:
+            return heapq.nlargest(limit, country_plots, key=lambda x: x["value"])
         return sorted(country_plots, key=lambda x: x["value"], reverse=True)
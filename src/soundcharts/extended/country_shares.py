@@ -0,0 +1,143 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+class CountryShares:
+    """Spotify listeners by country for many artists across many months, as dense arrays
+
+    `listeners` holds the listener count of each (artist, month, country), 0 where the country isn't listed, `listed`
+    whether the country is listed, even with 0 listeners, and `totals` the total listeners of each (artist, month). Countries are interned as indices into `countries`, so the
+    same country is the same column for every artist and month. Cells without country data have a total of 0, and
+    `has_data` is False for them.
+
+    Requires NumPy (`pip install "soundcharts-sdk[numpy]"`).
+
+    Args:
+        artists (List[str]): Soundcharts UUID of each artist, along the first axis
+        months (List[Tuple[int, int]]): (year, month) of each month, along the second axis
+        countries (List[str]): Country code of each country, along the third axis
+        listeners (np.ndarray): Listener counts, shaped (artists, months, countries)
+        totals (np.ndarray): Total listeners, shaped (artists, months)
+        listed (np.ndarray, optional): Whether each country is listed, shaped as listeners. Defaults to those with
+        listeners
+    """
+
+    def __init__(
+        self,
+        artists: List[str],
+        months: List[Tuple[int, int]],
+        countries: List[str],
+        listeners: np.ndarray,
+        totals: np.ndarray,
+        listed: np.ndarray = None,
+    ):
+        self.artists = artists
+        self.months = months
+        self.countries = countries
+        self.listeners = listeners
+        self.totals = totals
+        self.listed = listeners > 0 if listed is None else listed
+        self.artist_index = {uuid: index for index, uuid in enumerate(artists)}
+        self.month_index = {month: index for index, month in enumerate(months)}
+        self.country_index = {code: index for index, code in enumerate(countries)}
+
+    @classmethod
+    def from_datasets(cls, artists: List[str], months: List[Tuple[int, int]], datasets: Dict[tuple, dict]):
+        """Build the arrays from monthly listeners datasets, as returned by the API
+
+        Args:
+            artists (List[str]): Soundcharts UUID of each artist
+            months (List[Tuple[int, int]]): (year, month) of each month
+            datasets (Dict[tuple, dict]): Dataset with countryPlots for each (uuid, (year, month)) which has one
+
+        Returns:
+            CountryShares: The arrays
+        """
+        artist_index = {uuid: index for index, uuid in enumerate(artists)}
+        month_index = {month: index for index, month in enumerate(months)}
+        country_index = {}
+        cells, columns, values = [], [], []
+        totals = np.zeros((len(artists), len(months)), dtype=np.int64)
+        for (uuid, month), dataset in datasets.items():
+            cell = artist_index[uuid] * len(months) + month_index[month]
+            totals.flat[cell] = dataset["value"]
+            for item in dataset["countryPlots"]:
+                cells.append(cell)
+                columns.append(country_index.setdefault(item["countryCode"], len(country_index)))
+                values.append(item["value"])
+
+        shape = (len(artists), len(months), len(country_index))
+        index = (np.array(cells, dtype=np.intp), np.array(columns, dtype=np.intp))
+        listeners = np.zeros((len(artists) * len(months), len(country_index)), dtype=np.int64)
+        listeners[index] = values
+        listed = np.zeros(listeners.shape, dtype=bool)
+        listed[index] = True
+        return cls(artists, months, list(country_index), listeners.reshape(shape), totals, listed.reshape(shape))
+
+    @property
+    def has_data(self) -> np.ndarray:
+        """Whether each (artist, month) has country data"""
+        return self.totals > 0
+
+    @property
+    def shares(self) -> np.ndarray:
+        """Percentage of the total listeners in each country, NaN for cells without country data"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shares = self.listeners * 100 / self.totals[..., np.newaxis]
+        shares[~self.has_data] = np.nan
+        return shares
+
+    def top_k(self, k: int) -> np.ndarray:
+        """Indices of the k listed countries with the most listeners in every cell, most listeners first
+
+        A partial selection per cell, so only the k selected are sorted, whatever the number of countries. Cells
+        with fewer than k listed countries, including those without country data, are padded with -1.
+
+        Returns:
+            np.ndarray: Indices into `countries`, shaped (artists, months, k)
+        """
+        k = max(0, min(k, len(self.countries)))
+        # countries not listed rank after every listed one
+        negated = np.where(self.listed, -self.listeners, 1)
+        if not k:
+            return np.zeros(negated.shape[:-1] + (0,), dtype=np.intp)
+        if k < len(self.countries):
+            candidates = np.argpartition(negated, k - 1, axis=-1)[..., :k]
+        else:
+            candidates = np.broadcast_to(np.arange(k), negated.shape[:-1] + (k,))
+        candidates = np.sort(candidates, axis=-1)
+        order = np.argsort(np.take_along_axis(negated, candidates, axis=-1), axis=-1, kind="stable")
+        top = np.take_along_axis(candidates, order, axis=-1)
+        return np.where(np.take_along_axis(self.listed, top, axis=-1), top, -1)
+
+    def top(self, uuid: str, year: int, month: int, limit: int = 0) -> list:
+        """The countries of one artist in one month, in the form returned by ArtistCountries.get_artist_top_countries
+
+        Args:
+            uuid (str): Soundcharts UUID for artist
+            year (int): Year of the month
+            month (int): Month of the year
+            limit (int, optional): Constrain to this many countries. Defaults to 0 for unlimited
+
+        Returns:
+            list: Dicts of countryCode, value and percentage, by listeners descending
+        """
+        a, m = self.artist_index[uuid], self.month_index[(year, month)]
+        total = int(self.totals[a, m])
+        if not total:
+            return []
+
+        counts = self.listeners[a, m]
+        listed = np.flatnonzero(self.listed[a, m])
+        order = listed[np.argsort(-counts[listed], kind="stable")]
+        if limit:
+            order = order[:limit]
+        return [
+            {
+                "countryCode": self.countries[c],
+                "value": int(counts[c]),
+                "percentage": round(int(counts[c]) / total * 100, 2),
+            }
+            for c in order
+        ]
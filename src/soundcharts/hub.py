@@ -0,0 +1,140 @@
+import logging
+import threading
+
+from soundcharts import pool
+from soundcharts.artist import Artist
+from soundcharts.cache import NegativeCache, ResponseCache
+from soundcharts.identifier_index import IdentifierIndex
+from soundcharts.library import Library
+from soundcharts.playlist import Playlist
+from soundcharts.ratelimit import RateLimiter
+from soundcharts.retry import RetryPolicy
+from soundcharts.series_cache import SeriesCache
+from soundcharts.singleflight import SingleFlight
+from soundcharts.snapshot import SnapshotStore
+from soundcharts.song import Song
+from soundcharts.tiktok import Tiktok
+from soundcharts.top_artist import TopArtist
+
+logger = logging.getLogger(__name__)
+
+
+class Hub:
+    """Shared transport for all resource clients in a process
+
+    The hub owns a single requests session, so one connection pool sized by the pool arguments (see
+    soundcharts.pool.build_session), along with the rate limiter, retry policy and caches, and hands out resource
+    clients bound to them. Any other keyword arguments are passed to every client, e.g. `window_days`.
+
+    Closing the hub closes the session and flushes the snapshot store; clients obtained from it should not be used
+    afterwards.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: RateLimiter = None,
+        retry_policy: RetryPolicy = None,
+        response_cache: ResponseCache = None,
+        negative_cache: NegativeCache = None,
+        series_cache: SeriesCache = None,
+        snapshot_store: SnapshotStore = None,
+        identifier_index: IdentifierIndex = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        **client_args,
+    ):
+        self.session = pool.build_session(pool_connections, pool_maxsize, pool_block, keep_alive)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.response_cache = response_cache
+        self.negative_cache = negative_cache
+        self.series_cache = series_cache
+        self.snapshot_store = snapshot_store
+        self.identifier_index = identifier_index
+        self.single_flight = SingleFlight()
+        self.client_args = client_args
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+
+    def client_kwargs(self) -> dict:
+        """Keyword arguments binding a client, or anything accepting client arguments, to this hub"""
+        return {
+            **self.client_args,
+            "session": self.session,
+            "rate_limiter": self.rate_limiter,
+            "retry_policy": self.retry_policy,
+            "response_cache": self.response_cache,
+            "negative_cache": self.negative_cache,
+            "series_cache": self.series_cache,
+            "snapshot_store": self.snapshot_store,
+            "single_flight": self.single_flight,
+            "identifier_index": self.identifier_index,
+        }
+
+    def client(self, cls, **kwargs):
+        """Create a new client of the given class bound to this hub
+
+        Works for the resource clients and for the extended classes such as ArtistCountries, which pass their
+        keyword arguments on to the client they create.
+
+        Args:
+            cls (type): Class to instantiate, e.g. Artist
+            **kwargs: Arguments for this client only, overriding those of the hub
+
+        Returns:
+            An instance of cls
+        """
+        return cls(**{**self.client_kwargs(), **kwargs})
+
+    def _shared(self, cls):
+        # worker threads may ask for the same client at once, and each should get the one instance
+        with self._clients_lock:
+            if cls not in self._clients:
+                self._clients[cls] = self.client(cls)
+            return self._clients[cls]
+
+    @property
+    def artist(self) -> Artist:
+        return self._shared(Artist)
+
+    @property
+    def library(self) -> Library:
+        return self._shared(Library)
+
+    @property
+    def playlist(self) -> Playlist:
+        return self._shared(Playlist)
+
+    @property
+    def song(self) -> Song:
+        return self._shared(Song)
+
+    @property
+    def tiktok(self) -> Tiktok:
+        return self._shared(Tiktok)
+
+    @property
+    def top_artist(self) -> TopArtist:
+        return self._shared(TopArtist)
+
+    def warm_up(self, connections: int = 1):
+        """Open connections to the API ahead of the first requests, e.g. one per worker thread"""
+        pool.warm_up(self.session, self.artist._endpoint, connections)
+
+    def pool_stats(self) -> dict:
+        """Connections created and reused by the shared session, to help size the pool"""
+        return pool.pool_stats(self.session)
+
+    def close(self):
+        """Write any points buffered by the snapshot store, and close the shared connection pool"""
+        if self.snapshot_store:
+            self.snapshot_store.flush()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
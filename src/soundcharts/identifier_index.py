@@ -0,0 +1,140 @@
+import logging
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# sqlite limits the number of parameters in one statement
+_CHUNK = 500
+
+
+class IdentifierIndex:
+    """Persistent map between Soundcharts UUIDs and platform identifiers, for artists and songs
+
+    In one direction, from a UUID to the full list of its platform identifiers and URLs, as returned by the
+    identifiers endpoints; in the other from (platform, identifier) to UUID. Clients given an index fill it as they
+    go and read from it before going to the API. `load` fills it in bulk, e.g. from a previous export.
+
+    An identifier belongs to one UUID at a time. Recording it for another UUID moves it, and the UUID it is moved
+    from no longer has its full list held.
+
+    The index is a sqlite database, so can be shared between processes by using the same path, and between threads
+    by sharing the instance.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS identifiers ("
+                "kind TEXT, platform TEXT, identifier TEXT, uuid TEXT, url TEXT, name TEXT, position INTEGER, "
+                "PRIMARY KEY (kind, platform, identifier)) WITHOUT ROWID"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS identifiers_uuid ON identifiers (kind, uuid)")
+            # UUIDs for which the full list of identifiers is held
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS complete (kind TEXT, uuid TEXT, PRIMARY KEY (kind, uuid)) WITHOUT ROWID"
+            )
+
+    def close(self):
+        self._conn.close()
+
+    def identifiers(self, kind: str, uuid: str) -> List[dict]:
+        """The identifiers of an artist or song, or None if they have not been indexed
+
+        Args:
+            kind (str): "artist" or "song"
+            uuid (str): Soundcharts UUID
+
+        Returns:
+            List[dict]: Items with platformName, platformCode, identifier and url, in the order returned by the API
+        """
+        with self._lock:
+            if not self._conn.execute("SELECT 1 FROM complete WHERE kind = ? AND uuid = ?", (kind, uuid)).fetchone():
+                return None
+            rows = self._conn.execute(
+                "SELECT name, platform, identifier, url FROM identifiers WHERE kind = ? AND uuid = ? ORDER BY position",
+                (kind, uuid),
+            ).fetchall()
+        return [
+            {"platformName": name, "platformCode": platform, "identifier": identifier, "url": url}
+            for name, platform, identifier, url in rows
+        ]
+
+    def put_identifiers(self, kind: str, uuid: str, items: Iterable[dict]):
+        """Record the full list of identifiers of an artist or song, as returned by the API, replacing any held"""
+        rows = [
+            (kind, item["platformCode"], item["identifier"], uuid, item.get("url"), item.get("platformName"), position)
+            for position, item in enumerate(items)
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM identifiers WHERE kind = ? AND uuid = ?", (kind, uuid))
+            self._release(kind, [(platform, identifier, uuid) for _, platform, identifier, uuid, *_ in rows])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO identifiers (kind, platform, identifier, uuid, url, name, position) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute("INSERT OR IGNORE INTO complete (kind, uuid) VALUES (?, ?)", (kind, uuid))
+
+    def uuid(self, kind: str, platform: str, identifier: str) -> str:
+        """The UUID of the artist or song with a platform identifier, or None if not indexed"""
+        return self.uuids(kind, platform, [identifier]).get(identifier)
+
+    def uuids(self, kind: str, platform: str, identifiers: Iterable[str]) -> Dict[str, str]:
+        """Look up many platform identifiers at once
+
+        Args:
+            kind (str): "artist" or "song"
+            platform (str): Platform code e.g. "spotify"
+            identifiers (Iterable[str]): Identifiers on the platform
+
+        Returns:
+            Dict[str, str]: Map of identifier to UUID, for those which are indexed
+        """
+        identifiers = list(identifiers)
+        found = {}
+        with self._lock:
+            for i in range(0, len(identifiers), _CHUNK):
+                chunk = identifiers[i : i + _CHUNK]
+                found.update(
+                    self._conn.execute(
+                        "SELECT identifier, uuid FROM identifiers WHERE kind = ? AND platform = ? "
+                        f"AND identifier IN ({', '.join('?' * len(chunk))})",
+                        (kind, platform, *chunk),
+                    ).fetchall()
+                )
+        return found
+
+    def put_uuid(self, kind: str, platform: str, identifier: str, uuid: str, url: str = None):
+        """Record the UUID for one platform identifier, without its other identifiers"""
+        self.load(kind, [(platform, identifier, uuid, url)])
+
+    def load(self, kind: str, rows: Iterable[Tuple[str, str, str, str]]):
+        """Fill the index in bulk, without marking any UUID as having its full list of identifiers
+
+        Args:
+            kind (str): "artist" or "song"
+            rows (Iterable[Tuple[str, str, str, str]]): (platform, identifier, uuid, url) for each identifier, where
+            url may be None
+        """
+        rows = list(rows)
+        with self._lock, self._conn:
+            self._release(kind, [(platform, identifier, uuid) for platform, identifier, uuid, _ in rows])
+            count = self._conn.executemany(
+                "INSERT INTO identifiers (kind, platform, identifier, uuid, url) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (kind, platform, identifier) DO UPDATE SET "
+                "uuid = excluded.uuid, url = COALESCE(excluded.url, identifiers.url)",
+                ((kind, *row) for row in rows),
+            ).rowcount
+        logger.debug("Loaded %d %s identifiers", count, kind)
+
+    def _release(self, kind: str, rows: List[Tuple[str, str, str]]):
+        """Unmark as complete the UUIDs which (platform, identifier, uuid) rows are about to take identifiers from"""
+        self._conn.executemany(
+            "DELETE FROM complete WHERE kind = ? AND uuid IN (SELECT uuid FROM identifiers "
+            "WHERE kind = ? AND platform = ? AND identifier = ? AND uuid != ?)",
+            ((kind, kind, *row) for row in rows),
+        )
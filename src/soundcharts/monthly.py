@@ -0,0 +1,67 @@
+import calendar
+from collections import OrderedDict
+import copy
+from datetime import date, datetime, timedelta, UTC
+import threading
+
+
+def _utc_today() -> date:
+    return datetime.now(UTC).date()
+
+
+class MonthlyMemo:
+    """Responses for calendar months which have closed, kept for the life of the memo
+
+    Once a month has ended, and `settle_days` have passed for late values to arrive, its data no longer changes, so
+    it can be reused indefinitely. Months still open are not kept. Each lookup returns a fresh copy, so callers may
+    modify what they receive. Share one memo between clients to share what they have fetched.
+
+    Beyond `maxsize` months, those least recently used are dropped. `today` gives the current date in UTC.
+    """
+
+    def __init__(self, settle_days: int = 3, maxsize: int = 10_000, today=_utc_today):
+        self.settle_days = settle_days
+        self.maxsize = maxsize
+        self.hits = 0
+        self.evictions = 0
+        self._today = today
+        self._months = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> dict:
+        """Number of lookups served, of months held and of months dropped to stay within maxsize"""
+        with self._lock:
+            return {"hits": self.hits, "size": len(self._months), "evictions": self.evictions}
+
+    def closed(self, year: int, month: int) -> bool:
+        """Whether a month's data is final"""
+        last_day = date(year, month, calendar.monthrange(year, month)[1])
+        return last_day + timedelta(days=self.settle_days) < self._today()
+
+    def get(self, key: tuple, year: int, month: int) -> list:
+        """The items for a month, or None if they are not held
+
+        Args:
+            key (tuple): Identifies the data, e.g. (uuid, "spotify_listeners")
+            year (int): Year of the month
+            month (int): Month of the year
+        """
+        with self._lock:
+            items = self._months.get((key, year, month))
+            if items is None:
+                return None
+            self._months.move_to_end((key, year, month))
+            self.hits += 1
+        return copy.deepcopy(items)
+
+    def put(self, key: tuple, year: int, month: int, items: list):
+        """Keep the items for a month, if it has closed"""
+        if self.closed(year, month):
+            items = copy.deepcopy(items)
+            with self._lock:
+                self._months[(key, year, month)] = items
+                self._months.move_to_end((key, year, month))
+                while len(self._months) > self.maxsize:
+                    self._months.popitem(last=False)
+                    self.evictions += 1
@@ -1,8 +1,9 @@
-from datetime import date, datetime, timedelta
-from typing import Dict, Iterator
+from datetime import date, datetime
+from typing import Dict, Iterator, Union
 
 from soundcharts.client import Client, setprefix
 from soundcharts.platform import PlaylistPlatform
+from soundcharts.timeseries import DailySeries
 from soundcharts.types import PlaylistType
 
 
@@ -90,6 +91,7 @@ class Playlist(Client):
         sortBy: str = "audience",
         sortOrder: str = "desc",
         max_limit: int = None,
+        concurrency: int = None,
     ) -> Iterator[dict]:
         """List playlists from a platform by type
 
@@ -100,6 +102,8 @@ class Playlist(Client):
             offset (int, optional): Pagination offset. Defaults to None.
             sortBy (str, optional): Sort playlists by, one of: name, audience. Defaults to audience.
             sortOrder (str, optional): Sort order, one of: asc, desc
+            max_limit (int, optional): Maximum number of playlists to retrieve. Defaults to None.
+            concurrency (int, optional): Fetch pages concurrently on this many workers. Defaults to None.
 
         Returns:
             dict: The playlist representation
@@ -116,7 +120,7 @@ class Playlist(Client):
         if sortOrder:
             params["sortOrder"] = sortOrder
 
-        yield from self._get_paginated(url, params, max_limit=max_limit)
+        yield from self._get_paginated(url, params, max_limit=max_limit, concurrency=concurrency)
 
     @setprefix(prefix="/api/v2.20/playlist")
     def by_curator(
@@ -157,11 +161,14 @@ class Playlist(Client):
         yield from self._get_paginated(url, params, max_limit=max_limit)
 
     @setprefix(prefix="/api/v2.20/playlist")
-    def audience_daily(self, uuid: str, start: date, end: date = None) -> dict:
+    def audience_daily(
+        self, uuid: str, start: date, end: date = None, as_series: bool = False
+    ) -> Union[dict, DailySeries]:
         """Retrieve the subscriber count for a playlist subscribers for an artist for each day across a range of dates
 
         Args:
             country_iso (str): Code to search for
+            as_series (bool, optional): Return a DailySeries instead of a dict. Defaults to False.
 
         Returns:
             list: matching artist objects
@@ -170,14 +177,11 @@ class Playlist(Client):
         url = f"/{uuid}/audience"
         if not end:
             end = datetime.utcnow().date()
-
-        audience_map = {}
-
-        current_start = max(start, end - timedelta(days=90))
-        while current_start >= start and current_start < end:
-            params = {"startDate": current_start.isoformat(), "endDate": end.isoformat()}
-            for item in self._get_paginated(url, params=params):
-                audience_map[item["date"][:10]] = item["value"]
-            end = current_start
-            current_start = max(start, end - timedelta(days=90))
-        return audience_map
+        return self._get_date_range(
+            url,
+            start,
+            end,
+            window_key="audience_daily",
+            series_key=(uuid, "playlist_audience", None),
+            as_series=as_series,
+        )
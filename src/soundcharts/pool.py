@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+
+def build_session(
+    pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False, keep_alive: bool = True
+) -> requests.Session:
+    """Create a session with a connection pool sized for the number of threads that will use it
+
+    Args:
+        pool_connections (int, optional): Number of hosts to keep a pool for. Defaults to 10.
+        pool_maxsize (int, optional): Connections kept open per host; set to at least the number of threads making
+        requests, or connections beyond it are discarded after each request. Defaults to 10.
+        pool_block (bool, optional): Wait for a free connection rather than opening one beyond pool_maxsize.
+        Defaults to False.
+        keep_alive (bool, optional): Reuse connections between requests. Defaults to True.
+
+    Returns:
+        requests.Session: The session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def pool_stats(session: requests.Session) -> dict:
+    """Count connections opened and requests sent by the pools of a session, currently open or not
+
+    A connection closed by the server is reopened in place, so is not counted again.
+
+    Returns:
+        dict: Number of "pools", of "connections" created, of "requests" sent, and of requests which "reused" a
+        connection
+    """
+    stats = {"pools": 0, "connections": 0, "requests": 0}
+    adapters = {id(adapter): adapter for adapter in session.adapters.values()}.values()
+    for adapter in adapters:
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            stats["pools"] += 1
+            stats["connections"] += pool.num_connections
+            stats["requests"] += pool.num_requests
+    stats["reused"] = stats["requests"] - stats["connections"]
+    return stats
+
+
+def warm_up(session: requests.Session, url: str, connections: int = 1, timeout: float = 5):
+    """Open connections to a host ahead of use, so the first requests don't wait for the TLS handshake
+
+    Each connection is opened by an unauthenticated HEAD request, so nothing is counted against the quota.
+
+    Args:
+        session (requests.Session): Session to warm up
+        url (str): URL on the host to connect to
+        connections (int, optional): Number of connections to open at once. Defaults to 1.
+        timeout (float, optional): Seconds to wait for each connection. Defaults to 5.
+    """
+
+    # each request holds on to its connection until all are open, so none is reused by another
+    barrier = threading.Barrier(connections)
+
+    def connect(_):
+        try:
+            response = session.head(url, timeout=timeout, stream=True)
+        except requests.exceptions.RequestException as e:
+            logger.warning("Failed to warm up connection to %s: %s", url, e)
+            barrier.abort()
+            return
+        try:
+            barrier.wait(timeout)
+        except threading.BrokenBarrierError:
+            pass
+        # reading the (empty) body returns the connection to the pool
+        response.content
+
+    with ThreadPoolExecutor(max_workers=connections) as executor:
+        list(executor.map(connect, range(connections)))
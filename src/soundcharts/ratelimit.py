@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import threading
+import time
+
+from soundcharts.errors import QuotaExhaustedError
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Token bucket pacing requests to the API, aware of the account quota
+
+    Tokens refill at `rate` per second up to `burst`, and each request takes one, waiting if none is left. The
+    quota remaining, reported by the API in the `x-quota-remaining` header, is fed back through `update`. If the time
+    until the quota resets is known (`quota_reset`, in seconds from now), the rate is lowered so that the remaining
+    quota lasts until then, and once only `quota_reserve` calls are left requests fail fast with
+    QuotaExhaustedError rather than being sent to the API to fail.
+
+    The quota only goes down between resets, so a reported figure higher than the local count, from a response that
+    arrived out of order, is ignored. When the reset time passes the count is forgotten and rebuilt from the next
+    response, and the reset time moves on by `quota_period`, the length of the quota window, which defaults to
+    `quota_reset`. If the reset time isn't known, one probe request is let through every `probe_interval` seconds once
+    the quota is exhausted, and its response sets the count afresh. `reset` forgets the count immediately.
+
+    A single instance can be shared by any number of clients, threads and event loops, to limit the whole process.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10,
+        burst: int = None,
+        quota_reset: float = None,
+        quota_reserve: int = 0,
+        quota_period: float = None,
+        probe_interval: float = 60,
+        clock=time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.quota_reserve = quota_reserve
+        self.quota_period = quota_period or quota_reset
+        self.probe_interval = probe_interval
+        self.remaining = None
+        self._clock = clock
+        self._deadline = clock() + quota_reset if quota_reset is not None else None
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._probe_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def effective_rate(self) -> float:
+        """Requests per second currently allowed, the configured rate unless the quota has to be stretched"""
+        if self.remaining is None or self._deadline is None:
+            return self.rate
+        seconds_left = max(self._deadline - self._clock(), 1.0)
+        return min(self.rate, max(self.remaining - self.quota_reserve, 1) / seconds_left)
+
+    def update(self, remaining: int):
+        """Record the quota remaining, as reported by the API, unless the local count is already lower"""
+        with self._lock:
+            if self.remaining is None or self._probing:
+                self.remaining = remaining
+                self._probing = False
+            else:
+                self.remaining = min(self.remaining, remaining)
+            if self.remaining > self.quota_reserve:
+                self._probe_at = None
+        logger.debug("Quota remaining: %s, pacing at %.3f requests per second", remaining, self.effective_rate())
+
+    def reset(self, quota_reset: float = None):
+        """Forget the quota remaining, e.g. once it has been renewed, until the next response reports it
+
+        Args:
+            quota_reset (float, optional): Seconds from now until the following reset, if known, which is also taken
+            as the length of the quota window unless `quota_period` was given. Defaults to None.
+        """
+        with self._lock:
+            if quota_reset is not None:
+                self._deadline = self._clock() + quota_reset
+                self.quota_period = self.quota_period or quota_reset
+            self._forget()
+
+    def _forget(self):
+        self.remaining = None
+        self._probe_at = None
+        self._probing = False
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long to wait before it can be used"""
+        with self._lock:
+            now = self._clock()
+            if self._deadline is not None and now >= self._deadline:
+                logger.info("Quota reset time passed, %s calls were left", self.remaining)
+                self._forget()
+                if self.quota_period:
+                    # move on to the end of the current window, however many have passed
+                    self._deadline += ((now - self._deadline) // self.quota_period + 1) * self.quota_period
+                else:
+                    self._deadline = None
+
+            if self.remaining is not None and self.remaining <= self.quota_reserve:
+                if self._deadline is not None or self._probe_at is None or now < self._probe_at:
+                    if self._probe_at is None:
+                        self._probe_at = now + self.probe_interval
+                    raise QuotaExhaustedError(f"Quota exhausted: {self.remaining} calls remaining")
+                # no reset time known: let one request through to find out whether the quota has been renewed
+                self._probe_at = now + self.probe_interval
+                self._probing = True
+
+            rate = self.effective_rate()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            self._tokens -= 1
+            if self.remaining is not None:
+                # counted down until the next response reports the actual figure
+                self.remaining -= 1
+            return max(0.0, -self._tokens / rate)
+
+    def acquire(self):
+        """Block until a request can be sent
+
+        Raises:
+            QuotaExhaustedError: If no more than the reserved quota is left
+        """
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait until a request can be sent, without blocking the event loop
+
+        Raises:
+            QuotaExhaustedError: If no more than the reserved quota is left
+        """
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
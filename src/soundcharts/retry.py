@@ -0,0 +1,100 @@
+import asyncio
+from collections import Counter
+from datetime import datetime, UTC
+from email.utils import parsedate_to_datetime
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RetryPolicy:
+    """When and how long to wait before sending a failed request again
+
+    Requests are retried on rate limiting (429) and server errors, and on connection errors or timeouts, using
+    exponential backoff with full jitter, unless the response has a `Retry-After` header in which case that is
+    honoured, up to `max_backoff` so that no single wait can hold up the caller for longer. Only GET requests are retried by default, since repeating a POST may repeat its effect; pass
+    `methods=("GET", "POST")` to opt in.
+
+    Counters of retries are kept for monitoring, so share an instance between clients to count them together.
+    """
+
+    STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        methods: tuple = ("GET",),
+        statuses: frozenset = None,
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.methods = frozenset(method.upper() for method in methods)
+        self.statuses = statuses if statuses is not None else self.STATUSES
+        self.retries = Counter()
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> dict:
+        """Number of retries in total and by status (None for connection errors), and of requests given up on"""
+        with self._lock:
+            return {"retries": sum(self.retries.values()), "by_status": dict(self.retries), "exhausted": self.exhausted}
+
+    def should_retry(self, method: str, status_code: int, attempt: int) -> bool:
+        """Whether a request should be sent again
+
+        Args:
+            method (str): HTTP method of the request
+            status_code (int): Status of the response, or None if there was no response
+            attempt (int): Number of retries already made for this request
+
+        Returns:
+            bool: True to retry
+        """
+        if method.upper() not in self.methods or (status_code is not None and status_code not in self.statuses):
+            return False
+        if attempt >= self.max_retries:
+            with self._lock:
+                self.exhausted += 1
+            return False
+        return True
+
+    def delay(self, attempt: int, retry_after: str = None) -> float:
+        """Seconds to wait before the given retry, honouring a Retry-After header in seconds or as an HTTP date
+
+        Every wait, including one asked for by Retry-After, is at most `max_backoff`.
+        """
+        if retry_after:
+            try:
+                return min(self.max_backoff, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+            try:
+                seconds = (parsedate_to_datetime(retry_after) - datetime.now(UTC)).total_seconds()
+                return min(self.max_backoff, max(0.0, seconds))
+            except (TypeError, ValueError):
+                logger.debug("Ignoring unparseable Retry-After: %s", retry_after)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def _record(self, status_code: int, attempt: int, retry_after: str) -> float:
+        with self._lock:
+            self.retries[status_code] += 1
+        wait = self.delay(attempt, retry_after)
+        logger.info(
+            "Retrying after status %s in %.2fs (retry %d of %d)", status_code, wait, attempt + 1, self.max_retries
+        )
+        return wait
+
+    def wait(self, status_code: int, attempt: int, retry_after: str = None):
+        """Count a retry and sleep until it is due"""
+        time.sleep(self._record(status_code, attempt, retry_after))
+
+    async def wait_async(self, status_code: int, attempt: int, retry_after: str = None):
+        """Count a retry and wait until it is due, without blocking the event loop"""
+        await asyncio.sleep(self._record(status_code, attempt, retry_after))
@@ -0,0 +1,129 @@
+from datetime import date, timedelta
+import logging
+import sqlite3
+import threading
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+SeriesKey = Tuple[str, str, str]
+
+
+class SeriesCache:
+    """Persistent store of daily time series, so that a range can be completed by fetching only the missing dates
+
+    Each series is keyed by (uuid, metric, platform), where platform may be None. Days older than `settle_days` are
+    treated as immutable: once fetched they are never requested again, including days for which the API had no
+    value. More recent days are always fetched again, and overwrite what is stored.
+
+    The store is a sqlite database, so can be shared between processes by using the same path, and between threads
+    by sharing the instance.
+    """
+
+    def __init__(self, path: str = ":memory:", settle_days: int = 3):
+        self.settle_days = settle_days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS points ("
+                "uuid TEXT, metric TEXT, platform TEXT, day TEXT, value, "
+                "PRIMARY KEY (uuid, metric, platform, day)) WITHOUT ROWID"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS settled ("
+                "uuid TEXT, metric TEXT, platform TEXT, day TEXT, "
+                "PRIMARY KEY (uuid, metric, platform, day)) WITHOUT ROWID"
+            )
+
+    def close(self):
+        self._conn.close()
+
+    @staticmethod
+    def _key(key: SeriesKey) -> tuple:
+        uuid, metric, platform = key
+        return uuid, metric, platform or ""
+
+    def _settled_before(self) -> date:
+        return date.today() - timedelta(days=self.settle_days)
+
+    def missing_ranges(self, key: SeriesKey, start: date, end: date) -> List[Tuple[date, date]]:
+        """Find the contiguous ranges of days between start and end (inclusive) which need to be fetched
+
+        Args:
+            key (SeriesKey): (uuid, metric, platform) of the series
+            start (date): First day of the range
+            end (date): Last day of the range
+
+        Returns:
+            List[Tuple[date, date]]: (first, last) day of each gap, oldest first
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day FROM settled WHERE uuid = ? AND metric = ? AND platform = ? AND day BETWEEN ? AND ?",
+                (*self._key(key), start.isoformat(), end.isoformat()),
+            ).fetchall()
+        settled = {row[0] for row in rows}
+
+        gaps = []
+        gap_start = None
+        day = start
+        while day <= end:
+            if day.isoformat() in settled:
+                if gap_start:
+                    gaps.append((gap_start, day - timedelta(days=1)))
+                    gap_start = None
+            elif not gap_start:
+                gap_start = day
+            day += timedelta(days=1)
+        if gap_start:
+            gaps.append((gap_start, end))
+        return gaps
+
+    def get(self, key: SeriesKey, start: date, end: date) -> dict:
+        """Retrieve the stored values between start and end (inclusive), as a map of ISO date to value"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day, value FROM points "
+                "WHERE uuid = ? AND metric = ? AND platform = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (*self._key(key), start.isoformat(), end.isoformat()),
+            ).fetchall()
+        return dict(rows)
+
+    def put(self, key: SeriesKey, start: date, end: date, values: dict):
+        """Store the values fetched for the range start to end (inclusive)
+
+        Days in the range which are old enough to have settled are recorded as such, whether or not there was a
+        value for them.
+
+        Args:
+            key (SeriesKey): (uuid, metric, platform) of the series
+            start (date): First day that was fetched
+            end (date): Last day that was fetched
+            values (dict): Map of ISO date to value, as returned by the API
+        """
+        series = self._key(key)
+        settled_end = min(end, self._settled_before() - timedelta(days=1))
+        settled_days = []
+        day = start
+        while day <= settled_end:
+            settled_days.append((*series, day.isoformat()))
+            day += timedelta(days=1)
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO points (uuid, metric, platform, day, value) VALUES (?, ?, ?, ?, ?)",
+                [(*series, day, value) for day, value in values.items()],
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO settled (uuid, metric, platform, day) VALUES (?, ?, ?, ?)", settled_days
+            )
+        logger.debug("Stored %d values for %s, %d days settled", len(values), key, len(settled_days))
+
+    def invalidate(self, key: SeriesKey):
+        """Forget everything stored for a series"""
+        with self._lock, self._conn:
+            for table in ("points", "settled"):
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE uuid = ? AND metric = ? AND platform = ?", self._key(key)
+                )
@@ -0,0 +1,138 @@
+import asyncio
+import copy
+import threading
+from typing import Awaitable, Callable, Hashable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _fresh(error: BaseException) -> BaseException:
+    """Copy of an exception for one caller to raise, so that callers don't share its traceback and context"""
+    cls = type(error)
+    clone = cls.__new__(cls, *error.args)
+    clone.args = error.args
+    try:
+        clone.__dict__.update(copy.deepcopy(error.__dict__))
+    except Exception:
+        clone.__dict__.update(error.__dict__)
+    return clone
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls, so that only the first is made and the others wait for its result
+
+    Every caller sharing a call receives its result, or has its exception raised. Callers other than the one which
+    made the call receive a deep copy, so may modify it freely, and raise their own copy of the exception, with the
+    original as its cause. Nothing is kept once the call completes: a later
+    identical call is made again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.shared = 0
+
+    @property
+    def stats(self) -> dict:
+        """Number of calls made, and of callers which waited for another's call instead"""
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared}
+
+    def do(self, key: Hashable, fn: Callable):
+        """Call fn, unless a call with the same key is in flight, in which case wait for that one's outcome
+
+        Args:
+            key (Hashable): Identifies calls which are interchangeable
+            fn (Callable): Makes the call, taking no arguments
+
+        Returns:
+            The result of the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error:
+                raise _fresh(call.error) from call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """Event loop equivalent of SingleFlight, for coroutines
+
+    If the caller making the call is cancelled, the call is not: a caller waiting for it makes it again instead.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.calls = 0
+        self.shared = 0
+
+    @property
+    def stats(self) -> dict:
+        """Number of calls made, and of callers which waited for another's call instead"""
+        return {"calls": self.calls, "shared": self.shared}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        """Await fn(), unless a call with the same key is in flight, in which case wait for that one's outcome
+
+        Args:
+            key (Hashable): Identifies calls which are interchangeable
+            fn (Callable[[], Awaitable]): Makes the call, taking no arguments
+
+        Returns:
+            The result of the call
+        """
+        future = self._calls.get(key)
+        while future is not None:
+            self.shared += 1
+            try:
+                return copy.deepcopy(await asyncio.shield(future))
+            except asyncio.CancelledError:
+                # the caller making the call was cancelled rather than this one, so take over from it
+                if not future.cancelled():
+                    raise
+            except Exception as e:
+                raise _fresh(e) from e
+            future = self._calls.get(key)
+
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        self.calls += 1
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # retrieved here in case no other caller was waiting, to avoid the "never retrieved" warning
+            future.exception()
+            raise
+        finally:
+            del self._calls[key]
@@ -0,0 +1,187 @@
+from datetime import date
+import logging
+import sqlite3
+import threading
+from typing import Iterable, Iterator, List, Tuple
+
+from soundcharts.platform import SocialPlatform
+from soundcharts.timeseries import DailySeries, np
+
+logger = logging.getLogger(__name__)
+
+# (entity, metric, platform), as the series keys of SeriesCache
+MetricKey = Tuple[str, str, str]
+
+
+class FollowerSnapshot:
+    """Latest follower counts of many artists on many platforms, as a dense table
+
+    Rows are artists and columns platforms, in the order given. Each cell holds the latest value and its date, or
+    None for both if there was no data, and any error from its lookup is kept in `errors` rather than dropped.
+
+    Args:
+        artists (List[str]): Soundcharts UUID of each artist
+        platforms (List[SocialPlatform]): Platform of each column
+    """
+
+    def __init__(self, artists: List[str], platforms: List[SocialPlatform]):
+        self.artists = artists
+        self.platforms = platforms
+        self.values = [[None] * len(platforms) for _ in artists]
+        self.dates = [[None] * len(platforms) for _ in artists]
+        # (uuid, platform) to the exception raised looking it up
+        self.errors = {}
+        self._rows = {uuid: index for index, uuid in enumerate(artists)}
+        self._columns = {platform: index for index, platform in enumerate(platforms)}
+
+    def set(self, uuid: str, platform: SocialPlatform, day: date, value: int):
+        row, column = self._rows[uuid], self._columns[platform]
+        self.dates[row][column] = day
+        self.values[row][column] = value
+
+    def get(self, uuid: str, platform: SocialPlatform) -> Tuple[date, int]:
+        """The (date, value) of a cell, (None, None) if it has no data
+
+        Raises:
+            Exception: The error from the cell's lookup, if it failed
+        """
+        if (uuid, platform) in self.errors:
+            raise self.errors[(uuid, platform)]
+        row, column = self._rows[uuid], self._columns[platform]
+        return self.dates[row][column], self.values[row][column]
+
+    def cells(self) -> Iterator[Tuple[str, SocialPlatform, date, int]]:
+        """Every cell with a value, as (uuid, platform, date, value)"""
+        for uuid, dates, values in zip(self.artists, self.dates, self.values):
+            for platform, day, value in zip(self.platforms, dates, values):
+                if value is not None:
+                    yield uuid, platform, day, value
+
+
+class SnapshotStore:
+    """Local store of fetched metrics, by (entity, metric, platform, date)
+
+    Clients given a store write every time series they fetch to it, keyed as for `series_cache` e.g.
+    (uuid, "followers", "spotify"). Writes are buffered and upserted in batches of `batch_size`, a later value for a
+    day replacing an earlier one; reads flush the buffer first. Days are stored as ordinals, so a range reads back as
+    day offsets and values which go straight into arrays, without building a dict per point.
+
+    The store is a sqlite database, so can be shared between processes by using the same path, and between threads
+    by sharing the instance. The last batch is only written by `flush` or `close`, so use the store as a context
+    manager or call one of them once done. Clients and hubs given the store flush it when they are closed.
+    """
+
+    def __init__(self, path: str = ":memory:", batch_size: int = 5000):
+        self.batch_size = batch_size
+        self._pending = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS metrics ("
+                "entity TEXT, metric TEXT, platform TEXT, day INTEGER, value, "
+                "PRIMARY KEY (entity, metric, platform, day)) WITHOUT ROWID"
+            )
+
+    @staticmethod
+    def _key(key: MetricKey) -> tuple:
+        entity, metric, platform = key
+        return entity, metric, platform or ""
+
+    def put(self, key: MetricKey, points: Iterable[Tuple[str, float]]):
+        """Add (ISO date, value) points to a series, e.g. the items of a dict returned by a daily method"""
+        entity, metric, platform = self._key(key)
+        rows = [
+            (entity, metric, platform, date.fromisoformat(day[:10]).toordinal(), value)
+            for day, value in points
+            if value is not None
+        ]
+        self._write(rows)
+
+    def put_snapshot(self, snapshot: FollowerSnapshot, metric: str = "followers"):
+        """Add the values of a follower snapshot, each on its own date"""
+        rows = [
+            (uuid, metric, platform.value, day.toordinal(), value) for uuid, platform, day, value in snapshot.cells()
+        ]
+        self._write(rows)
+
+    def _write(self, rows: list):
+        with self._lock:
+            self._pending.extend(rows)
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def flush(self):
+        """Write any buffered points"""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO metrics (entity, metric, platform, day, value) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (entity, metric, platform, day) DO UPDATE SET value = excluded.value",
+                self._pending,
+            )
+        logger.debug("Wrote %d points", len(self._pending))
+        self._pending = []
+
+    def close(self):
+        """Write any buffered points and close the database"""
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _rows(self, key: MetricKey, start: date, end: date) -> list:
+        with self._lock:
+            self._flush()
+            return self._conn.execute(
+                "SELECT day - ?, value FROM metrics "
+                "WHERE entity = ? AND metric = ? AND platform = ? AND day BETWEEN ? AND ? ORDER BY day",
+                (start.toordinal(), *self._key(key), start.toordinal(), end.toordinal()),
+            ).fetchall()
+
+    def read(self, key: MetricKey, start: date, end: date) -> DailySeries:
+        """Read a series between start and end (inclusive)
+
+        Returns:
+            DailySeries: The series, with days that have no value marked missing
+        """
+        rows = self._rows(key, start, end)
+        offsets = [offset for offset, _ in rows]
+        values = [value for _, value in rows]
+        typecode = "q" if all(isinstance(value, int) for value in values) else "d"
+        return DailySeries.from_offsets(start, (end - start).days + 1, offsets, values, typecode)
+
+    def read_matrix(self, entities: List[str], metric: str, platform: str, start: date, end: date):
+        """Read a metric for many entities between start and end (inclusive) into one array
+
+        Requires NumPy.
+
+        Args:
+            entities (List[str]): The entities, e.g. artist UUIDs, one per row
+            metric (str): The metric, e.g. "followers"
+            platform (str): Platform code, or None for metrics without one
+            start (date): First day, the first column
+            end (date): Last day, the last column
+
+        Returns:
+            np.ndarray: Values shaped (entities, days), NaN where there is no value
+        """
+        if np is None:
+            raise ImportError("SnapshotStore.read_matrix requires NumPy")
+
+        matrix = np.full((len(entities), (end - start).days + 1), np.nan)
+        for row, entity in enumerate(entities):
+            rows = self._rows((entity, metric, platform), start, end)
+            if rows:
+                offsets, values = np.array(rows, dtype=np.float64).T
+                matrix[row, offsets.astype(np.int64)] = values
+        return matrix
@@ -1,11 +1,12 @@
 from datetime import date, datetime, timedelta
-from typing import Iterator
+from typing import Iterable, Iterator, Tuple, Union
 from urllib.parse import urlparse
 import requests
 
 from soundcharts.client import Client
 from soundcharts.errors import ItemNotFoundError
 from soundcharts.platform import SocialPlatform
+from soundcharts.timeseries import DailySeries
 
 
 class Song(Client):
@@ -37,6 +38,39 @@ class Song(Client):
         url = "/by-isrc/{isrc}".format(isrc=isrc)
         return self._get_single_object(url, obj_type="song")
 
+    def songs_by_isrc(self, isrcs: Iterable[str], concurrency: int = None) -> Iterator[Tuple[str, dict]]:
+        """Retrieve many songs by ISRC, e.g. a label catalogue
+
+        ISRCs are looked up concurrently, each once however often it appears, and pace with any rate limiter shared by
+        the client. A failed lookup doesn't stop the batch: its error is returned in place of the song, with songs
+        which aren't found as ItemNotFoundError.
+
+        Args:
+            isrcs (Iterable[str]): ISRCs to look up, read lazily
+            concurrency (int, optional): Number of lookups to make at a time. Defaults to `max_workers`.
+
+        Yields:
+            Tuple[str, dict]: (ISRC, song), or (ISRC, exception), in order of completion
+        """
+        yield from self._bulk(self.song_by_isrc, isrcs, concurrency)
+
+    def songs_by_platform_identifier(
+        self, platform: SocialPlatform, identifiers: Iterable[str], concurrency: int = None
+    ) -> Iterator[Tuple[str, dict]]:
+        """Retrieve many songs by their identifiers on a platform, as `songs_by_isrc`
+
+        Args:
+            platform (SocialPlatform): The platform
+            identifiers (Iterable[str]): Identifiers on the platform, read lazily
+            concurrency (int, optional): Number of lookups to make at a time. Defaults to `max_workers`.
+
+        Yields:
+            Tuple[str, dict]: (identifier, song), or (identifier, exception), in order of completion
+        """
+        yield from self._bulk(
+            lambda identifier: self.song_by_platform_identifier(platform, identifier), identifiers, concurrency
+        )
+
     def identifiers(self, uuid: str) -> Iterator[dict]:
         """Retrieve the platform identifiers for a song using Soundcharts ID
 
@@ -47,7 +81,15 @@ class Song(Client):
             dict: A map of platform key to identifier as a string
         """
         url = "/{uuid}/identifiers".format(uuid=uuid)
-        yield from self._get_paginated(url)
+        if not self.identifier_index:
+            yield from self._get_paginated(url)
+            return
+
+        items = self.identifier_index.identifiers("song", uuid)
+        if items is None:
+            items = list(self._get_paginated(url))
+            self.identifier_index.put_identifiers("song", uuid, items)
+        yield from items
 
     def platform_identifier(self, platform: SocialPlatform, uuid: str):
         """Retrieve the platform identifier for a Soundcharts UUID, if present
@@ -85,19 +127,42 @@ class Song(Client):
         Returns:
             [type]: [description]
         """
-        url = "/by-platform/{platform}/{identifier}".format(platform=platform.value, identifier=identifier)
-        song = self._get_single_object(url, obj_type="song")
+        uuid = self.identifier_index.uuid("song", platform.value, identifier) if self.identifier_index else None
+        if uuid:
+            song = self.song_by_id(uuid)
+        else:
+            url = "/by-platform/{platform}/{identifier}".format(platform=platform.value, identifier=identifier)
+            song = self._get_single_object(url, obj_type="song")
+            if song and self.identifier_index:
+                self.identifier_index.put_uuid("song", platform.value, identifier, song["uuid"])
         if not song:
             raise ItemNotFoundError("No Song found for platform: {}, id: {}".format(platform.value, identifier))
         return song
 
-    def spotify_stream_count(self, uuid: str, start: date = None, end: date = None) -> dict:
+    def uuids_by_platform_identifier(self, platform: SocialPlatform, identifiers: Iterable[str]) -> dict:
+        """Resolve many platform identifiers, e.g. Spotify IDs, to Soundcharts UUIDs
+
+        With an identifier index, those already indexed are resolved locally and the rest are added to it.
+
+        Args:
+            platform (SocialPlatform): The platform
+            identifiers (Iterable[str]): Identifiers on the platform
+
+        Returns:
+            dict: Map of identifier to UUID, leaving out those without a song
+        """
+        return self._uuids_by_platform_identifier("song", platform, identifiers, self.song_by_platform_identifier)
+
+    def spotify_stream_count(
+        self, uuid: str, start: date = None, end: date = None, as_series: bool = False
+    ) -> Union[dict, DailySeries]:
         """Retrieve the Spotify stream count for a song between two dates
 
         Args:
             uuid (str): [description]
             start (date): [description]
             end (date, optional): [description]. Defaults to None.
+            as_series (bool, optional): Return a DailySeries instead of a dict. Defaults to False.
 
         Returns:
             dict: [description]
@@ -109,17 +174,15 @@ class Song(Client):
         if not end:
             end = datetime.utcnow().date()
 
-        stream_count_map = {}
-
-        current_start = max(start, end - timedelta(days=90))
         try:
-            while current_start >= start and current_start < end:
-                params = {"startDate": current_start.isoformat(), "endDate": end.isoformat()}
-                for item in self._get_paginated(url, params=params):
-                    stream_count_map[item["date"][:10]] = item["value"]
-                end = current_start
-                current_start = max(start, end - timedelta(days=90))
-            return stream_count_map
+            return self._get_date_range(
+                url,
+                start,
+                end,
+                window_key="spotify_stream_count",
+                series_key=(uuid, "spotify_streams", None),
+                as_series=as_series,
+            )
         except requests.exceptions.HTTPError:
             raise ItemNotFoundError("No stream counts available for track: {}".format(uuid))
 
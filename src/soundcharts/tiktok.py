@@ -7,8 +7,8 @@ logger = logging.getLogger(__name__)
 
 
 class Tiktok(Client):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self._prefix = "/api/v2/tiktok"
 
     def get_latest_video_views(self, username: str, limit: int = None) -> dict:
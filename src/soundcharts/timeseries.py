@@ -0,0 +1,264 @@
+from array import array
+from datetime import date, timedelta
+from typing import Iterable, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, array.array is used instead
+    np = None
+
+
+def date_windows(start: date, end: date, days: int) -> List[Tuple[date, date]]:
+    """Split a date range into windows no longer than the API accepts in one request
+
+    Windows are returned newest first, each starting where the previous (older) one ends, which is how the time
+    series endpoints have always been walked. If `start` is not before `end` there are no windows.
+
+    Args:
+        start (date): Earliest date of the range
+        end (date): Latest date of the range
+        days (int): Maximum length of a window in days
+
+    Returns:
+        List[Tuple[date, date]]: (start, end) of each window, newest first
+    """
+    windows = []
+    current_start = max(start, end - timedelta(days=days))
+    while current_start >= start and current_start < end:
+        windows.append((current_start, end))
+        end = current_start
+        current_start = max(start, end - timedelta(days=days))
+    return windows
+
+
+def month_range(start: date, end: date) -> List[Tuple[int, int]]:
+    """The calendar months overlapping a date range, oldest first
+
+    Args:
+        start (date): Earliest date of the range
+        end (date): Latest date of the range, included
+
+    Returns:
+        List[Tuple[int, int]]: (year, month) of each month
+    """
+    first, last = start.year * 12 + start.month - 1, end.year * 12 + end.month - 1
+    return [(index // 12, index % 12 + 1) for index in range(first, last + 1)]
+
+
+class DailySeries:
+    """Compact time series of regularly spaced values, as an alternative to a dict of ISO date to value
+
+    Values are held contiguously from `start`, one every `step` days, in a NumPy array if NumPy is installed or an
+    `array.array` otherwise, with a parallel mask marking the days for which there is no value. Integer series are
+    stored as 64 bit integers, anything else as doubles.
+    """
+
+    AGGREGATES = ("last", "first", "sum", "mean", "min", "max")
+
+    def __init__(self, start: date, values, missing, step: int = 1):
+        self.start = start
+        self.values = values
+        self.missing = missing
+        self.step = step
+
+    @classmethod
+    def from_points(cls, points: Iterable[Tuple[str, float]], start: date = None, end: date = None) -> "DailySeries":
+        """Build a daily series from (ISO date, value) pairs; a later pair for the same day replaces an earlier one
+
+        Args:
+            points (Iterable[Tuple[str, float]]): Dates and values, in any order
+            start (date, optional): First day of the series. Defaults to the earliest date in the points.
+            end (date, optional): Last day of the series. Defaults to the latest date in the points.
+
+        Returns:
+            DailySeries: The series, with days that have no point (or a None value) marked missing
+        """
+        by_ordinal = {date.fromisoformat(day[:10]).toordinal(): value for day, value in points}
+        by_ordinal = {ordinal: value for ordinal, value in by_ordinal.items() if value is not None}
+        if not by_ordinal and (start is None or end is None):
+            return cls._build(start or end or date.today(), 0, "q")
+
+        first = start.toordinal() if start else min(by_ordinal)
+        last = end.toordinal() if end else max(by_ordinal)
+        typecode = "q" if all(isinstance(value, int) for value in by_ordinal.values()) else "d"
+        series = cls._build(date.fromordinal(first), max(last - first + 1, 0), typecode)
+        if np:
+            offsets = np.fromiter(by_ordinal.keys(), dtype=np.int64, count=len(by_ordinal)) - first
+            values = np.fromiter(by_ordinal.values(), dtype=series.values.dtype, count=len(by_ordinal))
+            in_range = (offsets >= 0) & (offsets < len(series))
+            series.values[offsets[in_range]] = values[in_range]
+            series.missing[offsets[in_range]] = False
+        else:
+            for ordinal, value in by_ordinal.items():
+                if first <= ordinal <= last:
+                    series.values[ordinal - first] = value
+                    series.missing[ordinal - first] = 0
+        return series
+
+    @classmethod
+    def from_offsets(cls, start: date, length: int, offsets, values, typecode: str = "d") -> "DailySeries":
+        """Build a daily series from day offsets and values, without going through dates
+
+        Args:
+            start (date): First day of the series
+            length (int): Number of days in the series
+            offsets: Day of each value, as the number of days since `start`, all within the series
+            values: The values, in the same order as the offsets
+            typecode (str, optional): "q" for integer values, "d" for anything else. Defaults to "d".
+
+        Returns:
+            DailySeries: The series, with days that have no value marked missing
+        """
+        series = cls._build(start, length, typecode)
+        if np:
+            offsets = np.asarray(offsets, dtype=np.int64)
+            series.values[offsets] = values
+            series.missing[offsets] = False
+        else:
+            for offset, value in zip(offsets, values):
+                series.values[offset] = value
+                series.missing[offset] = 0
+        return series
+
+    @classmethod
+    def from_dict(cls, values: dict, start: date = None, end: date = None) -> "DailySeries":
+        """Build a daily series from a map of ISO date to value, as returned by the daily methods"""
+        return cls.from_points(values.items(), start, end)
+
+    @classmethod
+    def _build(cls, start: date, length: int, typecode: str, step: int = 1) -> "DailySeries":
+        """An empty series of the given length, with every day missing"""
+        if np:
+            values = np.zeros(length, dtype=np.int64 if typecode == "q" else np.float64)
+            missing = np.ones(length, dtype=bool)
+        else:
+            values = array(typecode, bytes(length * array(typecode).itemsize))
+            missing = bytearray(b"\x01" * length)
+        return cls(start, values, missing, step)
+
+    @property
+    def end(self) -> date:
+        """Date of the last slot in the series"""
+        return self.start + timedelta(days=self.step * (len(self) - 1))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, DailySeries) and self.step == other.step and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"DailySeries(start={self.start}, length={len(self)}, step={self.step})"
+
+    def _index(self, day) -> int:
+        if isinstance(day, str):
+            day = date.fromisoformat(day[:10])
+        return (day - self.start).days // self.step
+
+    def get(self, day, default=None):
+        """Value for a day (date or ISO string), or `default` if outside the series or missing"""
+        index = self._index(day)
+        if index < 0 or index >= len(self) or self.missing[index]:
+            return default
+        return self._item(index)
+
+    def _item(self, index: int):
+        value = self.values[index]
+        return value.item() if np else value
+
+    def dates(self) -> List[date]:
+        """The date of every slot in the series, including missing ones"""
+        return [self.start + timedelta(days=self.step * i) for i in range(len(self))]
+
+    def to_dict(self) -> dict:
+        """Convert to the map of ISO date to value returned by the daily methods, leaving out missing days"""
+        return {
+            (self.start + timedelta(days=self.step * i)).isoformat(): self._item(i)
+            for i in range(len(self))
+            if not self.missing[i]
+        }
+
+    def slice(self, start: date = None, end: date = None) -> "DailySeries":
+        """The part of the series between two dates (inclusive), clipped to the series"""
+        first = max(self._index(start), 0) if start else 0
+        last = min(self._index(end), len(self) - 1) if end else len(self) - 1
+        last = max(last, first - 1)
+        return DailySeries(
+            self.start + timedelta(days=self.step * first),
+            self.values[first : last + 1],
+            self.missing[first : last + 1],
+            self.step,
+        )
+
+    def diff(self) -> "DailySeries":
+        """Change from each slot to the next; a slot is missing if it or the previous one is missing"""
+        if np:
+            values = np.zeros_like(self.values)
+            values[1:] = self.values[1:] - self.values[:-1]
+            missing = self.missing.copy()
+            missing[:1] = True
+            missing[1:] |= self.missing[:-1]
+        else:
+            values = array(self.values.typecode, bytes(len(self) * self.values.itemsize))
+            missing = bytearray(b"\x01" * len(self))
+            for i in range(1, len(self)):
+                if not (self.missing[i] or self.missing[i - 1]):
+                    values[i] = self.values[i] - self.values[i - 1]
+                    missing[i] = 0
+        return DailySeries(self.start, values, missing, self.step)
+
+    def resample(self, days: int, how: str = "last") -> "DailySeries":
+        """Aggregate into periods of a fixed number of days, starting from the start of the series
+
+        Args:
+            days (int): Length of each period, a multiple of the current step e.g. 7 for weekly
+            how (str, optional): One of "last", "first", "sum", "mean", "min" or "max", applied to the values present
+            in each period. Defaults to "last".
+
+        Returns:
+            DailySeries: The resampled series, with a period missing if it had no values
+        """
+        if how not in self.AGGREGATES:
+            raise ValueError(f"Unknown aggregate {how}, expected one of {self.AGGREGATES}")
+        if days % self.step:
+            raise ValueError(f"Period of {days} days is not a multiple of the step {self.step}")
+        width = days // self.step
+        periods = -(-len(self) // width)
+
+        if np:
+            padding = periods * width - len(self)
+            values = np.concatenate([self.values, np.zeros(padding, dtype=self.values.dtype)]).reshape(periods, width)
+            missing = np.concatenate([self.missing, np.ones(padding, dtype=bool)]).reshape(periods, width)
+            present = ~missing
+            if how == "last":
+                index = width - 1 - np.argmax(present[:, ::-1], axis=1)
+                result = values[np.arange(periods), index]
+            elif how == "first":
+                result = values[np.arange(periods), np.argmax(present, axis=1)]
+            else:
+                masked = np.ma.array(values, mask=missing)
+                result = getattr(masked, how)(axis=1).filled(0)
+            return DailySeries(self.start, np.asarray(result), ~present.any(axis=1), days)
+
+        typecode = "d" if how == "mean" else self.values.typecode
+        result = array(typecode, bytes(periods * array(typecode).itemsize))
+        result_missing = bytearray(b"\x01" * periods)
+        for period in range(periods):
+            present = [
+                self.values[i]
+                for i in range(period * width, min((period + 1) * width, len(self)))
+                if not self.missing[i]
+            ]
+            if present:
+                if how == "last":
+                    result[period] = present[-1]
+                elif how == "first":
+                    result[period] = present[0]
+                elif how == "sum":
+                    result[period] = sum(present)
+                elif how == "mean":
+                    result[period] = sum(present) / len(present)
+                else:
+                    result[period] = min(present) if how == "min" else max(present)
+                result_missing[period] = 0
+        return DailySeries(self.start, result, result_missing, days)
@@ -24,6 +24,7 @@ class TopArtist(Client):
         max_value: int = None,
         min_change: int = None,
         max_change: int = None,
+        concurrency: int = None,
     ) -> Iterator[Dict]:
         """Yield artists that match the given criteria for the given platform and metric type
 
@@ -38,6 +39,8 @@ class TopArtist(Client):
             max_value (int, optional): [description]. Defaults to None.
             min_change (int, optional): [description]. Defaults to None.
             max_change (int, optional): [description]. Defaults to None.
+            concurrency (int, optional): Fetch pages concurrently on this many workers where the API paginates by
+            offset; token-paginated responses are still followed one page at a time. Defaults to None.
 
         Returns:
             [type]: [description]
@@ -71,4 +74,4 @@ class TopArtist(Client):
             params["maxChange"] = max_change
 
         url = "/{platform}/{metric_type}".format(platform=platform.value, metric_type=metric_type)
-        yield from self._get_paginated(url, params=params, max_limit=max_limit)
+        yield from self._get_paginated(url, params=params, max_limit=max_limit, concurrency=concurrency)
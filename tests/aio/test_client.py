@@ -0,0 +1,231 @@
+import asyncio
+from datetime import date
+import json
+import threading
+import unittest
+from unittest import mock
+
+import httpx
+from soundcharts.aio import Artist, Song
+from soundcharts.cache import SqliteCache
+from soundcharts.errors import ConnectionError
+from soundcharts.platform import SocialPlatform
+from soundcharts.retry import RetryPolicy
+from soundcharts.singleflight import AsyncSingleFlight
+from soundcharts.snapshot import SnapshotStore
+
+from tests import load_sample_response
+
+
+def mock_transport(routes: dict, calls: list = None) -> httpx.MockTransport:
+    """Build a transport answering from a map of path (with optional query string) to sample response file"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if calls is not None:
+            calls.append(request)
+        path = request.url.path
+        query = request.url.query.decode()
+        for key in (f"{path}?{query}", path):
+            if key in routes:
+                return httpx.Response(200, text=json.dumps(load_sample_response(routes[key])))
+        return httpx.Response(404, json={"errors": [{"code": 404, "message": "Not found"}]})
+
+    return httpx.MockTransport(handler)
+
+
+class AsyncArtistCase(unittest.IsolatedAsyncioTestCase):
+    async def test_artist_by_id(self):
+        transport = mock_transport(
+            {"/api/v2.9/artist/ca22091a-3c00-11e9-974f-549f35141000": "responses/artist/artist_by_id_1.json"}
+        )
+        async with Artist(transport=transport) as artist_api:
+            artist = await artist_api.artist_by_id("ca22091a-3c00-11e9-974f-549f35141000")
+        self.assertEqual(artist["name"], "Tones and I")
+
+    async def test_songs_paginated(self):
+        uuid = "11e81bbe-5b34-a426-8614-a0369fe50396"
+        base = f"/api/v2.21/artist/{uuid}/songs"
+        transport = mock_transport(
+            {
+                f"{base}?sortBy=spotifyStream&sortOrder=desc": "responses/artist/songs_1_p1.json",
+                f"{base}?sortBy=spotifyStream&sortOrder=desc&offset=100&limit=100": "responses/artist/songs_1_p2.json",
+                f"{base}?sortBy=spotifyStream&sortOrder=desc&offset=200&limit=100": "responses/artist/songs_1_p3.json",
+                f"{base}?sortBy=spotifyStream&sortOrder=desc&offset=300&limit=100": "responses/artist/songs_1_p4.json",
+            }
+        )
+        async with Artist(transport=transport) as artist_api:
+            songs = [song async for song in artist_api.songs(uuid, sortBy="spotifyStream")]
+            self.assertEqual(len(songs), 334)
+
+            # prefix is resolved per call, so the default prefix is untouched
+            self.assertEqual(artist_api._prefix, "/api/v2/artist")
+
+    async def test_songs_concurrent_and_prefetched(self):
+        uuid = "11e81bbe-5b34-a426-8614-a0369fe50396"
+        base = f"/api/v2.21/artist/{uuid}/songs"
+        calls = []
+        transport = mock_transport(
+            {
+                f"{base}?sortBy=spotifyStream&sortOrder=desc": "responses/artist/songs_1_p1.json",
+                f"{base}?sortBy=spotifyStream&sortOrder=desc&offset=100&limit=100": "responses/artist/songs_1_p2.json",
+                f"{base}?sortBy=spotifyStream&sortOrder=desc&offset=200&limit=100": "responses/artist/songs_1_p3.json",
+                f"{base}?sortBy=spotifyStream&sortOrder=desc&offset=300&limit=100": "responses/artist/songs_1_p4.json",
+            },
+            calls,
+        )
+        async with Artist(transport=transport) as artist_api:
+            expected = [song async for song in artist_api.songs(uuid, sortBy="spotifyStream")]
+            prefetched = [song async for song in artist_api.songs(uuid, sortBy="spotifyStream", prefetch=2)]
+            self.assertEqual(prefetched, expected)
+
+            params = {"sortBy": "spotifyStream", "sortOrder": "desc"}
+            client = artist_api._with_prefix("/api/v2.21/artist")
+            pages = client._get_paginated(f"/{uuid}/songs", params=params, concurrency=3, max_limit=150)
+            fanned_out = [song async for song in pages]
+        self.assertEqual(fanned_out, expected[:150])
+        # the first page and the one holding the 150th item, nothing beyond
+        self.assertEqual(len(calls), 4 + 4 + 2)
+
+    async def test_spotify_popularity_daily(self):
+        art_tones = "ca22091a-3c00-11e9-974f-549f35141000"
+        transport = mock_transport(
+            {
+                f"/api/v2/artist/{art_tones}/spotify/popularity?startDate=2021-04-12&endDate=2021-06-03": (
+                    "responses/artist/popularity_daily_1_p1.json"
+                )
+            }
+        )
+        async with Artist(transport=transport) as artist_api:
+            daily_popularity = await artist_api.spotify_popularity_daily(
+                uuid=art_tones, start=date(2021, 4, 12), end=date(2021, 6, 3)
+            )
+        self.assertEqual(len(daily_popularity), 9)
+        self.assertEqual(daily_popularity["2021-05-28"], 82)
+
+    async def test_not_found(self):
+        async with Artist(transport=mock_transport({})) as artist_api:
+            with self.assertRaises(ConnectionError) as ctx:
+                await artist_api.artist_by_id("unknown")
+        self.assertEqual(ctx.exception.status_code, 404)
+
+
+class AsyncSongCase(unittest.IsolatedAsyncioTestCase):
+    async def test_song_by_platform(self):
+        transport = mock_transport(
+            {"/api/v2/song/by-platform/spotify/7A9rdAz2M6AjRwOa34jxIP": "responses/song/song_by_platform_1.json"}
+        )
+        async with Song(transport=transport) as songs:
+            song = await songs.song_by_platform_identifier(SocialPlatform.SPOTIFY, "7A9rdAz2M6AjRwOa34jxIP")
+        self.assertEqual(song["uuid"], "2ffc5f25-f191-4551-a1b4-40fe9ddcc075")
+
+    async def test_platform_identifier(self):
+        uuid = "d30eaa97-7afb-49b9-8138-02e0eec8f06f"
+        transport = mock_transport({f"/api/v2/song/{uuid}/identifiers": "responses/song/identifiers_1.json"})
+        async with Song(transport=transport) as songs:
+            spotify_handle = await songs.platform_identifier(SocialPlatform.SPOTIFY, uuid)
+        self.assertEqual(spotify_handle, "5wC0vEMWEXbBCMsdcjV6nW")
+
+
+class AsyncRetryCase(unittest.IsolatedAsyncioTestCase):
+    @mock.patch("soundcharts.retry.asyncio.sleep")
+    async def test_server_error_retried(self, sleep):
+        responses = [httpx.Response(502), httpx.Response(200, json={"type": "song", "object": {"name": "bad guy"}})]
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return responses.pop(0)
+
+        policy = RetryPolicy()
+        async with Song(transport=httpx.MockTransport(handler), retry_policy=policy) as song_api:
+            song = await song_api.song_by_id("7d534228-5165-11e9-9375-549f35161576")
+        self.assertEqual(song["name"], "bad guy")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(policy.stats["by_status"], {502: 1})
+
+
+class AsyncSingleFlightCase(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_calls_coalesced(self):
+        calls = []
+        body = json.dumps(load_sample_response("responses/artist/artist_by_id_1.json"))
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, text=body)
+
+        async with Artist(transport=httpx.MockTransport(handler)) as artist_api:
+            results = await asyncio.gather(
+                *(artist_api.artist_by_id("ca22091a-3c00-11e9-974f-549f35141000") for _ in range(10))
+            )
+            self.assertEqual(artist_api.single_flight.stats, {"calls": 1, "shared": 9})
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(len({id(result) for result in results}), 10)
+
+    async def test_error_passed_to_all(self):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.01)
+            return httpx.Response(404, json={"errors": [{"code": 404, "message": "Not found"}]})
+
+        async with Song(transport=httpx.MockTransport(handler)) as song_api:
+            results = await asyncio.gather(
+                *(song_api.song_by_id("7d534228-5165-11e9-9375-549f35161576") for _ in range(5)),
+                return_exceptions=True,
+            )
+        self.assertTrue(all(isinstance(result, ConnectionError) for result in results))
+        self.assertEqual(len({id(result) for result in results}), 5)
+        self.assertEqual(song_api.single_flight.stats, {"calls": 1, "shared": 4})
+
+    async def test_cancelled_caller_taken_over(self):
+        single_flight = AsyncSingleFlight()
+        started = []
+
+        async def fetch():
+            started.append(asyncio.current_task())
+            await asyncio.sleep(0.01)
+            return {"calls": len(started)}
+
+        leader = asyncio.ensure_future(single_flight.do("key", fetch))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(single_flight.do("key", fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        results = await asyncio.gather(*followers)
+        self.assertTrue(leader.cancelled())
+        self.assertEqual(results, [{"calls": 2}] * 3)
+        self.assertEqual(single_flight.stats, {"calls": 2, "shared": 5})
+
+
+class AsyncStoreCase(unittest.IsolatedAsyncioTestCase):
+    async def test_sqlite_stores_used_off_the_loop(self):
+        threads = set()
+
+        class RecordingCache(SqliteCache):
+            def _load(self, key, now):
+                threads.add(threading.get_ident())
+                return super()._load(key, now)
+
+        class RecordingStore(SnapshotStore):
+            def put(self, key, points):
+                threads.add(threading.get_ident())
+                super().put(key, points)
+
+        art_tones = "ca22091a-3c00-11e9-974f-549f35141000"
+        transport = mock_transport(
+            {
+                f"/api/v2.9/artist/{art_tones}": "responses/artist/artist_by_id_1.json",
+                f"/api/v2/artist/{art_tones}/spotify/popularity": "responses/artist/popularity_daily_1_p1.json",
+            }
+        )
+        cache, store = RecordingCache(":memory:"), RecordingStore()
+        async with Artist(transport=transport, response_cache=cache, snapshot_store=store) as artist_api:
+            await artist_api.artist_by_id(art_tones)
+            await artist_api.spotify_popularity_daily(art_tones, date(2021, 4, 12), date(2021, 6, 3))
+
+        self.assertTrue(threads)
+        self.assertNotIn(threading.get_ident(), threads)
+        # leaving the client's block wrote the points still buffered
+        self.assertEqual(store._pending, [])
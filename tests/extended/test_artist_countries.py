@@ -7,10 +7,12 @@ from sys import platform
 import unittest
 from unittest import mock, skip
 
+from dateutil.relativedelta import relativedelta
 import requests_mock
 from soundcharts.errors import ConnectionError
 from soundcharts.platform import SocialPlatform
 from soundcharts.extended.artist_countries import ArtistCountries
+from soundcharts.monthly import MonthlyMemo
 
 from tests import load_sample_response
 
@@ -78,3 +80,30 @@ class CountriesTestCase(unittest.TestCase):
         self.assertEqual(top_countries[0]["value"], 164755)
         self.assertEqual(top_countries[1]["countryCode"], "AU")
         self.assertEqual(top_countries[1]["value"], 122815)
+
+    @requests_mock.Mocker(real_http=False)
+    def test_look_back_months_fetched_once(self, m):
+        uuid = "11e81bc6-e787-adee-a427-a0369fe50396"
+        empty = {"items": [], "page": {"offset": 0, "total": 0, "next": None}}
+        m.register_uri("GET", re.compile(f"/api/v2/artist/{uuid}/streaming/spotify/listeners/"), text=json.dumps(empty))
+        # only the month before last has country data
+        good = date.today().replace(day=1) - relativedelta(months=2)
+        m.register_uri(
+            "GET",
+            f"/api/v2/artist/{uuid}/streaming/spotify/listeners/{good.year}/{good.month:02}",
+            text=json.dumps(load_sample_response("responses/artist/spotify_monthly_listeners_2022_05.json")),
+        )
+
+        # as on the first of the month, when it and the month before are still open
+        memo = MonthlyMemo(today=lambda: date.today().replace(day=1))
+        artist_countries_client = ArtistCountries(log_response=False, monthly_memo=memo)
+        top_countries = artist_countries_client.get_artist_top_countries(uuid)
+        self.assertEqual(top_countries[0]["value"], 130612)
+        # the current month and the three before it
+        self.assertEqual(m.call_count, 4)
+
+        # closed months come from the artist client's memo, open ones are fetched again
+        datasets = artist_countries_client.get_artist_top_countries_full(uuid, good, date.today())
+        self.assertEqual(len(datasets), 5)
+        self.assertEqual(m.call_count, 6)
+        self.assertEqual(memo.stats["size"], 2)
@@ -0,0 +1,95 @@
+from datetime import date
+import json
+import re
+import unittest
+
+import numpy as np
+import requests_mock
+from soundcharts.extended.artist_countries import ArtistCountries
+from soundcharts.extended.country_shares import CountryShares
+
+from tests import load_sample_response
+
+ARTIST = "11e81bc6-e787-adee-a427-a0369fe50396"
+OTHER = "ca22091a-3c00-11e9-974f-549f35141000"
+
+
+def latest_with_countries(fname: str) -> dict:
+    items = load_sample_response(fname)["items"]
+    return [item for item in items if item.get("countryPlots")][-1]
+
+
+class CountrySharesCase(unittest.TestCase):
+    def setUp(self):
+        self.may = latest_with_countries("responses/artist/spotify_monthly_listeners_2022_05.json")
+        self.august = latest_with_countries("responses/artist/spotify_monthly_listeners_2022_08.json")
+        self.shares = CountryShares.from_datasets(
+            [ARTIST, OTHER],
+            [(2022, 5), (2022, 6), (2022, 8)],
+            {(ARTIST, (2022, 5)): self.may, (ARTIST, (2022, 8)): self.august, (OTHER, (2022, 6)): self.may},
+        )
+
+    def test_arrays(self):
+        self.assertEqual(self.shares.listeners.shape, (2, 3, len(self.shares.countries)))
+        self.assertEqual(self.shares.has_data.tolist(), [[True, False, True], [False, True, False]])
+        us = self.shares.country_index["US"]
+        self.assertEqual(self.shares.listeners[0, 0, us], 130612)
+        self.assertEqual(self.shares.listeners[1, 1, us], 130612)
+        self.assertAlmostEqual(self.shares.shares[0, 0, us], 130612 / self.may["value"] * 100)
+        self.assertTrue(np.isnan(self.shares.shares[0, 1]).all())
+
+    def test_top_matches_prepared_data(self):
+        prepared = ArtistCountries()._prepare_country_data(self.august, limit=5)
+        self.assertEqual(
+            self.shares.top(ARTIST, 2022, 8, limit=5),
+            [{key: item[key] for key in ("countryCode", "value", "percentage")} for item in prepared],
+        )
+        self.assertEqual(self.shares.top(OTHER, 2022, 8), [])
+        # the input is left alone
+        self.assertNotIn("percentage", self.august["countryPlots"][0])
+
+    def test_top_k(self):
+        top = self.shares.top_k(3)
+        self.assertEqual(top.shape, (2, 3, 3))
+        self.assertEqual([self.shares.countries[c] for c in top[0, 2]], ["US", "AU", "MX"])
+        self.assertEqual(self.shares.top_k(0).shape, (2, 3, 0))
+        self.assertEqual(self.shares.top_k(1000).shape[-1], len(self.shares.countries))
+        # a cell without country data is all padding
+        self.assertEqual(top[0, 1].tolist(), [-1, -1, -1])
+
+    def test_short_cells(self):
+        dataset = {
+            "value": 100,
+            "countryPlots": [{"countryCode": "US", "value": 60}, {"countryCode": "FR", "value": 0}],
+        }
+        shares = CountryShares.from_datasets(
+            [ARTIST, OTHER], [(2022, 5)], {(ARTIST, (2022, 5)): dataset, (OTHER, (2022, 5)): self.may}
+        )
+        top = shares.top_k(3)
+        self.assertEqual([shares.countries[c] for c in top[0, 0, :2]], ["US", "FR"])
+        self.assertEqual(top[0, 0, 2], -1)
+        # listed with no listeners is kept
+        self.assertEqual(
+            shares.top(ARTIST, 2022, 5),
+            [
+                {"countryCode": "US", "value": 60, "percentage": 60.0},
+                {"countryCode": "FR", "value": 0, "percentage": 0.0},
+            ],
+        )
+
+    @requests_mock.Mocker(real_http=False)
+    def test_country_shares(self, m):
+        empty = {"items": [], "page": {"offset": 0, "total": 0, "next": None}}
+        m.register_uri("GET", re.compile("/streaming/spotify/listeners/"), text=json.dumps(empty))
+        m.register_uri(
+            "GET",
+            f"/api/v2/artist/{ARTIST}/streaming/spotify/listeners/2022/05",
+            text=json.dumps(load_sample_response("responses/artist/spotify_monthly_listeners_2022_05.json")),
+        )
+
+        shares = ArtistCountries().country_shares([ARTIST, OTHER, ARTIST], date(2022, 4, 10), date(2022, 5, 2))
+        self.assertEqual(shares.artists, [ARTIST, OTHER])
+        self.assertEqual(shares.months, [(2022, 4), (2022, 5)])
+        self.assertEqual(shares.has_data.tolist(), [[False, True], [False, False]])
+        self.assertEqual(shares.top(ARTIST, 2022, 5, limit=1)[0]["value"], 130612)
+        self.assertEqual(m.call_count, 4)
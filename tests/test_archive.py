@@ -0,0 +1,86 @@
+from datetime import date, timedelta
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from soundcharts import timeseries
+from soundcharts.archive import Archive, ArchiveWriter
+from soundcharts.timeseries import DailySeries
+
+ART_TONES = "ca22091a-3c00-11e9-974f-549f35141000"
+ART_BILLIE = "11e81bcc-9c1c-ce38-b96b-a0369fe50396"
+
+
+def followers(start: date, days: int, base: int, skip: int = 0) -> dict:
+    """A nearly monotonic series, with a dip and every `skip`th day missing"""
+    values = {}
+    for offset in range(days):
+        if skip and offset % skip == 0:
+            continue
+        values[(start + timedelta(days=offset)).isoformat()] = base + offset * 37 - (500 if offset == 10 else 0)
+    return values
+
+
+class ArchiveCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "followers.scar")
+        self.tones = followers(date(2021, 1, 1), 1000, 2_000_000, skip=7)
+        self.billie = followers(date(2022, 6, 1), 30, 80_000_000)
+        with ArchiveWriter(self.path, block_days=64) as writer:
+            writer.add(ART_TONES, DailySeries.from_dict(self.tones))
+            writer.add(ART_BILLIE, DailySeries.from_dict(self.billie))
+            writer.add("empty", DailySeries.from_dict({}, date(2022, 1, 1), date(2021, 12, 31)))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        with Archive(self.path) as archive:
+            self.assertEqual(len(archive), 3)
+            self.assertEqual(list(archive.entities()), sorted([ART_TONES, ART_BILLIE, "empty"]))
+            self.assertEqual(archive.read(ART_TONES).to_dict(), self.tones)
+            self.assertEqual(archive.read(ART_BILLIE).to_dict(), self.billie)
+            self.assertEqual(len(archive.read("empty")), 0)
+            self.assertNotIn("missing", archive)
+            with self.assertRaises(KeyError):
+                archive.read("missing")
+
+        # a few bytes per point, against about 30 as JSON
+        self.assertLess(os.path.getsize(self.path), 4 * (len(self.tones) + len(self.billie)))
+
+    def test_range(self):
+        start, end = date(2022, 2, 27), date(2022, 3, 10)
+        expected = {day: value for day, value in self.tones.items() if start.isoformat() <= day <= end.isoformat()}
+        with Archive(self.path) as archive:
+            series = archive.read(ART_TONES, start, end)
+            self.assertEqual((series.start, series.end), (start, end))
+            self.assertEqual(series.to_dict(), expected)
+
+            # beyond either end of the series
+            series = archive.read(ART_BILLIE, date(2022, 5, 30), date(2022, 6, 2))
+            self.assertEqual(len(series), 4)
+            self.assertEqual(list(series.to_dict()), ["2022-06-01", "2022-06-02"])
+
+            read = dict(archive.read_all([ART_BILLIE, "missing"], date(2022, 6, 1), date(2022, 6, 1)))
+            self.assertEqual(list(read), [ART_BILLIE])
+
+    def test_invalid(self):
+        with ArchiveWriter(os.path.join(self.tmp.name, "other.scar")) as writer:
+            with self.assertRaises(ValueError):
+                writer.add("x" * 41, DailySeries.from_dict(self.billie))
+            writer.add(ART_BILLIE, DailySeries.from_dict(self.billie))
+            with self.assertRaises(ValueError):
+                writer.add(ART_BILLIE, DailySeries.from_dict(self.billie))
+            with self.assertRaises(ValueError):
+                writer.add(ART_TONES, DailySeries.from_dict({"2022-06-01": 1.5, "2022-06-02": 2}))
+            with mock.patch.object(timeseries, "np", None), self.assertRaises(ValueError):
+                writer.add(ART_TONES, DailySeries.from_dict({"2022-06-01": 1.5}))
+            self.assertNotIn(ART_TONES.encode(), writer._entries)
+
+        path = os.path.join(self.tmp.name, "not_an_archive")
+        with open(path, "wb") as file:
+            file.write(b"{}" * 20)
+        with self.assertRaises(ValueError):
+            Archive(path)
@@ -8,7 +8,8 @@ from unittest import skip
 
 import requests_mock
 from soundcharts import Artist
-from soundcharts.errors import ConnectionError
+from soundcharts.audience import AudienceReportMemo
+from soundcharts.errors import ConnectionError, ItemNotFoundError
 from soundcharts.platform import SocialPlatform
 
 
@@ -140,6 +141,93 @@ class ArtistCase(unittest.TestCase):
         )
         self.assertEqual(followers, 2762814)
 
+    @requests_mock.Mocker(real_http=False)
+    def test_followers_snapshot(self, m):
+        art_tones = "ca22091a-3c00-11e9-974f-549f35141000"
+        art_billie = "11e81bcc-9c1c-ce38-b96b-a0369fe50396"
+        m.register_uri(
+            "GET",
+            re.compile(f"{art_tones}/social/spotify"),
+            text=json.dumps(load_sample_response("responses/artist/followers_by_platform_spotify_1.json")),
+        )
+        m.register_uri(
+            "GET",
+            re.compile(f"{art_tones}/social/instagram"),
+            text=json.dumps({"items": [], "page": {"offset": 0, "total": 0, "next": None}}),
+        )
+        m.register_uri(
+            "GET",
+            re.compile(f"{art_billie}/social/spotify"),
+            status_code=404,
+            text=json.dumps({"errors": [{"code": 404, "message": "Not found"}]}),
+        )
+        m.register_uri(
+            "GET",
+            re.compile(f"{art_billie}/social/instagram"),
+            status_code=400,
+            text=json.dumps({"errors": [{"code": 400, "message": "Bad request"}]}),
+        )
+
+        artist = Artist()
+        platforms = [SocialPlatform.SPOTIFY, SocialPlatform.INSTAGRAM]
+        snapshot = artist.followers_snapshot([art_tones, art_billie, art_tones], platforms, concurrency=4)
+
+        self.assertEqual(snapshot.artists, [art_tones, art_billie])
+        self.assertEqual(snapshot.values, [[2762814, None], [None, None]])
+        self.assertEqual(snapshot.get(art_tones, SocialPlatform.SPOTIFY), (date(2021, 6, 16), 2762814))
+        self.assertEqual(snapshot.get(art_tones, SocialPlatform.INSTAGRAM), (None, None))
+        self.assertEqual(list(snapshot.cells()), [(art_tones, SocialPlatform.SPOTIFY, date(2021, 6, 16), 2762814)])
+        self.assertIsInstance(snapshot.errors[(art_billie, SocialPlatform.SPOTIFY)], ItemNotFoundError)
+        with self.assertRaises(ConnectionError):
+            snapshot.get(art_billie, SocialPlatform.INSTAGRAM)
+
+    @requests_mock.Mocker(real_http=False)
+    def test_artist_followers_by_platform_daily_backscan(self, m):
+        art_tones = "ca22091a-3c00-11e9-974f-549f35141000"
+        url = f"/api/v2/artist/{art_tones}/social/spotify"
+        page = {"offset": 0, "total": 2, "next": None}
+        empty = m.register_uri(
+            "GET",
+            f"{url}?startDate=2021-06-20&endDate=2021-06-20",
+            text=json.dumps({"items": [], "page": {**page, "total": 0}}),
+            complete_qs=True,
+        )
+        items = [
+            {"date": "2021-06-14T00:00:00+00:00", "value": 2760000},
+            {"date": "2021-06-16T00:00:00+00:00", "value": 2762814},
+        ]
+        ranged = m.register_uri(
+            "GET",
+            f"{url}?startDate=2021-06-12&endDate=2021-06-20",
+            text=json.dumps({"items": items, "page": page}),
+            complete_qs=True,
+        )
+        with_day = m.register_uri(
+            "GET",
+            f"{url}?startDate=2021-06-08&endDate=2021-06-16",
+            text=json.dumps({"items": items, "page": page}),
+            complete_qs=True,
+        )
+
+        artist = Artist()
+        followers = artist.artist_followers_by_platform_daily(
+            uuid=art_tones, platform=SocialPlatform.SPOTIFY, day=date(2021, 6, 20), allow_backscan=True
+        )
+        self.assertEqual(followers, 2762814)
+        self.assertEqual((empty.call_count, ranged.call_count), (0, 1))
+
+        followers = artist.artist_followers_by_platform_daily(
+            uuid=art_tones, platform=SocialPlatform.SPOTIFY, day=date(2021, 6, 16), allow_backscan=True
+        )
+        self.assertEqual(followers, 2762814)
+        self.assertEqual(with_day.call_count, 1)
+
+        followers = artist.artist_followers_by_platform_daily(
+            uuid=art_tones, platform=SocialPlatform.SPOTIFY, day=date(2021, 6, 20)
+        )
+        self.assertIsNone(followers)
+        self.assertEqual(m.call_count, 3)
+
     @requests_mock.Mocker(real_http=False)
     def test_spotify_popularity_daily(self, m):
         art_tones = "ca22091a-3c00-11e9-974f-549f35141000"
@@ -355,6 +443,50 @@ class ArtistCase(unittest.TestCase):
         self.assertEqual(data[0]["likeCount"], 22496409)
         self.assertGreaterEqual(data[0]["likeCount"], data[9]["likeCount"])
 
+    @requests_mock.Mocker(real_http=False)
+    def test_top_posts_without_audience(self, m):
+        """A report with only top posts still gives them, and no stats"""
+        report = load_sample_response("responses/artist/audience_by_platform_instagram_1.json")
+        m.register_uri(
+            "GET",
+            "/api/v2/artist/11e81bcc-9c1c-ce38-b96b-a0369fe50396/audience/instagram/report/latest",
+            text=json.dumps({**report, "object": {"top": report["object"]["top"]}}),
+        )
+
+        artist = Artist()
+        uuid = "11e81bcc-9c1c-ce38-b96b-a0369fe50396"
+        self.assertEqual(len(artist.get_top_posts_by_platform(uuid, SocialPlatform.INSTAGRAM)), 10)
+        self.assertIsNone(artist.get_audience_stats_by_platform(uuid, SocialPlatform.INSTAGRAM))
+        self.assertIsNone(artist.get_engagement_data_by_platform(uuid, SocialPlatform.INSTAGRAM))
+
+    @requests_mock.Mocker(real_http=False)
+    def test_audience_report_shared_by_helpers(self, m):
+        """The report is downloaded once for all the helpers, until it expires"""
+        m.register_uri(
+            "GET",
+            "/api/v2/artist/11e81bcc-9c1c-ce38-b96b-a0369fe50396/audience/instagram/report/latest",
+            text=json.dumps(load_sample_response("responses/artist/audience_by_platform_instagram_1.json")),
+        )
+
+        now = [0.0]
+        artist = Artist()
+        artist._audience_reports = AudienceReportMemo(ttl=60, clock=lambda: now[0])
+        uuid = "11e81bcc-9c1c-ce38-b96b-a0369fe50396"
+
+        stats = artist.get_audience_stats_by_platform(uuid, SocialPlatform.INSTAGRAM)
+        self.assertEqual(artist.get_engagement_data_by_platform(uuid, SocialPlatform.INSTAGRAM), 6.7475)
+        self.assertEqual(len(artist.get_top_posts_by_platform(uuid, SocialPlatform.INSTAGRAM)), 10)
+        self.assertEqual(m.call_count, 1)
+
+        # callers get their own copy
+        stats["followerCount"] = 0
+        stats = artist.get_audience_stats_by_platform(uuid, SocialPlatform.INSTAGRAM)
+        self.assertEqual(stats["followerCount"], 88879225)
+
+        now[0] += 60
+        artist.get_audience_stats_by_platform(uuid, SocialPlatform.INSTAGRAM)
+        self.assertEqual(m.call_count, 2)
+
     @requests_mock.Mocker(real_http=False)
     def test_identifiers(self, m):
         uuid = "11e81bbd-14d6-08b8-b061-a0369fe50396"
@@ -668,6 +800,15 @@ class ArtistCase(unittest.TestCase):
         )
 
         self.assertEqual(len(monthly_listeners_days), 38)
+        self.assertEqual(m.call_count, 3)
+
+        # closed months are kept, and callers can't alter what is kept
+        self.assertEqual(
+            artist.get_spotify_monthly_listeners_for_date_range(uuid=art_billie, start=start_date, end=end_date),
+            monthly_listeners_days,
+        )
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual(artist.monthly_memo.stats, {"hits": 3, "size": 3, "evictions": 0})
 
     @requests_mock.Mocker(real_http=False)
     def test_spotify_listeners_daily_tones(self, m):
@@ -0,0 +1,215 @@
+from datetime import date
+import json
+import os
+import tempfile
+import unittest
+
+import requests_mock
+from soundcharts import Artist, Song
+from soundcharts.cache import MemoryCache, NegativeCache, ResponseCache, SqliteCache
+from soundcharts.errors import ConnectionError, NoSocialAccountFound
+from soundcharts.monthly import MonthlyMemo
+from soundcharts.platform import SocialPlatform
+
+from tests import load_sample_response
+
+ART_TONES = "ca22091a-3c00-11e9-974f-549f35141000"
+SONG_UUID = "7d534228-5165-11e9-9375-549f35161576"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ResponseCacheCase(unittest.TestCase):
+    def test_key_normalised(self):
+        self.assertEqual(
+            ResponseCache.key("/api/v2/artist/x", {"offset": 10, "limit": 5, "type": None}),
+            ResponseCache.key("/api/v2/artist/x", {"limit": "5", "offset": "10"}),
+        )
+        self.assertNotEqual(ResponseCache.key("/a", {"limit": 5}), ResponseCache.key("/a", {"limit": 5}, "fr"))
+
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            ResponseCache()
+
+    def test_ttl_by_pattern(self):
+        cache = MemoryCache(ttls={r"/identifiers$": 60, r"/artist/": 10})
+        self.assertEqual(cache.ttl_for(f"/api/v2/artist/{ART_TONES}/identifiers"), 60)
+        self.assertEqual(cache.ttl_for(f"/api/v2/artist/{ART_TONES}"), 10)
+        self.assertEqual(cache.ttl_for("/api/v2/song/search"), 0)
+
+    def test_expiry_and_copies(self):
+        clock = FakeClock()
+        cache = MemoryCache(ttls={"/artist/": 10}, clock=clock)
+        cache.set("/artist/x", None, {"name": "Tones and I"})
+
+        cached = cache.get("/artist/x")
+        cached["name"] = "changed"
+        self.assertEqual(cache.get("/artist/x"), {"name": "Tones and I"})
+
+        clock.now += 10
+        self.assertIsNone(cache.get("/artist/x"))
+        self.assertEqual(cache.stats, {"hits": 2, "misses": 1, "evictions": 0})
+
+    def test_lru_eviction(self):
+        for cache in (MemoryCache(ttls={"": 60}, maxsize=2), SqliteCache(":memory:", ttls={"": 60}, maxsize=2)):
+            with self.subTest(cache=type(cache).__name__):
+                clock = FakeClock()
+                cache._clock = clock
+                for path in ("/a", "/b"):
+                    cache.set(path, None, {"path": path})
+                    clock.now += 1
+                cache.get("/a")
+                clock.now += 1
+                cache.set("/c", None, {"path": "/c"})
+
+                self.assertIsNone(cache.get("/b"))
+                self.assertEqual(cache.get("/a"), {"path": "/a"})
+                self.assertEqual(cache.get("/c"), {"path": "/c"})
+                self.assertEqual(cache.stats["evictions"], 1)
+
+
+class ClientCacheCase(unittest.TestCase):
+    @requests_mock.Mocker(real_http=False)
+    def test_repeated_calls_served_from_cache(self, m):
+        m.register_uri(
+            "GET",
+            f"/api/v2.9/artist/{ART_TONES}",
+            text=json.dumps(load_sample_response("responses/artist/artist_by_id_1.json")),
+        )
+
+        cache = MemoryCache()
+        artists = Artist(response_cache=cache)
+        for _ in range(3):
+            self.assertEqual(artists.artist_by_id(ART_TONES)["name"], "Tones and I")
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(cache.stats, {"hits": 2, "misses": 1, "evictions": 0})
+
+    @requests_mock.Mocker(real_http=False)
+    def test_uncached_endpoint(self, m):
+        m.register_uri(
+            "GET",
+            "/api/v2/artist/search/billie",
+            text=json.dumps(load_sample_response("responses/artist_by_name_billie.json")),
+        )
+
+        cache = MemoryCache()
+        artists = Artist(response_cache=cache)
+        list(artists.artist_by_name("billie"))
+        list(artists.artist_by_name("billie"))
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(cache.stats["misses"], 0)
+
+    @requests_mock.Mocker(real_http=False)
+    def test_sqlite_shared_between_runs(self, m):
+        m.register_uri(
+            "GET",
+            f"/api/v2/song/{SONG_UUID}",
+            text=json.dumps(load_sample_response("responses/song/song_by_id.json")),
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "responses.db")
+            first = SqliteCache(path)
+            Song(response_cache=first).song_by_id(SONG_UUID)
+            first.close()
+
+            second = SqliteCache(path)
+            song = Song(response_cache=second).song_by_id(SONG_UUID)
+            second.close()
+
+        self.assertEqual(song["name"], "bad guy")
+        self.assertEqual(m.call_count, 1)
+
+
+class NegativeCacheCase(unittest.TestCase):
+    @requests_mock.Mocker(real_http=False)
+    def test_no_social_account_remembered(self, m):
+        audience = m.register_uri(
+            "GET",
+            f"/api/v2/artist/{ART_TONES}/audience/instagram",
+            status_code=404,
+            text=json.dumps({"errors": [{"code": 404, "message": "No social account found for artist"}]}),
+        )
+        cache = NegativeCache()
+        artist = Artist(negative_cache=cache)
+
+        for start in (date(2024, 1, 1), date(2024, 1, 1), date(2024, 3, 1)):
+            with self.assertRaises(NoSocialAccountFound):
+                artist.platform_followers_daily(SocialPlatform.INSTAGRAM, ART_TONES, start, date(2024, 3, 31))
+        # other dates are another request
+        self.assertEqual(audience.call_count, 2)
+        self.assertEqual(cache.stats, {"hits": 1, "stores": 2, "size": 2})
+
+        self.assertEqual(cache.invalidate(ART_TONES), 2)
+        with self.assertRaises(NoSocialAccountFound):
+            artist.platform_followers_daily(SocialPlatform.INSTAGRAM, ART_TONES, date(2024, 3, 1), date(2024, 3, 31))
+        self.assertEqual(audience.call_count, 3)
+
+    @requests_mock.Mocker(real_http=False)
+    def test_expiry(self, m):
+        missing = m.register_uri(
+            "GET",
+            "/api/v2/song/by-isrc/MISSING00001",
+            status_code=404,
+            text=json.dumps({"errors": [{"code": 404, "message": "Not found"}]}),
+        )
+        clock = FakeClock()
+        songs = Song(negative_cache=NegativeCache(ttl=60, clock=clock))
+
+        for _ in range(3):
+            with self.assertRaises(ConnectionError) as raised:
+                songs.song_by_isrc("MISSING00001")
+            self.assertEqual(raised.exception.status_code, 404)
+        self.assertEqual(missing.call_count, 1)
+
+        clock.now += 60
+        with self.assertRaises(ConnectionError):
+            songs.song_by_isrc("MISSING00001")
+        self.assertEqual(missing.call_count, 2)
+
+    @requests_mock.Mocker(real_http=False)
+    def test_other_errors_not_remembered(self, m):
+        broken = m.register_uri(
+            "GET",
+            "/api/v2/song/by-isrc/BROKEN000001",
+            status_code=400,
+            text=json.dumps({"errors": [{"code": 400, "message": "Bad request"}]}),
+        )
+        cache = NegativeCache()
+        songs = Song(negative_cache=cache)
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                songs.song_by_isrc("BROKEN000001")
+        self.assertEqual(broken.call_count, 2)
+        self.assertEqual(cache.stats["stores"], 0)
+
+
+class MonthlyMemoCase(unittest.TestCase):
+    def test_closed_months_kept(self):
+        memo = MonthlyMemo(today=lambda: date(2024, 5, 3))
+        # April isn't settled until three days after it ends
+        self.assertTrue(memo.closed(2024, 3))
+        self.assertFalse(memo.closed(2024, 4))
+
+        memo.put(("a",), 2024, 3, [{"value": 1}])
+        memo.put(("a",), 2024, 4, [{"value": 2}])
+        self.assertIsNone(memo.get(("a",), 2024, 4))
+        items = memo.get(("a",), 2024, 3)
+        items[0]["value"] = 0
+        self.assertEqual(memo.get(("a",), 2024, 3), [{"value": 1}])
+
+    def test_least_recently_used_dropped(self):
+        memo = MonthlyMemo(maxsize=2, today=lambda: date(2024, 5, 3))
+        memo.put(("a",), 2024, 1, [1])
+        memo.put(("a",), 2024, 2, [2])
+        memo.get(("a",), 2024, 1)
+        memo.put(("a",), 2024, 3, [3])
+        self.assertIsNone(memo.get(("a",), 2024, 2))
+        self.assertEqual(memo.get(("a",), 2024, 1), [1])
+        self.assertEqual(memo.stats, {"hits": 2, "size": 2, "evictions": 1})
@@ -0,0 +1,189 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+import requests_mock
+from soundcharts.cli import SONG_COLUMNS, main, ordered_map
+from soundcharts.export import CsvWriter, ParquetWriter, flatten, row_groups
+
+from tests import load_sample_response
+
+ART_TONES = "ca22091a-3c00-11e9-974f-549f35141000"
+ART_BILLIE = "11e81bcc-9c1c-ce38-b96b-a0369fe50396"
+
+
+class ExportCase(unittest.TestCase):
+    def test_flatten(self):
+        record = {"uuid": "x", "artist": {"name": "y", "label": {"name": None}}, "genres": ["pop", "rock"]}
+        self.assertEqual(
+            flatten(record), {"uuid": "x", "artist.name": "y", "artist.label.name": None, "genres": '["pop", "rock"]'}
+        )
+
+    def test_row_groups(self):
+        self.assertEqual(list(row_groups(iter(range(5)), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(row_groups([], 2)), [])
+
+    def test_ordered_map(self):
+        self.assertEqual(list(ordered_map(lambda x: x * 2, iter(range(10)), 3)), [x * 2 for x in range(10)])
+
+    def test_csv_declared_columns(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "songs.csv")
+            writer = CsvWriter(open(path, "w", newline=""), SONG_COLUMNS)
+            # the first group is all errors, the song fields only come later
+            writer.write([{"isrc": "MISSING00001", "error": "Not found"}])
+            with self.assertLogs("soundcharts.export", "WARNING"):
+                writer.write([{"isrc": "USAT22003158", "error": None, "name": "Dance Monkey", "extra": 1}])
+            writer.close()
+
+            with open(path, newline="") as file:
+                rows = list(csv.DictReader(file))
+        self.assertEqual(list(rows[0]), [name for name, _ in SONG_COLUMNS])
+        self.assertEqual(rows[1]["name"], "Dance Monkey")
+        self.assertEqual(rows[0]["name"], "")
+
+    def test_empty_exports_have_columns(self):
+        columns = [("uuid", "string"), ("count", "int")]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "counts.csv")
+            CsvWriter(open(path, "w", newline=""), columns).close()
+            with open(path, newline="") as file:
+                self.assertEqual(list(csv.reader(file)), [["uuid", "count"]])
+
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                self.skipTest("pyarrow is not installed")
+            path = os.path.join(tmp, "counts.parquet")
+            ParquetWriter(path, columns).close()
+            table = pq.read_table(path)
+        self.assertEqual(table.num_rows, 0)
+        self.assertEqual(table.schema.names, ["uuid", "count"])
+        self.assertEqual(str(table.schema.field("count").type), "int64")
+
+    def test_csv_new_columns_without_declaration(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = CsvWriter(open(os.path.join(tmp, "songs.csv"), "w", newline=""))
+            writer.write([{"isrc": "MISSING00001", "error": "Not found"}])
+            with self.assertRaises(ValueError):
+                writer.write([{"isrc": "USAT22003158", "error": None, "name": "Dance Monkey"}])
+            writer.close()
+
+    def test_parquet_declared_columns(self):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "counts.parquet")
+            writer = ParquetWriter(path, [("uuid", "string"), ("error", "string"), ("count", "int")])
+            writer.write([{"uuid": "a", "error": "Not found", "count": None}])
+            writer.write([{"uuid": "b", "error": None, "count": 5}])
+            writer.close()
+            table = pq.read_table(path)
+        self.assertEqual(str(table.schema.field("count").type), "int64")
+        self.assertEqual(table.column("count").to_pylist(), [None, 5])
+
+    def test_parquet_schema_mismatch_without_declaration(self):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = ParquetWriter(os.path.join(tmp, "counts.parquet"))
+            writer.write([{"isrc": "a", "n": None}])
+            with self.assertRaises(ValueError):
+                writer.write([{"isrc": "b", "n": 5}])
+            with self.assertRaises(ValueError):
+                writer.write([{"isrc": "c", "n": "x", "name": "new"}])
+            writer.close()
+
+
+class CliCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ids = os.path.join(self.tmp.name, "ids.txt")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_ids(self, *ids: str):
+        with open(self.ids, "w") as file:
+            file.write("\n".join(ids))
+
+    def register_isrcs(self, m):
+        m.register_uri(
+            "GET",
+            "/api/v2/song/by-isrc/USAT22003158",
+            text=json.dumps(load_sample_response("responses/song/song_by_isrc.json")),
+        )
+        m.register_uri(
+            "GET",
+            "/api/v2/song/by-isrc/MISSING00001",
+            status_code=404,
+            text=json.dumps({"errors": [{"code": 404, "message": "Not found"}]}),
+        )
+
+    @requests_mock.Mocker(real_http=False)
+    def test_songs_by_isrc_ndjson(self, m):
+        self.register_isrcs(m)
+        self.write_ids("# catalogue", "USAT22003158", "", "MISSING00001")
+        output = os.path.join(self.tmp.name, "songs.ndjson")
+
+        self.assertEqual(main(["-o", output, "songs-by-isrc", "--ids", self.ids]), 0)
+        with open(output) as file:
+            records = {record["isrc"]: record for record in map(json.loads, file)}
+        self.assertEqual(set(records), {"USAT22003158", "MISSING00001"})
+        self.assertIsNone(records["USAT22003158"]["error"])
+        self.assertEqual(records["USAT22003158"]["creditName"], "Tones And I")
+        self.assertIsNotNone(records["MISSING00001"]["error"])
+
+    @requests_mock.Mocker(real_http=False)
+    def test_artist_songs_csv(self, m):
+        m.register_uri(
+            "GET",
+            f"/api/v2.21/artist/{ART_TONES}/songs",
+            text=json.dumps(load_sample_response("responses/artist/songs_1_p1.json")),
+        )
+        m.register_uri(
+            "GET",
+            f"/api/v2.21/artist/{ART_BILLIE}/songs",
+            text=json.dumps(load_sample_response("responses/artist/songs_1_p1.json")),
+        )
+        self.write_ids(ART_TONES, ART_BILLIE)
+        output = os.path.join(self.tmp.name, "songs.csv")
+
+        main(["-f", "csv", "-o", output, "--row-group", "3", "artist-songs", "--ids", self.ids, "--max-limit", "5"])
+        with open(output, newline="") as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(len(rows), 10)
+        self.assertEqual([row["artistUuid"] for row in rows], [ART_TONES] * 5 + [ART_BILLIE] * 5)
+        self.assertIn("uuid", rows[0])
+
+    @requests_mock.Mocker(real_http=False)
+    def test_parquet(self, m):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+
+        self.register_isrcs(m)
+        self.write_ids("USAT22003158", "MISSING00001")
+        output = os.path.join(self.tmp.name, "songs.parquet")
+
+        main(["-f", "parquet", "-o", output, "--row-group", "1", "songs-by-isrc", "--ids", self.ids])
+        parquet = pq.ParquetFile(output)
+        self.assertEqual(parquet.metadata.num_rows, 2)
+        self.assertEqual(parquet.metadata.num_row_groups, 2)
+        self.assertEqual(parquet.schema_arrow.names, [name for name, _ in SONG_COLUMNS])
+        songs = {row["isrc"]: row for row in parquet.read().to_pylist()}
+        self.assertEqual(songs["USAT22003158"]["creditName"], "Tones And I")
+
+    def test_parquet_needs_a_file(self):
+        self.write_ids("USAT22003158")
+        with self.assertRaises(ValueError):
+            main(["-f", "parquet", "songs-by-isrc", "--ids", self.ids])
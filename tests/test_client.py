@@ -0,0 +1,164 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import json
+import re
+import unittest
+
+import requests_mock
+from soundcharts.artist import Artist
+from soundcharts.playlist import Playlist
+from soundcharts.platform import PlaylistPlatform, SocialPlatform
+from soundcharts.top_artist import TopArtist
+from soundcharts.types import PlaylistType
+
+from tests import load_sample_response
+
+BY_TYPE_URL = "/api/v2.20/playlist/by-type/spotify/editorial?sortBy=audience&sortOrder=desc"
+
+
+def register_by_type_pages(m):
+    m.register_uri(
+        "GET",
+        f"{BY_TYPE_URL}&limit=5",
+        text=json.dumps(load_sample_response("responses/playlist/by_type_spotify_editorial_l5_p1.json")),
+    )
+    for page, offset in enumerate([5, 10, 15], start=2):
+        m.register_uri(
+            "GET",
+            f"{BY_TYPE_URL}&offset={offset}&limit=5",
+            text=json.dumps(load_sample_response(f"responses/playlist/by_type_spotify_editorial_l5_p{page}.json")),
+        )
+
+
+class PaginationCase(unittest.TestCase):
+    @requests_mock.Mocker(real_http=False)
+    def test_concurrent_pages_in_order(self, m):
+        register_by_type_pages(m)
+
+        sc_playlists = Playlist()
+        sequential = list(sc_playlists.by_type(PlaylistPlatform.SPOTIFY, PlaylistType.EDITORIAL, limit=5, max_limit=20))
+        m.reset_mock()
+
+        concurrent = list(
+            sc_playlists.by_type(PlaylistPlatform.SPOTIFY, PlaylistType.EDITORIAL, limit=5, max_limit=20, concurrency=3)
+        )
+        self.assertEqual([p["uuid"] for p in concurrent], [p["uuid"] for p in sequential])
+
+        # only the pages needed for max_limit are requested
+        self.assertEqual(m.call_count, 4)
+        offsets = sorted(int(r.qs.get("offset", ["0"])[0]) for r in m.request_history)
+        self.assertEqual(offsets, [0, 5, 10, 15])
+
+    @requests_mock.Mocker(real_http=False)
+    def test_concurrent_pages_max_limit_within_page(self, m):
+        register_by_type_pages(m)
+
+        sc_playlists = Playlist()
+        playlists = list(
+            sc_playlists.by_type(PlaylistPlatform.SPOTIFY, PlaylistType.EDITORIAL, limit=5, max_limit=7, concurrency=4)
+        )
+        self.assertEqual(len(playlists), 7)
+        self.assertEqual(m.call_count, 2)
+
+    @requests_mock.Mocker(real_http=False)
+    def test_concurrent_pages_token_pagination(self, m):
+        """Token-paginated endpoints can't be fanned out, so are followed one page at a time"""
+        m.register_uri(
+            "GET",
+            re.compile("/api/v2/top-artist/spotify/followers"),
+            [
+                {"text": json.dumps(load_sample_response("responses/top_artist/artists_by_platform_metric_1.json"))},
+                {"text": json.dumps(load_sample_response("responses/top_artist/artists_by_platform_metric_2.json"))},
+            ],
+        )
+
+        ta = TopArtist()
+        items = list(ta.artists_by_platform_metric(SocialPlatform.SPOTIFY, "followers", max_limit=150, concurrency=4))
+        self.assertEqual(len(items), 150)
+        self.assertEqual(m.call_count, 2)
+        self.assertIn("token", m.request_history[1].qs)
+
+    @requests_mock.Mocker(real_http=False)
+    def test_prefetch_songs(self, m):
+        uuid = "11e81bbe-5b34-a426-8614-a0369fe50396"
+        base = f"/api/v2.21/artist/{uuid}/songs?sortBy=spotifyStream&sortOrder=desc"
+        m.register_uri("GET", base, text=json.dumps(load_sample_response("responses/artist/songs_1_p1.json")))
+        for page, offset in enumerate([100, 200, 300], start=2):
+            m.register_uri(
+                "GET",
+                f"{base}&offset={offset}&limit=100",
+                text=json.dumps(load_sample_response(f"responses/artist/songs_1_p{page}.json")),
+            )
+
+        artist = Artist()
+        sequential = list(artist.songs(uuid, sortBy="spotifyStream"))
+        prefetched = list(artist.songs(uuid, sortBy="spotifyStream", prefetch=2))
+        self.assertEqual(len(prefetched), 334)
+        self.assertEqual([s["uuid"] for s in prefetched], [s["uuid"] for s in sequential])
+        self.assertEqual(artist._prefix, "/api/v2/artist")
+
+    @requests_mock.Mocker(real_http=False)
+    def test_prefetch_closed_early(self, m):
+        """Stopping at the cutoff date abandons the page being read ahead, including any error from it"""
+        art_tones = "ca22091a-3c00-11e9-974f-549f35141000"
+        base = f"/api/v2.20/artist/{art_tones}/playlist/current/spotify?sortBy=entryDate&sortOrder=desc"
+        m.register_uri(
+            "GET",
+            base,
+            text=json.dumps(
+                load_sample_response("responses/artist/recent_playlists_by_platform_spotify_tones_p1.json")
+            ),
+        )
+        m.register_uri(
+            "GET",
+            f"{base}&offset=100",
+            text=json.dumps(
+                load_sample_response("responses/artist/recent_playlists_by_platform_spotify_tones_p2.json")
+            ),
+        )
+        m.register_uri("GET", f"{base}&offset=200", status_code=502)
+
+        artist = Artist()
+        cutoff_date = date(2021, 6, 16)
+        playlist_positions = list(
+            artist.recent_playlists_by_platform(art_tones, SocialPlatform.SPOTIFY, cutoff_date=cutoff_date, prefetch=1)
+        )
+        self.assertEqual(len(playlist_positions), 153)
+        self.assertLessEqual(m.call_count, 3)
+
+
+class ThreadSafetyCase(unittest.TestCase):
+    @requests_mock.Mocker(real_http=False)
+    def test_shared_client_across_threads(self, m):
+        """Methods with different prefixes don't interfere when called on one client from many threads"""
+        art_tones = "ca22091a-3c00-11e9-974f-549f35141000"
+        uuid = "11e81bbe-5b34-a426-8614-a0369fe50396"
+        m.register_uri(
+            "GET",
+            f"/api/v2.9/artist/{art_tones}",
+            text=json.dumps(load_sample_response("responses/artist/artist_by_id_1.json")),
+        )
+        base = f"/api/v2.21/artist/{uuid}/songs?sortBy=spotifyStream&sortOrder=desc"
+        m.register_uri("GET", base, text=json.dumps(load_sample_response("responses/artist/songs_1_p1.json")))
+        for page, offset in enumerate([100, 200, 300], start=2):
+            m.register_uri(
+                "GET",
+                f"{base}&offset={offset}&limit=100",
+                text=json.dumps(load_sample_response(f"responses/artist/songs_1_p{page}.json")),
+            )
+
+        artist = Artist()
+        artist.language = "en"
+
+        def call(i):
+            if i % 2:
+                return artist.artist_by_id(art_tones)["name"]
+            return len(list(artist.songs(uuid, sortBy="spotifyStream")))
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            results = list(executor.map(call, range(64)))
+
+        self.assertEqual(results, [334, "Tones and I"] * 32)
+        self.assertEqual(artist._prefix, "/api/v2/artist")
+        self.assertNotIn("Content-Type", artist.auth_headers)
+        self.assertTrue(all(r.headers["Accept-Language"] == "en" for r in m.request_history))
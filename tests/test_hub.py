@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import time
+import unittest
+from unittest import mock
+
+import requests_mock
+from soundcharts.artist import Artist
+from soundcharts.cache import MemoryCache
+from soundcharts.extended.artist_countries import ArtistCountries
+from soundcharts.hub import Hub
+from soundcharts.ratelimit import RateLimiter
+from soundcharts.tiktok import Tiktok
+
+from tests import load_sample_response
+
+ART_TONES = "ca22091a-3c00-11e9-974f-549f35141000"
+
+
+class HubCase(unittest.TestCase):
+    def test_clients_share_transport(self):
+        limiter = RateLimiter(rate=5)
+        with Hub(rate_limiter=limiter, log_response=True) as hub:
+            clients = [hub.artist, hub.song, hub.playlist, hub.tiktok, hub.top_artist, hub.library]
+            for client in clients:
+                self.assertIs(client._session, hub.session)
+                self.assertIs(client.rate_limiter, limiter)
+                self.assertIs(client.retry_policy, hub.retry_policy)
+                self.assertTrue(client.log_response)
+            self.assertIs(hub.artist, clients[0])
+            self.assertEqual(hub.tiktok._prefix, "/api/v2/tiktok")
+
+            countries = hub.client(ArtistCountries)
+            self.assertIs(countries.artist_client._session, hub.session)
+
+    def test_client_overrides(self):
+        with Hub(max_workers=2) as hub:
+            artist = hub.client(Artist, max_workers=4)
+            self.assertEqual(artist.max_workers, 4)
+            self.assertIsNot(artist, hub.artist)
+            self.assertEqual(hub.artist.max_workers, 2)
+
+    def test_shared_client_created_once(self):
+        with Hub() as hub:
+            create = hub.client
+
+            def slow_client(cls, **kwargs):
+                time.sleep(0.01)
+                return create(cls, **kwargs)
+
+            with mock.patch.object(hub, "client", side_effect=slow_client) as client:
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    artists = list(executor.map(lambda _: hub.artist, range(8)))
+            self.assertEqual(client.call_count, 1)
+            self.assertTrue(all(artist is artists[0] for artist in artists))
+
+    def test_shared_session_left_open(self):
+        hub = Hub()
+        with mock.patch.object(hub.session, "close") as close:
+            hub.client(Artist).__del__()
+            close.assert_not_called()
+            hub.close()
+            close.assert_called_once()
+        self.assertTrue(Tiktok()._owns_session)
+
+    @requests_mock.Mocker(real_http=False)
+    def test_shared_cache(self, m):
+        m.register_uri(
+            "GET",
+            f"/api/v2.9/artist/{ART_TONES}",
+            text=json.dumps(load_sample_response("responses/artist/artist_by_id_1.json")),
+        )
+
+        with Hub(response_cache=MemoryCache()) as hub:
+            hub.artist.artist_by_id(ART_TONES)
+            hub.client(Artist).artist_by_id(ART_TONES)
+        self.assertEqual(m.call_count, 1)
@@ -0,0 +1,164 @@
+import json
+import os
+import tempfile
+import unittest
+
+import requests_mock
+from soundcharts import Artist, Song
+from soundcharts.identifier_index import IdentifierIndex
+from soundcharts.platform import SocialPlatform
+
+from tests import load_sample_response
+
+SONG_UUID = "d30eaa97-7afb-49b9-8138-02e0eec8f06f"
+ARTIST_UUID = "11e81bcc-9c1c-ce38-b96b-a0369fe50396"
+ART_TONES = "ca22091a-3c00-11e9-974f-549f35141000"
+
+
+class IdentifierIndexCase(unittest.TestCase):
+    def test_identifiers_only_when_complete(self):
+        index = IdentifierIndex()
+        index.load("song", [("spotify", "abc", SONG_UUID, None)])
+        self.assertEqual(index.uuid("song", "spotify", "abc"), SONG_UUID)
+        # a single identifier is known, not the full list
+        self.assertIsNone(index.identifiers("song", SONG_UUID))
+
+        items = load_sample_response("responses/song/identifiers_1.json")["items"]
+        index.put_identifiers("song", SONG_UUID, items)
+        self.assertEqual(index.identifiers("song", SONG_UUID), items)
+        self.assertEqual(index.uuid("song", "deezer", "1710532017"), SONG_UUID)
+        # kinds are kept apart
+        self.assertIsNone(index.uuid("artist", "deezer", "1710532017"))
+
+    def test_api_order_kept(self):
+        index = IdentifierIndex()
+        items = [
+            {"platformName": "Spotify", "platformCode": "spotify", "identifier": "zzz", "url": None},
+            {"platformName": "Deezer", "platformCode": "deezer", "identifier": "1", "url": None},
+            {"platformName": "Spotify", "platformCode": "spotify", "identifier": "aaa", "url": None},
+        ]
+        index.put_identifiers("artist", ART_TONES, items)
+        self.assertEqual(index.identifiers("artist", ART_TONES), items)
+
+    def test_uuids_many(self):
+        index = IdentifierIndex()
+        index.load("artist", ((("spotify", str(i), f"uuid-{i}", None)) for i in range(1200)))
+        found = index.uuids("artist", "spotify", [str(i) for i in range(0, 1300, 2)])
+        self.assertEqual(len(found), 600)
+        self.assertEqual(found["1198"], "uuid-1198")
+
+    def test_load_keeps_url(self):
+        index = IdentifierIndex()
+        index.load("artist", [("spotify", "abc", ART_TONES, "https://open.spotify.com/artist/abc")])
+        index.load("artist", [("spotify", "abc", "other", None)])
+        self.assertEqual(index.uuid("artist", "spotify", "abc"), "other")
+        url = index._conn.execute("SELECT url FROM identifiers WHERE identifier = 'abc'").fetchone()[0]
+        self.assertEqual(url, "https://open.spotify.com/artist/abc")
+
+    def test_persistent(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.db")
+            index = IdentifierIndex(path)
+            index.put_uuid("song", "spotify", "abc", SONG_UUID)
+            index.close()
+
+            index = IdentifierIndex(path)
+            self.assertEqual(index.uuid("song", "spotify", "abc"), SONG_UUID)
+            index.close()
+
+    def test_moved_identifier(self):
+        index = IdentifierIndex()
+        items = load_sample_response("responses/song/identifiers_1.json")["items"]
+        index.put_identifiers("song", SONG_UUID, items)
+        moved = items[0]
+
+        # another song now has one of the identifiers, so the first one's list is no longer complete
+        index.put_identifiers("song", "other", [moved])
+        self.assertEqual(index.uuid("song", moved["platformCode"], moved["identifier"]), "other")
+        self.assertEqual(index.identifiers("song", "other"), [moved])
+        self.assertIsNone(index.identifiers("song", SONG_UUID))
+
+        # the same from a bulk load, while recording an identifier again for its own UUID changes nothing
+        index.put_identifiers("song", SONG_UUID, items[1:])
+        index.load("song", [(items[1]["platformCode"], items[1]["identifier"], SONG_UUID, None)])
+        self.assertEqual(index.identifiers("song", SONG_UUID), items[1:])
+        index.put_uuid("song", moved["platformCode"], moved["identifier"], SONG_UUID)
+        self.assertIsNone(index.identifiers("song", "other"))
+
+
+class ClientIndexCase(unittest.TestCase):
+    @requests_mock.Mocker(real_http=False)
+    def test_song_identifiers(self, m):
+        m.register_uri(
+            "GET",
+            f"/api/v2/song/{SONG_UUID}/identifiers",
+            text=json.dumps(load_sample_response("responses/song/identifiers_1.json")),
+        )
+        index = IdentifierIndex()
+        songs = Song(identifier_index=index)
+        self.assertEqual(songs.platform_identifier(SocialPlatform.SPOTIFY, SONG_UUID), "5wC0vEMWEXbBCMsdcjV6nW")
+        self.assertEqual(songs.platform_identifier(SocialPlatform.DEEZER, SONG_UUID), "1710532017")
+        self.assertEqual(m.call_count, 1)
+
+        # another client sharing the index resolves the reverse direction locally
+        self.assertEqual(
+            Song(identifier_index=index).uuids_by_platform_identifier(
+                SocialPlatform.SPOTIFY, ["5wC0vEMWEXbBCMsdcjV6nW"]
+            ),
+            {"5wC0vEMWEXbBCMsdcjV6nW": SONG_UUID},
+        )
+        self.assertEqual(m.call_count, 1)
+
+    @requests_mock.Mocker(real_http=False)
+    def test_artist_identifiers(self, m):
+        m.register_uri(
+            "GET",
+            f"/api/v2/artist/{ARTIST_UUID}/identifiers",
+            text=json.dumps(load_sample_response("responses/artist/identifiers.json")),
+        )
+        artist = Artist(identifier_index=IdentifierIndex())
+        identifiers = artist.identifiers(ARTIST_UUID)
+        complete = artist.identifiers_complete(ARTIST_UUID)
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual({code: item["identifier"] for code, item in complete.items()}, identifiers)
+        self.assertEqual(Artist().identifiers(ARTIST_UUID), identifiers)
+
+    @requests_mock.Mocker(real_http=False)
+    def test_song_by_platform_identifier(self, m):
+        song = load_sample_response("responses/song/song_by_platform_1.json")
+        by_platform = m.register_uri(
+            "GET", "/api/v2/song/by-platform/spotify/7A9rdAz2M6AjRwOa34jxIP", text=json.dumps(song)
+        )
+        by_id = m.register_uri("GET", "/api/v2/song/2ffc5f25-f191-4551-a1b4-40fe9ddcc075", text=json.dumps(song))
+
+        songs = Song(identifier_index=IdentifierIndex())
+        for _ in range(2):
+            found = songs.song_by_platform_identifier(SocialPlatform.SPOTIFY, "7A9rdAz2M6AjRwOa34jxIP")
+            self.assertEqual(found["uuid"], "2ffc5f25-f191-4551-a1b4-40fe9ddcc075")
+        self.assertEqual((by_platform.call_count, by_id.call_count), (1, 1))
+
+    @requests_mock.Mocker(real_http=False)
+    def test_artist_uuids_by_platform_identifier(self, m):
+        tones = m.register_uri(
+            "GET",
+            "/api/v2.9/artist/by-platform/spotify/2NjfBq1NflQcKSeiDooVjY",
+            text=json.dumps(load_sample_response("responses/artist/by_platform_identifier_tones.json")),
+        )
+        m.register_uri(
+            "GET",
+            "/api/v2.9/artist/by-platform/spotify/unknown",
+            status_code=404,
+            text=json.dumps({"errors": [{"code": 404, "message": "Not found"}]}),
+        )
+        index = IdentifierIndex()
+        index.load("artist", [("spotify", "known", "uuid-known", None)])
+        artist = Artist(identifier_index=index)
+
+        identifiers = ["known", "2NjfBq1NflQcKSeiDooVjY", "unknown", "2NjfBq1NflQcKSeiDooVjY"]
+        expected = {"known": "uuid-known", "2NjfBq1NflQcKSeiDooVjY": ART_TONES}
+        self.assertEqual(artist.uuids_by_platform_identifier(SocialPlatform.SPOTIFY, identifiers), expected)
+        self.assertEqual(tones.call_count, 1)
+
+        # resolved identifiers were added to the index
+        self.assertEqual(artist.uuids_by_platform_identifier(SocialPlatform.SPOTIFY, identifiers), expected)
+        self.assertEqual(tones.call_count, 1)
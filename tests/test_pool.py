@@ -0,0 +1,84 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import unittest
+
+from soundcharts.artist import Artist
+from soundcharts.pool import build_session
+
+from tests import load_sample_response
+
+
+class ArtistHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        type(self).connections += 1
+        super().setup()
+
+    def do_HEAD(self):
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        body = json.dumps(load_sample_response("responses/artist/artist_by_id_1.json")).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class PoolCase(unittest.TestCase):
+    """Uses a local server, since the connection pool is bypassed when responses are mocked"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), ArtistHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.endpoint = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def artist_client(self, **kwargs) -> Artist:
+        artist = Artist(**kwargs)
+        artist._endpoint = self.endpoint
+        return artist
+
+    def test_pool_options(self):
+        session = build_session(pool_connections=2, pool_maxsize=32, pool_block=True, keep_alive=False)
+        adapter = session.get_adapter("https://customer.api.soundcharts.com")
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertTrue(adapter._pool_block)
+        self.assertEqual(session.headers["Connection"], "close")
+
+    def test_connections_reused(self):
+        before = ArtistHandler.connections
+        artist = self.artist_client()
+        for _ in range(5):
+            artist.artist_by_id("ca22091a-3c00-11e9-974f-549f35141000")
+        self.assertEqual(artist.pool_stats(), {"pools": 1, "connections": 1, "requests": 5, "reused": 4})
+        self.assertEqual(ArtistHandler.connections - before, 1)
+
+    def test_no_keep_alive(self):
+        before = ArtistHandler.connections
+        artist = self.artist_client(keep_alive=False)
+        for _ in range(3):
+            artist.artist_by_id("ca22091a-3c00-11e9-974f-549f35141000")
+        self.assertEqual(ArtistHandler.connections - before, 3)
+
+    def test_warm_up(self):
+        artist = self.artist_client(pool_maxsize=4)
+        artist.warm_up(connections=4)
+        self.assertEqual(artist.pool_stats()["connections"], 4)
+
+        artist.artist_by_id("ca22091a-3c00-11e9-974f-549f35141000")
+        self.assertEqual(artist.pool_stats()["connections"], 4)
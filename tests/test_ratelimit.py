@@ -0,0 +1,146 @@
+import json
+import unittest
+from unittest import mock
+
+import requests_mock
+from soundcharts import Song
+from soundcharts.errors import QuotaExhaustedError
+from soundcharts.ratelimit import RateLimiter
+
+from tests import load_sample_response
+
+SONG_UUID = "7d534228-5165-11e9-9375-549f35161576"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class RateLimiterCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("soundcharts.ratelimit.time.sleep", side_effect=self.clock.sleep)
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_paced(self):
+        limiter = RateLimiter(rate=2, burst=3, clock=self.clock)
+        for _ in range(3):
+            limiter.acquire()
+        self.sleep.assert_not_called()
+
+        limiter.acquire()
+        limiter.acquire()
+        self.assertEqual([c.args[0] for c in self.sleep.call_args_list], [0.5, 0.5])
+
+    def test_refills_over_time(self):
+        limiter = RateLimiter(rate=2, burst=2, clock=self.clock)
+        limiter.acquire()
+        limiter.acquire()
+        self.clock.now += 1
+        limiter.acquire()
+        limiter.acquire()
+        self.sleep.assert_not_called()
+
+    def test_stretches_quota_to_reset(self):
+        limiter = RateLimiter(rate=10, quota_reset=100, clock=self.clock)
+        self.assertEqual(limiter.effective_rate(), 10)
+        limiter.update(50)
+        self.assertEqual(limiter.effective_rate(), 0.5)
+
+    def test_quota_exhausted(self):
+        limiter = RateLimiter(rate=10, quota_reserve=5, clock=self.clock)
+        limiter.update(7)
+        limiter.acquire()
+        limiter.acquire()
+        with self.assertRaises(QuotaExhaustedError):
+            limiter.acquire()
+
+    def test_quota_renewed_at_reset(self):
+        limiter = RateLimiter(rate=10, quota_reset=100, quota_reserve=5, clock=self.clock)
+        limiter.update(5)
+        with self.assertRaises(QuotaExhaustedError):
+            limiter.acquire()
+
+        self.clock.now += 100
+        limiter.acquire()
+        self.assertIsNone(limiter.remaining)
+        limiter.update(1000)
+        self.assertEqual(limiter.remaining, 1000)
+
+    def test_quota_window_rolls_forward(self):
+        limiter = RateLimiter(rate=10, quota_reset=100, quota_reserve=5, clock=self.clock)
+        for window in range(3):
+            limiter.acquire()
+            limiter.update(55)
+            # still pacing to the end of the current window
+            self.assertEqual(limiter.effective_rate(), 0.5)
+            limiter.update(5)
+            with self.assertRaises(QuotaExhaustedError):
+                limiter.acquire()
+            self.clock.now = (window + 1) * 100
+
+        # a window passing unseen
+        self.clock.now = 550
+        limiter.acquire()
+        limiter.update(30)
+        self.assertEqual(limiter.effective_rate(), 0.5)
+
+    def test_reset(self):
+        limiter = RateLimiter(rate=10, quota_reserve=5, clock=self.clock)
+        limiter.update(5)
+        with self.assertRaises(QuotaExhaustedError):
+            limiter.acquire()
+        limiter.reset(quota_reset=100)
+        limiter.acquire()
+        limiter.update(50)
+        self.assertEqual(limiter.effective_rate(), 0.45)
+
+    def test_probe_without_reset_time(self):
+        limiter = RateLimiter(rate=10, quota_reserve=5, probe_interval=60, clock=self.clock)
+        limiter.update(5)
+        with self.assertRaises(QuotaExhaustedError):
+            limiter.acquire()
+
+        self.clock.now += 60
+        limiter.acquire()
+        with self.assertRaises(QuotaExhaustedError):
+            limiter.acquire()
+        # the probe's response reports the renewed quota
+        limiter.update(1000)
+        limiter.acquire()
+
+    def test_stale_update_ignored(self):
+        limiter = RateLimiter(rate=10, clock=self.clock)
+        limiter.update(100)
+        limiter.acquire()
+        limiter.acquire()
+        limiter.update(97)
+        limiter.update(99)
+        self.assertEqual(limiter.remaining, 97)
+
+    @requests_mock.Mocker(real_http=False)
+    def test_shared_by_clients(self, m):
+        song = json.dumps(load_sample_response("responses/song/song_by_id.json"))
+        m.register_uri(
+            "GET",
+            f"/api/v2/song/{SONG_UUID}",
+            [{"text": song, "headers": {"x-quota-remaining": str(remaining)}} for remaining in (3, 2, 1)],
+        )
+
+        limiter = RateLimiter(rate=100, quota_reserve=1, clock=self.clock)
+        first, second = Song(rate_limiter=limiter), Song(rate_limiter=limiter)
+        first.song_by_id(SONG_UUID)
+        self.assertEqual(limiter.remaining, 3)
+        second.song_by_id(SONG_UUID)
+        second.song_by_id(SONG_UUID)
+        with self.assertRaises(QuotaExhaustedError):
+            first.song_by_id(SONG_UUID)
+        self.assertEqual(m.call_count, 3)
@@ -0,0 +1,97 @@
+import json
+import unittest
+from unittest import mock
+
+import requests
+import requests_mock
+from soundcharts import Artist, Song
+from soundcharts.errors import ConnectionError
+from soundcharts.retry import RetryPolicy
+
+from tests import load_sample_response
+
+SONG_UUID = "7d534228-5165-11e9-9375-549f35161576"
+SONG_URL = f"/api/v2/song/{SONG_UUID}"
+
+
+@mock.patch("soundcharts.retry.time.sleep")
+class RetryCase(unittest.TestCase):
+    @requests_mock.Mocker(real_http=False)
+    def test_get_retried(self, sleep, m):
+        m.register_uri(
+            "GET",
+            SONG_URL,
+            [
+                {"status_code": 502},
+                {"status_code": 429, "headers": {"Retry-After": "2"}},
+                {"text": json.dumps(load_sample_response("responses/song/song_by_id.json"))},
+            ],
+        )
+
+        policy = RetryPolicy()
+        song = Song(retry_policy=policy).song_by_id(SONG_UUID)
+        self.assertEqual(song["name"], "bad guy")
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual(sleep.call_args_list[1], mock.call(2.0))
+        self.assertEqual(policy.stats, {"retries": 2, "by_status": {502: 1, 429: 1}, "exhausted": 0})
+
+    @requests_mock.Mocker(real_http=False)
+    def test_gives_up(self, sleep, m):
+        m.register_uri("GET", SONG_URL, status_code=503)
+
+        policy = RetryPolicy(max_retries=2)
+        with self.assertRaises(ConnectionError) as ctx:
+            Song(retry_policy=policy).song_by_id(SONG_UUID)
+        self.assertEqual(ctx.exception.status_code, 503)
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual(policy.stats["exhausted"], 1)
+
+    @requests_mock.Mocker(real_http=False)
+    def test_client_errors_not_retried(self, sleep, m):
+        m.register_uri("GET", SONG_URL, status_code=404)
+
+        with self.assertRaises(ConnectionError):
+            Song().song_by_id(SONG_UUID)
+        self.assertEqual(m.call_count, 1)
+        sleep.assert_not_called()
+
+    @requests_mock.Mocker(real_http=False)
+    def test_connection_error_retried(self, sleep, m):
+        m.register_uri(
+            "GET",
+            SONG_URL,
+            [
+                {"exc": requests.exceptions.ConnectTimeout},
+                {"text": json.dumps(load_sample_response("responses/song/song_by_id.json"))},
+            ],
+        )
+
+        policy = RetryPolicy()
+        self.assertIsNotNone(Song(retry_policy=policy).song_by_id(SONG_UUID))
+        self.assertEqual(policy.stats["by_status"], {None: 1})
+
+    @requests_mock.Mocker(real_http=False)
+    def test_post_only_retried_when_opted_in(self, sleep, m):
+        url = "/api/v2/artist/ca22091a-3c00-11e9-974f-549f35141000/sources/add"
+        m.register_uri("POST", url, [{"status_code": 502}, {"json": {"errors": []}}])
+
+        with self.assertRaises(ConnectionError):
+            Artist().add_artist_links("ca22091a-3c00-11e9-974f-549f35141000", ["https://example.com"])
+        self.assertEqual(m.call_count, 1)
+
+        m.reset_mock()
+        m.register_uri("POST", url, [{"status_code": 502}, {"json": {"errors": []}}])
+        artist = Artist(retry_policy=RetryPolicy(methods=("GET", "POST")))
+        self.assertEqual(
+            artist.add_artist_links("ca22091a-3c00-11e9-974f-549f35141000", ["https://example.com"]), {"errors": []}
+        )
+        self.assertEqual(m.call_count, 2)
+
+    def test_backoff_bounded(self, sleep):
+        policy = RetryPolicy(backoff=1, max_backoff=5)
+        for attempt in range(6):
+            self.assertLessEqual(policy.delay(attempt), min(5, 2**attempt))
+        self.assertEqual(policy.delay(0, "Wed, 21 Oct 2015 07:28:00 GMT"), 0)
+        self.assertEqual(policy.delay(0, "2"), 2)
+        self.assertEqual(policy.delay(0, "86400"), 5)
+        self.assertEqual(policy.delay(0, "Wed, 21 Oct 2099 07:28:00 GMT"), 5)
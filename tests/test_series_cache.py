@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+import json
+import re
+import unittest
+
+import requests_mock
+from soundcharts.artist import Artist
+from soundcharts.series_cache import SeriesCache
+
+from tests import load_sample_response
+
+
+class SeriesCacheCase(unittest.TestCase):
+    def test_missing_ranges(self):
+        cache = SeriesCache(settle_days=3)
+        key = ("uuid", "spotify_popularity", None)
+        self.assertEqual(
+            cache.missing_ranges(key, date(2021, 1, 1), date(2021, 1, 31)), [(date(2021, 1, 1), date(2021, 1, 31))]
+        )
+
+        cache.put(key, date(2021, 1, 10), date(2021, 1, 20), {"2021-01-12": 50})
+        self.assertEqual(
+            cache.missing_ranges(key, date(2021, 1, 1), date(2021, 1, 31)),
+            [(date(2021, 1, 1), date(2021, 1, 9)), (date(2021, 1, 21), date(2021, 1, 31))],
+        )
+        self.assertEqual(cache.get(key, date(2021, 1, 1), date(2021, 1, 31)), {"2021-01-12": 50})
+
+        # other series are unaffected
+        self.assertEqual(
+            len(cache.missing_ranges(("uuid", "followers", "spotify"), date(2021, 1, 10), date(2021, 1, 20))), 1
+        )
+
+    def test_recent_days_not_settled(self):
+        cache = SeriesCache(settle_days=3)
+        key = ("uuid", "spotify_popularity", None)
+        today = date.today()
+        cache.put(key, today - timedelta(days=10), today, {})
+        self.assertEqual(
+            cache.missing_ranges(key, today - timedelta(days=10), today), [(today - timedelta(days=3), today)]
+        )
+
+
+class CachedDateRangeCase(unittest.TestCase):
+    @requests_mock.Mocker(real_http=False)
+    def test_only_missing_dates_fetched(self, m):
+        art_tones = "ca22091a-3c00-11e9-974f-549f35141000"
+        m.register_uri(
+            "GET",
+            re.compile(f"/api/v2/artist/{art_tones}/spotify/popularity"),
+            text=json.dumps(load_sample_response("responses/artist/popularity_daily_2_p1.json")),
+        )
+
+        artist = Artist(series_cache=SeriesCache())
+        first = artist.spotify_popularity_daily(uuid=art_tones, start=date(2022, 9, 1), end=date(2022, 11, 1))
+        self.assertEqual(len(first), 46)
+        self.assertEqual(m.call_count, 1)
+
+        # the same range again is answered from the cache
+        again = artist.spotify_popularity_daily(uuid=art_tones, start=date(2022, 9, 1), end=date(2022, 11, 1))
+        self.assertEqual(again, first)
+        self.assertEqual(m.call_count, 1)
+
+        # an overlapping range only requests the new days
+        artist.spotify_popularity_daily(uuid=art_tones, start=date(2022, 9, 1), end=date(2022, 11, 10))
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(m.last_request.qs["startdate"], ["2022-11-02"])
+        self.assertEqual(m.last_request.qs["enddate"], ["2022-11-10"])
@@ -0,0 +1,92 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import time
+import unittest
+
+import requests_mock
+from soundcharts import Artist, Song
+from soundcharts.errors import ConnectionError
+from soundcharts.singleflight import SingleFlight
+
+from tests import load_sample_response
+
+ART_TONES = "ca22091a-3c00-11e9-974f-549f35141000"
+SONG_UUID = "7d534228-5165-11e9-9375-549f35161576"
+THREADS = 16
+
+
+def wait_for_followers(single_flight: SingleFlight, count: int, timeout: float = 5):
+    """Hold the call in flight until the other threads are waiting on it"""
+    deadline = time.monotonic() + timeout
+    while single_flight.stats["shared"] < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+class SingleFlightCase(unittest.TestCase):
+    @requests_mock.Mocker(real_http=False)
+    def test_concurrent_calls_coalesced(self, m):
+        artist = Artist()
+        body = json.dumps(load_sample_response("responses/artist/artist_by_id_1.json"))
+
+        def respond(request, context):
+            wait_for_followers(artist.single_flight, THREADS - 1)
+            return body
+
+        m.register_uri("GET", f"/api/v2.9/artist/{ART_TONES}", text=respond)
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            results = list(executor.map(lambda _: artist.artist_by_id(ART_TONES), range(THREADS)))
+
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(artist.single_flight.stats, {"calls": 1, "shared": THREADS - 1})
+        self.assertTrue(all(result == results[0] for result in results))
+        # each caller has its own copy
+        self.assertEqual(len({id(result) for result in results}), THREADS)
+
+        # nothing is kept once the call completes
+        artist.artist_by_id(ART_TONES)
+        self.assertEqual(m.call_count, 2)
+
+    @requests_mock.Mocker(real_http=False)
+    def test_error_passed_to_all(self, m):
+        songs = Song()
+
+        def respond(request, context):
+            wait_for_followers(songs.single_flight, THREADS - 1)
+            context.status_code = 404
+            return json.dumps({"errors": [{"code": 404, "message": "Not found"}]})
+
+        m.register_uri("GET", f"/api/v2/song/{SONG_UUID}", text=respond)
+
+        def call(_):
+            try:
+                songs.song_by_id(SONG_UUID)
+            except ConnectionError as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            errors = list(executor.map(call, range(THREADS)))
+
+        self.assertEqual([error.status_code for error in errors], [404] * THREADS)
+        self.assertEqual(m.call_count, 1)
+        # each caller raises its own exception, the followers' caused by the one raised by the call
+        self.assertEqual(len({id(error) for error in errors}), THREADS)
+        (original,) = [error for error in errors if error.__cause__ is None]
+        self.assertTrue(all(error.__cause__ is original for error in errors if error is not original))
+        self.assertTrue(all(str(error) == str(original) for error in errors))
+
+    @requests_mock.Mocker(real_http=False)
+    def test_different_params_not_coalesced(self, m):
+        single_flight = SingleFlight()
+        m.register_uri(
+            "GET",
+            f"/api/v2/artist/{ART_TONES}/related",
+            json={"items": [], "page": {"offset": 0, "total": 0, "next": None}},
+        )
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            artist = Artist(single_flight=single_flight)
+            list(executor.map(lambda limit: list(artist.similar_artists(ART_TONES, limit=limit)), [5, 10]))
+
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(single_flight.stats["shared"], 0)
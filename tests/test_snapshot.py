@@ -0,0 +1,105 @@
+from datetime import date
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import requests_mock
+from soundcharts import Artist
+from soundcharts.hub import Hub
+from soundcharts.platform import SocialPlatform
+from soundcharts.snapshot import FollowerSnapshot, SnapshotStore
+
+from tests import load_sample_response
+
+ART_TONES = "ca22091a-3c00-11e9-974f-549f35141000"
+ART_BILLIE = "11e81bcc-9c1c-ce38-b96b-a0369fe50396"
+
+
+class SnapshotStoreCase(unittest.TestCase):
+    def test_upsert_and_read(self):
+        store = SnapshotStore()
+        key = (ART_TONES, "followers", "spotify")
+        store.put(key, {"2021-06-01": 100, "2021-06-03": 120}.items())
+        store.put(key, [("2021-06-03T00:00:00+00:00", 125), ("2021-06-04", None)])
+
+        series = store.read(key, date(2021, 6, 1), date(2021, 6, 4))
+        self.assertEqual(series.to_dict(), {"2021-06-01": 100, "2021-06-03": 125})
+        self.assertEqual(len(series), 4)
+        self.assertEqual(
+            store.read((ART_TONES, "followers", "instagram"), date(2021, 6, 1), date(2021, 6, 4)).to_dict(), {}
+        )
+
+    def test_batched_writes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.db")
+            store = SnapshotStore(path, batch_size=3)
+            key = (ART_TONES, "spotify_listeners", None)
+            store.put(key, [("2021-06-01", 1), ("2021-06-02", 2)])
+
+            other = SnapshotStore(path)
+            self.assertEqual(other.read(key, date(2021, 6, 1), date(2021, 6, 2)).to_dict(), {})
+            store.put(key, [("2021-06-03", 3)])
+            self.assertEqual(len(other.read(key, date(2021, 6, 1), date(2021, 6, 3)).to_dict()), 3)
+
+            store.put(key, [("2021-06-04", 4)])
+            store.close()
+            self.assertEqual(other.read(key, date(2021, 6, 4), date(2021, 6, 4)).to_dict(), {"2021-06-04": 4})
+            other.close()
+
+    def test_read_matrix(self):
+        store = SnapshotStore()
+        snapshot = FollowerSnapshot([ART_TONES, ART_BILLIE], [SocialPlatform.SPOTIFY])
+        snapshot.set(ART_TONES, SocialPlatform.SPOTIFY, date(2021, 6, 2), 100)
+        store.put_snapshot(snapshot)
+        store.put((ART_BILLIE, "followers", "spotify"), [("2021-06-01", 50), ("2021-06-05", 60)])
+
+        matrix = store.read_matrix([ART_TONES, ART_BILLIE], "followers", "spotify", date(2021, 6, 1), date(2021, 6, 3))
+        self.assertEqual(matrix.shape, (2, 3))
+        np.testing.assert_array_equal(matrix, [[np.nan, 100, np.nan], [50, np.nan, np.nan]])
+
+
+class ClientSnapshotCase(unittest.TestCase):
+    @requests_mock.Mocker(real_http=False)
+    def test_fetched_series_written(self, m):
+        m.register_uri(
+            "GET",
+            f"/api/v2/artist/{ART_TONES}/streaming/spotify/listening?startDate=2021-04-12&endDate=2021-05-16",
+            text=json.dumps(load_sample_response("responses/artist/listeners_daily_tones_2021-04-12_2021-06-03.json")),
+        )
+        store = SnapshotStore()
+        artist = Artist(snapshot_store=store)
+        daily_listeners = artist.spotify_listeners_daily(uuid=ART_TONES, start=date(2021, 4, 12), end=date(2021, 5, 16))
+
+        series = store.read((ART_TONES, "spotify_listeners", None), date(2021, 4, 12), date(2021, 5, 16))
+        self.assertEqual(series.to_dict(), daily_listeners)
+
+    @requests_mock.Mocker(real_http=False)
+    def test_buffered_points_written_on_close(self, m):
+        m.register_uri(
+            "GET",
+            f"/api/v2/artist/{ART_TONES}/streaming/spotify/listening?startDate=2021-04-12&endDate=2021-05-16",
+            text=json.dumps(load_sample_response("responses/artist/listeners_daily_tones_2021-04-12_2021-06-03.json")),
+        )
+        key = (ART_TONES, "spotify_listeners", None)
+        start, end = date(2021, 4, 12), date(2021, 5, 16)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.db")
+            with SnapshotStore(path) as store:
+                with SnapshotStore(path) as other:
+                    with Hub(snapshot_store=store) as hub:
+                        daily_listeners = hub.artist.spotify_listeners_daily(ART_TONES, start, end)
+                        self.assertEqual(other.read(key, start, end).to_dict(), {})
+                    # closing the hub wrote the points still buffered
+                    self.assertEqual(other.read(key, start, end).to_dict(), daily_listeners)
+
+                with Artist(snapshot_store=store) as artist:
+                    artist.spotify_listeners_daily(ART_TONES, start, end)
+                self.assertEqual(store._pending, [])
+
+                store.put(key, [("2021-05-17", 1)])
+            # and so did leaving the store's block
+            with SnapshotStore(path) as other:
+                self.assertEqual(other.read(key, date(2021, 5, 17), date(2021, 5, 17)).to_dict(), {"2021-05-17": 1})
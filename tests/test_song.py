@@ -7,6 +7,7 @@ from unittest import mock, skip
 
 import requests_mock
 from soundcharts import Song
+from soundcharts.errors import ConnectionError, ItemNotFoundError
 from soundcharts.platform import SocialPlatform
 
 
@@ -45,6 +46,49 @@ class SongCase(unittest.TestCase):
         song = songs.song_by_isrc("USAT22003158")
         self.assertEqual(song["creditName"], "Tones And I")
 
+    @requests_mock.Mocker(real_http=False)
+    def test_songs_by_isrc(self, m):
+        found = m.register_uri(
+            "GET",
+            "/api/v2/song/by-isrc/USAT22003158",
+            text=json.dumps(load_sample_response("responses/song/song_by_isrc.json")),
+        )
+        m.register_uri(
+            "GET",
+            "/api/v2/song/by-isrc/MISSING00001",
+            status_code=404,
+            text=json.dumps({"errors": [{"code": 404, "message": "Not found"}]}),
+        )
+        m.register_uri(
+            "GET",
+            "/api/v2/song/by-isrc/BROKEN000001",
+            status_code=400,
+            text=json.dumps({"errors": [{"code": 400, "message": "Bad request"}]}),
+        )
+
+        songs = Song()
+        isrcs = ["USAT22003158", "MISSING00001", "USAT22003158", "BROKEN000001"] * 10
+        results = dict(songs.songs_by_isrc(iter(isrcs), concurrency=2))
+
+        self.assertEqual(found.call_count, 1)
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual(results["USAT22003158"]["creditName"], "Tones And I")
+        self.assertIsInstance(results["MISSING00001"], ItemNotFoundError)
+        self.assertIsInstance(results["BROKEN000001"], ConnectionError)
+
+    @requests_mock.Mocker(real_http=False)
+    def test_songs_by_platform_identifier(self, m):
+        m.register_uri(
+            "GET",
+            "/api/v2/song/by-platform/spotify/7A9rdAz2M6AjRwOa34jxIP",
+            text=json.dumps(load_sample_response("responses/song/song_by_platform_1.json")),
+        )
+
+        songs = Song()
+        results = list(songs.songs_by_platform_identifier(SocialPlatform.SPOTIFY, ["7A9rdAz2M6AjRwOa34jxIP"] * 3))
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0][1]["uuid"], "2ffc5f25-f191-4551-a1b4-40fe9ddcc075")
+
     @requests_mock.Mocker(real_http=False)
     def test_song_by_platform(self, m):
         m.register_uri(
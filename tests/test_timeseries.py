@@ -0,0 +1,165 @@
+from datetime import date
+import json
+import re
+import unittest
+from unittest import mock
+
+import requests_mock
+from soundcharts.artist import Artist
+from soundcharts.platform import SocialPlatform
+from soundcharts import timeseries
+from soundcharts.timeseries import DailySeries, date_windows, month_range
+
+from tests import load_sample_response
+
+
+class DateWindowsCase(unittest.TestCase):
+    def test_single_window(self):
+        windows = date_windows(date(2021, 5, 1), date(2021, 5, 20), 90)
+        self.assertEqual(windows, [(date(2021, 5, 1), date(2021, 5, 20))])
+
+    def test_multiple_windows_newest_first(self):
+        windows = date_windows(date(2021, 2, 1), date(2021, 5, 20), 90)
+        self.assertEqual(
+            windows,
+            [(date(2021, 2, 19), date(2021, 5, 20)), (date(2021, 2, 1), date(2021, 2, 19))],
+        )
+
+    def test_empty_range(self):
+        self.assertEqual(date_windows(date(2021, 5, 1), date(2021, 5, 1), 90), [])
+
+
+class MonthRangeCase(unittest.TestCase):
+    def test_across_years(self):
+        self.assertEqual(
+            month_range(date(2021, 11, 30), date(2022, 2, 1)), [(2021, 11), (2021, 12), (2022, 1), (2022, 2)]
+        )
+        self.assertEqual(month_range(date(2022, 2, 1), date(2022, 2, 28)), [(2022, 2)])
+
+
+class DailySeriesCase(unittest.TestCase):
+    POINTS = {
+        "2021-05-01T00:00:00+00:00": 10,
+        "2021-05-02T00:00:00+00:00": 12,
+        "2021-05-04T00:00:00+00:00": 15,
+        "2021-05-05T00:00:00+00:00": 21,
+        "2021-05-08T00:00:00+00:00": 30,
+    }
+
+    def check_both_backends(self, test):
+        """Run a test with NumPy and with the array.array fallback"""
+        with self.subTest(backend="numpy"):
+            test()
+        with self.subTest(backend="array"), mock.patch.object(timeseries, "np", None):
+            test()
+
+    def test_from_offsets(self):
+        def test():
+            series = DailySeries.from_offsets(date(2021, 5, 1), 5, [0, 3], [10, 15], "q")
+            self.assertEqual(series.to_dict(), {"2021-05-01": 10, "2021-05-04": 15})
+            self.assertEqual(series.end, date(2021, 5, 5))
+
+        self.check_both_backends(test)
+
+    def test_round_trip(self):
+        def test():
+            series = DailySeries.from_dict(self.POINTS)
+            self.assertEqual(len(series), 8)
+            self.assertEqual(series.end, date(2021, 5, 8))
+            self.assertIsNone(series.get("2021-05-03"))
+            self.assertEqual(series.get(date(2021, 5, 4)), 15)
+            self.assertEqual(series.to_dict(), {day[:10]: value for day, value in self.POINTS.items()})
+
+        self.check_both_backends(test)
+
+    def test_explicit_range(self):
+        def test():
+            series = DailySeries.from_dict(self.POINTS, date(2021, 5, 2), date(2021, 5, 10))
+            self.assertEqual(series.dates()[0], date(2021, 5, 2))
+            self.assertEqual(len(series), 9)
+            self.assertNotIn("2021-05-01", series.to_dict())
+
+        self.check_both_backends(test)
+
+    def test_empty(self):
+        def test():
+            self.assertEqual(len(DailySeries.from_dict({})), 0)
+            self.assertEqual(len(DailySeries.from_dict({}, start=date(2021, 5, 2))), 0)
+            self.assertEqual(len(DailySeries.from_dict({}, end=date(2021, 5, 2))), 0)
+            self.assertEqual(len(DailySeries.from_dict({}, date(2021, 5, 2), date(2021, 5, 4))), 3)
+
+        self.check_both_backends(test)
+
+    def test_diff(self):
+        def test():
+            diffs = DailySeries.from_dict(self.POINTS).diff()
+            self.assertEqual(diffs.to_dict(), {"2021-05-02": 2, "2021-05-05": 6})
+
+        self.check_both_backends(test)
+
+    def test_resample(self):
+        def test():
+            series = DailySeries.from_dict(self.POINTS)
+            self.assertEqual(series.resample(4).to_dict(), {"2021-05-01": 15, "2021-05-05": 30})
+            self.assertEqual(series.resample(4, how="sum").to_dict(), {"2021-05-01": 37, "2021-05-05": 51})
+            self.assertEqual(series.resample(4, how="mean").to_dict(), {"2021-05-01": 37 / 3, "2021-05-05": 25.5})
+            self.assertEqual(series.resample(2, how="first").resample(4, how="min").to_dict()["2021-05-05"], 21)
+
+        self.check_both_backends(test)
+
+    def test_resample_unknown_aggregate(self):
+        with self.assertRaises(ValueError):
+            DailySeries.from_dict(self.POINTS).resample(7, how="median")
+
+    def test_slice(self):
+        def test():
+            series = DailySeries.from_dict(self.POINTS).slice(date(2021, 5, 4), date(2021, 5, 30))
+            self.assertEqual(series.start, date(2021, 5, 4))
+            self.assertEqual(list(series.to_dict()), ["2021-05-04", "2021-05-05", "2021-05-08"])
+
+        self.check_both_backends(test)
+
+
+class DateRangeCase(unittest.TestCase):
+    @requests_mock.Mocker(real_http=False)
+    def test_configured_window(self, m):
+        """A smaller window for one method splits the range into more, concurrently fetched, requests"""
+        art_tones = "ca22091a-3c00-11e9-974f-549f35141000"
+        m.register_uri(
+            "GET",
+            re.compile(f"/api/v2/artist/{art_tones}/social/spotify"),
+            text=json.dumps(load_sample_response("responses/artist/followers_by_platform_spotify_3.json")),
+        )
+
+        artist = Artist(window_days={"artist_followers_by_platform": 7}, max_workers=4)
+        follower_map = artist.artist_followers_by_platform(
+            uuid=art_tones, platform=SocialPlatform.SPOTIFY, start=date(2021, 5, 1), end=date(2021, 5, 20)
+        )
+        self.assertEqual(len(follower_map), 20)
+        self.assertEqual(m.call_count, 3)
+        requested = sorted((r.qs["startdate"][0], r.qs["enddate"][0]) for r in m.request_history)
+        self.assertEqual(
+            requested,
+            [("2021-05-01", "2021-05-06"), ("2021-05-06", "2021-05-13"), ("2021-05-13", "2021-05-20")],
+        )
+
+    @requests_mock.Mocker(real_http=False)
+    def test_as_series(self, m):
+        art_tones = "ca22091a-3c00-11e9-974f-549f35141000"
+        m.register_uri(
+            "GET",
+            re.compile(f"/api/v2/artist/{art_tones}/social/spotify"),
+            text=json.dumps(load_sample_response("responses/artist/followers_by_platform_spotify_3.json")),
+        )
+
+        series = Artist().artist_followers_by_platform(
+            uuid=art_tones,
+            platform=SocialPlatform.SPOTIFY,
+            start=date(2021, 5, 1),
+            end=date(2021, 5, 21),
+            as_series=True,
+        )
+        self.assertIsInstance(series, DailySeries)
+        self.assertEqual(len(series), 21)
+        self.assertEqual(series.get(date(2021, 5, 1)), 2725428)
+        self.assertIsNone(series.get(date(2021, 5, 21)))